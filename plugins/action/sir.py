@@ -22,34 +22,63 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
-from ansible.utils.display import Display
+import os
+
+from functools import lru_cache
+
 from ansible_collections.ansible.netcommon.plugins.action.network import (
     ActionModule as ActionNetworkModule,
 )
 
 
-display = Display()
+# The modules of the collection share this action plugin through the action
+# redirects of meta/runtime.yml, so it is imported once for all of them.
+CONFIG_MODULES = frozenset(("config", "sir_config"))
+
+
+@lru_cache(maxsize=None)
+def is_config_module(action):
+    """Return whether the task action, e.g. `caribouhy.sir.sir_config`, is a config module"""
+    return action.rsplit(".", 1)[-1] in CONFIG_MODULES
+
+
+@lru_cache(maxsize=None)
+def is_network_cli(connection):
+    return connection.rsplit(".", 1)[-1] == "network_cli"
 
 
 class ActionModule(ActionNetworkModule):
     def run(self, tmp=None, task_vars=None):
         del tmp  # tmp no longer has any effect
 
-        module_name = self._task.action.split(".")[-1]
-        self._config_module = True if module_name in ["sir_config", "config"] else False
-        persistent_connection = self._play_context.connection.split(".")[-1]
-        warnings = []
+        self._config_module = is_config_module(self._task.action)
 
-        if persistent_connection != "network_cli":
+        if not is_network_cli(self._play_context.connection):
             return {
                 "failed": True,
                 "msg": f"Connection type {self._play_context.connection} is not valid for this module",
             }
 
-        result = super(ActionModule, self).run(task_vars=task_vars)
-        if warnings:
-            if "warnings" in result:
-                result["warnings"].extend(warnings)
-            else:
-                result["warnings"] = warnings
-        return result
+        backup_options = self._task.args.get("backup_options") or {}
+        if self._config_module and self._task.args.get("backup") and backup_options.get("dedup"):
+            # the module writes the backup to the store itself
+            backup_options = dict(backup_options)
+            if not backup_options.get("dir_path"):
+                backup_options["dir_path"] = os.path.join(self._get_working_path(), "backup")
+            if not backup_options.get("device"):
+                backup_options["device"] = task_vars["inventory_hostname"]
+            self._task.args["backup_options"] = backup_options
+
+        output_dir = self._task.args.get("output_dir")
+        if output_dir:
+            # the persistent connection writes the files from the root directory
+            output_dir = os.path.expanduser(output_dir)
+            self._task.args["output_dir"] = os.path.join(self._get_working_path(), output_dir)
+
+        return super(ActionModule, self).run(task_vars=task_vars)
+
+    def _handle_backup_option(self, result, task_vars, backup_options):
+        if "backup_hash" in result:
+            # already written to the backup store by the module
+            return
+        super(ActionModule, self)._handle_backup_option(result, task_vars, backup_options)
@@ -0,0 +1,59 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import time
+
+from ansible.errors import AnsibleActionFail
+from ansible.plugins.action import ActionBase
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
+    to_lines,
+)
+
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.connection import (
+    HOSTS_ARGS,
+    open_connection,
+    run_hosts,
+)
+
+
+class ActionModule(ActionBase):
+    _requires_connection = False
+
+    _VALID_ARGS = HOSTS_ARGS | frozenset(("commands", "batch"))
+
+    def run(self, tmp=None, task_vars=None):
+        del tmp  # tmp no longer has any effect
+
+        result = super(ActionModule, self).run(task_vars=task_vars)
+        args = self._task.args
+
+        commands = args.get("commands")
+        if not commands:
+            raise AnsibleActionFail("'commands' is required")
+        if not isinstance(commands, list):
+            commands = [commands]
+
+        timeout = args.get("timeout")
+        batch = bool(args.get("batch", False))
+        options = {"persistent_command_timeout": int(timeout)} if timeout else None
+
+        def run_host(host, host_vars):
+            start = time.time()
+            connection, socket_path = open_connection(self, host, host_vars, options)
+            responses = connection.run_commands(commands=commands, batch=batch)
+            return {
+                "stdout": responses,
+                "stdout_lines": list(to_lines(responses)),
+                "elapsed": round(time.time() - start, 3),
+            }
+
+        result.update(
+            run_hosts(self, task_vars, run_host, "Failed to run commands on %s of %s hosts")
+        )
+        return result
@@ -1 +0,0 @@
-sir.py
\ No newline at end of file
@@ -0,0 +1,50 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import time
+
+from ansible.plugins.action import ActionBase
+
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.connection import (
+    HOSTS_ARGS,
+    open_connection,
+    run_hosts,
+)
+
+
+class ActionModule(ActionBase):
+    _requires_connection = False
+
+    _VALID_ARGS = HOSTS_ARGS | frozenset(("device_info",))
+
+    def run(self, tmp=None, task_vars=None):
+        del tmp  # tmp no longer has any effect
+
+        result = super(ActionModule, self).run(task_vars=task_vars)
+        args = self._task.args
+
+        timeout = args.get("timeout")
+        device_info = bool(args.get("device_info", True))
+        options = {"persistent_connect_timeout": int(timeout)} if timeout else None
+
+        def prewarm_host(host, host_vars):
+            start = time.time()
+            connection, socket_path = open_connection(self, host, host_vars, options)
+            started = time.time()
+            output = connection.prewarm(device_info=device_info)
+            output["socket"] = round(started - start, 3)
+            output["elapsed"] = round(time.time() - start, 3)
+            return output
+
+        result.update(
+            run_hosts(
+                self, task_vars, prewarm_host, "Failed to open the connection of %s of %s hosts"
+            )
+        )
+        return result
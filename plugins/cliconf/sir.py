@@ -29,28 +29,57 @@ description:
   - This sir plugin provides low level abstraction apis for
     sending and receiving CLI commands from Si-R devices.
 version_added: "1.0.0"
+options:
+  device_info_ttl:
+    type: int
+    default: 0
+    description:
+      - The number of seconds the device information and capabilities gathered from the
+        device are kept in the persistent connection before they are gathered again.
+      - The cached information is always invalidated after a commit and when a firmware
+        change is detected in the output of C(show system information).
+      - If the value is set to 0, the cached information does not expire.
+    env:
+      - name: ANSIBLE_SIR_DEVICE_INFO_TTL
+    vars:
+      - name: ansible_sir_device_info_ttl
 """
 
-import re
+import os
 import json
+import time
 
 
 from ansible.errors import AnsibleConnectionFailure
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.common._collections_compat import Mapping
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (
-    NetworkConfig,
-    dumps,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
     to_list,
 )
 from ansible.plugins.cliconf import CliconfBase, enable_mode
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.config import config_diff
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.parsers import (
+    get_parser,
+    parse_firmware_version,
+    parse_model,
+    parse_output,
+    parse_system_information,
+)
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.batch import send_batch
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.output import (
+    output_filename,
+    write_output,
+)
+from ansible_collections.caribouhy.sir.plugins.terminal.sir import TerminalModule
 
 
 class Cliconf(CliconfBase):
     def __init__(self, *args, **kwargs):
         self._device_info = {}
+        self._device_info_time = 0
+        self._firmware = None
+        self._capabilities = None
+        self._commit_deadline = None
         super(Cliconf, self).__init__(*args, **kwargs)
 
     @enable_mode
@@ -75,28 +104,42 @@ class Cliconf(CliconfBase):
         return self.send_command(cmd)
 
     def get_capabilities(self):
-        result = super(Cliconf, self).get_capabilities()
-        result["rpc"] += ["get_diff", "run_commands", "get_defaults_flag"]
-        result["device_operations"] = self.get_device_operations()
-        result.update(self.get_option_values())
-        return json.dumps(result)
+        if self._device_info_expired():
+            self.invalidate_device_info()
+        if self._capabilities is None:
+            result = super(Cliconf, self).get_capabilities()
+            result["rpc"] += [
+                "get_diff",
+                "run_commands",
+                "get_defaults_flag",
+                "get_system_information",
+                "invalidate_device_info",
+                "run_commands_to_file",
+                "confirm_commit",
+                "prewarm",
+            ]
+            result["device_operations"] = self.get_device_operations()
+            result.update(self.get_option_values())
+            self._capabilities = json.dumps(result)
+        return self._capabilities
 
     @enable_mode
     def get_device_info(self):
-        if not self._device_info:
+        if not self._device_info or self._device_info_expired():
             device_info = {}
             device_info["network_os"] = "sir"
 
             reply = self.get(command="show system information")
             data = to_text(reply, errors="surrogate_or_strict").strip()
+            firmware = parse_system_information(data).get("Firm Ver.")
 
-            match = re.search(r"Firm Ver. : V(\d\d\.\d\d)", data)
-            if match:
-                device_info["network_os_version"] = match.group(1)
+            version = parse_firmware_version(data)
+            if version:
+                device_info["network_os_version"] = version
 
-            match = re.search(r"System : ((Si-R|SR-S|SR-X) ?\w{2,6})", data)
-            if match:
-                device_info["network_os_model"] = match.group(1)
+            model = parse_model(data)
+            if model:
+                device_info["network_os_model"] = model
 
             reply = self.get(command="show running-config sysname")
             data = to_text(reply, errors="surrogate_or_strict").strip()
@@ -104,16 +147,38 @@ class Cliconf(CliconfBase):
                 device_info["network_os_hostname"] = data
 
             self._device_info = device_info
+            self._device_info_time = time.time()
+            self._firmware = firmware
 
         return self._device_info
 
+    def get_system_information(self):
+        reply = self.get(command="show system information")
+        info = parse_system_information(to_text(reply, errors="surrogate_or_strict"))
+        if self._firmware and info.get("Firm Ver.") != self._firmware:
+            # the firmware has been updated since the device info was gathered
+            self.invalidate_device_info()
+        return info
+
+    def invalidate_device_info(self):
+        self._device_info = {}
+        self._device_info_time = 0
+        self._firmware = None
+        self._capabilities = None
+
+    def _device_info_expired(self):
+        try:
+            ttl = self.get_option("device_info_ttl")
+        except (AttributeError, KeyError):
+            ttl = 0
+        return bool(ttl) and time.time() - self._device_info_time > ttl
+
     def get_option_values(self):
-        print("get otion value")
         return {
             "format": ["text"],
             "diff_match": ["line", "none"],
             "diff_replace": [],
-            "output": [],
+            "output": ["text", "json"],
         }
 
     def get_device_operations(self):
@@ -144,6 +209,59 @@ class Cliconf(CliconfBase):
             command += f" try time {commit_timer}m"
 
         self.send_command(command)
+        self.invalidate_device_info()
+        self._commit_deadline = time.time() + commit_timer * 60 if commit_timer else None
+
+    def confirm_commit(self):
+        """
+        Confirm the configuration committed with a commit timer before the
+        timer rolls it back.
+
+        The commit is only confirmed if it was made by this connection, a new
+        connection does not know whether the timer has already rolled the
+        configuration back.
+
+        :returns: The seconds that were left on the commit timer
+        """
+        if self._commit_deadline is None:
+            raise ValueError(
+                "no commit with a commit timer is pending on this connection, the configuration "
+                "may already have been rolled back"
+            )
+        remaining = self._commit_deadline - time.time()
+        if remaining <= 0:
+            self._commit_deadline = None
+            raise ValueError("the commit timer has expired, the configuration was rolled back")
+
+        self.send_command("configure")
+        try:
+            self.commit()
+        finally:
+            self.send_command("end")
+        return remaining
+
+    def prewarm(self, device_info=True):
+        """
+        Open the SSH session of the connection unless it is already open, and
+        optionally gather the device info so later tasks find it cached.  The
+        device info needs the admin class, it is not gathered from a session
+        opened without become.
+
+        :returns: A dict with `reused`, whether the session was already open,
+            and the seconds taken by the `handshake` and the `device_info`
+        """
+        reused = bool(self._connection._connected)
+        start = time.time()
+        if not reused:
+            # the terminal is only set up when the session is opened
+            self._connection._connect()
+        result = {"reused": reused, "handshake": round(time.time() - start, 3)}
+        prompt = to_text(self._connection.get_prompt(), errors="surrogate_or_strict")
+        if device_info and prompt.strip().endswith("#"):
+            start = time.time()
+            self.get_device_info()
+            result["device_info"] = round(time.time() - start, 3)
+        return result
 
     def discard_changes(self):
         self.send_command("discard")
@@ -199,49 +317,54 @@ class Cliconf(CliconfBase):
         if diff_ignore_lines is not None:
             raise ValueError("'diff_ignore_lines' in diff is not supported")
 
-        # prepare candidate configuration
-        if len(candidate) > 0:
-            commands = [line.strip() for line in candidate.splitlines() if len(line.strip()) > 0]
-            candidate = "\n".join(commands)
-        candidate_obj = NetworkConfig(indent=0)
-        candidate_obj.load(candidate)
-
-        if running and diff_match != "none":
-            # running configuration
-            running_obj = NetworkConfig(indent=0, contents=running, ignore_lines=diff_ignore_lines)
-            configdiffobjs = candidate_obj.difference(
-                running_obj,
-                path=path,
-                match=diff_match,
-                replace=diff_replace,
-            )
-
-        else:
-            configdiffobjs = candidate_obj.items
-
-        diff["config_diff"] = dumps(configdiffobjs, "commands") if configdiffobjs else ""
+        diff["config_diff"] = "\n".join(config_diff(candidate, running, diff_match))
         return diff
 
     @enable_mode
     def edit_config(
-        self, candidate=None, commit=True, replace=None, diff=False, comment=None, commit_timer=None
+        self,
+        candidate=None,
+        commit=True,
+        replace=None,
+        diff=False,
+        comment=None,
+        commit_timer=None,
+        pipeline_size=None,
     ):
         resp = {}
         operations = self.get_device_operations()
         self.check_edit_config_capability(operations, candidate, commit, replace, comment)
 
-        results = []
-        requests = []
-
-        self.send_command("configure")
+        lines = []
         for line in to_list(candidate):
             if not isinstance(line, Mapping):
                 line = {"command": line}
 
             cmd = line["command"]
             if cmd not in ("end", "exit", "quit", "eof", "!") and cmd[0] != "#":
+                lines.append(line)
+
+        self.send_command("configure")
+        if pipeline_size:
+            try:
+                requests, results, errors = self._send_config_pipeline(lines, pipeline_size)
+            except Exception:
+                # do not leave the lines sent so far in the candidate config
+                self.discard_changes()
+                self.send_command("end")
+                raise
+            if errors:
+                self.discard_changes()
+                self.send_command("end")
+                msg = "; ".join(f"line {num} '{cmd}': {out}" for num, cmd, out in errors)
+                raise AnsibleConnectionFailure(f"configuration failed, changes discarded: {msg}")
+        else:
+            results = []
+            requests = []
+            for line in lines:
                 results.append(self.send_command(**line))
-                requests.append(cmd)
+                requests.append(line["command"])
+
         if commit:
             try:
                 self.commit(commit_timer=commit_timer)
@@ -255,26 +378,134 @@ class Cliconf(CliconfBase):
         resp["response"] = results
         return resp
 
-    def run_commands(self, commands=None, check_rc=True):
+    def _send_config_pipeline(self, lines, pipeline_size):
+        """
+        Write config lines in chunks of pipeline_size without waiting for the
+        prompt of every line, and map errors in the output back to the lines.
+        """
+        requests = []
+        results = []
+        errors = []
+
+        index = 0
+        while index < len(lines) and not errors:
+            if self._is_plain_command(lines[index]):
+                chunk = []
+                while (
+                    index < len(lines)
+                    and len(chunk) < pipeline_size
+                    and self._is_plain_command(lines[index])
+                ):
+                    chunk.append(lines[index]["command"])
+                    index += 1
+                responses = send_batch(self._connection, chunk)
+            else:
+                chunk = [lines[index]["command"]]
+                try:
+                    responses = [self.send_command(**lines[index])]
+                except AnsibleConnectionFailure as e:
+                    responses = [e.message]
+                index += 1
+
+            for cmd, out in zip(chunk, responses):
+                requests.append(cmd)
+                results.append(out)
+                if self._find_error(out):
+                    errors.append((len(requests), cmd, out))
+
+        return requests, results, errors
+
+    def run_commands(self, commands=None, check_rc=True, batch=False):
         if commands is None:
             raise ValueError("'commands' value is required")
 
-        responses = list()
-        for cmd in to_list(commands):
-            if not isinstance(cmd, Mapping):
-                cmd = {"command": cmd}
-
+        commands = [
+            cmd if isinstance(cmd, Mapping) else {"command": cmd} for cmd in to_list(commands)
+        ]
+        outputs = []
+        for cmd in commands:
             output = cmd.pop("output", None)
-            if output:
+            if output not in (None, "text", "json"):
                 raise ValueError(f"'output' value {output} is not supported for run_commands")
+            if output == "json" and get_parser(cmd["command"]) is None:
+                raise ValueError(f"'output' value json is not supported for {cmd['command']}")
+            outputs.append(output)
 
-            try:
-                out = self.send_command(**cmd)
-            except AnsibleConnectionFailure as e:
-                if check_rc:
-                    raise
-                out = getattr(e, "err", to_text(e))
+        if batch and len(commands) > 1 and all(self._is_plain_command(cmd) for cmd in commands):
+            responses = self._run_commands_batch([cmd["command"] for cmd in commands], check_rc)
+        else:
+            responses = list()
+            for cmd in commands:
+                try:
+                    out = self.send_command(**cmd)
+                except AnsibleConnectionFailure as e:
+                    if check_rc:
+                        raise
+                    out = getattr(e, "err", to_text(e))
+
+                responses.append(out)
+
+        return [
+            parse_output(cmd["command"], out) if output == "json" else out
+            for cmd, output, out in zip(commands, outputs, responses)
+        ]
+
+    def run_commands_to_file(
+        self, commands=None, dir_path=None, check_rc=True, batch=False, lines=0
+    ):
+        """
+        Run commands and write the output of every command to a file in
+        dir_path on the controller instead of returning it.
+        """
+        if commands is None:
+            raise ValueError("'commands' value is required")
+        if not dir_path:
+            raise ValueError("'dir_path' value is required")
+
+        dir_path = os.path.expanduser(dir_path)
+        # the whole output of a command is read before it is written to the file,
+        # the output is always written as text
+        commands = [
+            (
+                dict((k, v) for k, v in cmd.items() if k != "output")
+                if isinstance(cmd, Mapping)
+                else {"command": cmd}
+            )
+            for cmd in to_list(commands)
+        ]
+        used = set()
+        paths = [os.path.join(dir_path, output_filename(cmd["command"], used)) for cmd in commands]
 
-            responses.append(out)
+        if batch:
+            responses = self.run_commands(commands, check_rc=check_rc, batch=True)
+            return [write_output(path, out, lines) for path, out in zip(paths, responses)]
+
+        # one command at a time, only one output is held in memory
+        results = []
+        for path, cmd in zip(paths, commands):
+            out = self.run_commands([cmd], check_rc=check_rc)[0]
+            results.append(write_output(path, out, lines))
+        return results
+
+    def _is_plain_command(self, cmd):
+        return (
+            not cmd.get("prompt")
+            and not cmd.get("answer")
+            and not cmd.get("sendonly")
+            and cmd.get("newline", True)
+        )
 
+    def _find_error(self, response):
+        data = to_bytes(response, errors="surrogate_then_replace")
+        return any(regex.search(data) for regex in TerminalModule.terminal_stderr_re)
+
+    def _run_commands_batch(self, commands, check_rc=True):
+        responses = send_batch(self._connection, commands)
+        for cmd, out in zip(commands, responses):
+            if self.response_logging:
+                self.history.append((cmd, out))
+            else:
+                self.history.append(("*****", "*****"))
+            if check_rc and self._find_error(out):
+                raise AnsibleConnectionFailure(out)
         return responses
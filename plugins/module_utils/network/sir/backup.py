@@ -0,0 +1,179 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+from ansible.module_utils._text import to_bytes, to_text
+
+
+try:
+    import zstandard
+
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class BackupStore(object):
+    """
+    Content addressed store of configuration backups on the controller.
+
+    Every backup is stored once as a blob named after the sha256 of its
+    contents, so identical configurations of many devices or many nights
+    share one blob.  Every backup run appends a line with the device, the
+    hash and the timestamp to `index.jsonl`, and `refs/<device>` holds the
+    hash of the latest backup of the device.
+
+        <path>/blobs/<hash[:2]>/<hash>[.gz|.zst]
+        <path>/refs/<device>
+        <path>/index.jsonl
+    """
+
+    def __init__(self, path, compression=None):
+        self.path = os.path.expanduser(path)
+        self.compression = compression or "none"
+        if self.compression not in COMPRESSION_SUFFIXES:
+            raise ValueError("unsupported compression %s" % self.compression)
+        if self.compression == "zstd" and not HAS_ZSTANDARD:
+            raise ValueError("zstd compression requires the zstandard python library")
+
+    def blob_path(self, digest, compression=None):
+        suffix = COMPRESSION_SUFFIXES[compression or self.compression]
+        return os.path.join(self.path, "blobs", digest[:2], digest + suffix)
+
+    def find_blob(self, digest):
+        """Return the path of the blob of digest in any compression, or None"""
+        for compression in COMPRESSION_SUFFIXES:
+            path = self.blob_path(digest, compression)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def ref_path(self, device):
+        return os.path.join(self.path, "refs", re.sub(r"[^\w.-]", "_", device))
+
+    def latest(self, device):
+        """Return the hash of the latest backup of device, or None"""
+        try:
+            with open(self.ref_path(device)) as f:
+                return f.read().strip() or None
+        except (IOError, OSError):
+            return None
+
+    def write(self, device, contents, timestamp=None):
+        """
+        Store the backup of device.
+
+        :returns: A dict with the hash and the blob path of the backup, and
+            whether it differs from the previous backup of the device
+        """
+        data = to_bytes(contents, errors="surrogate_or_strict")
+        digest = hashlib.sha256(data).hexdigest()
+        timestamp = timestamp or time.strftime("%Y-%m-%d@%H:%M:%S", time.localtime())
+
+        path = self.find_blob(digest)
+        if path is None:
+            path = self.blob_path(digest)
+            self._write_blob(path, data)
+
+        changed = self.latest(device) != digest
+        if changed:
+            self._write_atomic(self.ref_path(device), to_bytes(digest + "\n"))
+
+        entry = {"device": device, "hash": digest, "timestamp": timestamp, "size": len(data)}
+        self._append_index(entry)
+        return {"hash": digest, "path": path, "changed": changed, "timestamp": timestamp}
+
+    def read(self, digest):
+        """Return the contents of the blob of digest"""
+        path = self.find_blob(digest)
+        if path is None:
+            raise KeyError(digest)
+        with self._open(path, "rb") as f:
+            return to_text(f.read(), errors="surrogate_or_strict")
+
+    def index(self, device=None):
+        """Iterate over the index entries, optionally of one device"""
+        try:
+            f = open(os.path.join(self.path, "index.jsonl"))
+        except (IOError, OSError):
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if device is None or entry.get("device") == device:
+                    yield entry
+
+    def _open(self, path, mode):
+        if path.endswith(".gz"):
+            return gzip.open(path, mode)
+        if path.endswith(".zst"):
+            if not HAS_ZSTANDARD:
+                raise ValueError("reading %s requires the zstandard python library" % path)
+            if "r" in mode:
+                return zstandard.open(path, mode)
+        return open(path, mode)
+
+    def _write_blob(self, path, data):
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                if self.compression == "gzip":
+                    f = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+                elif self.compression == "zstd":
+                    f = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+                else:
+                    f = None
+                (f or raw).write(data)
+                if f:
+                    f.close()
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_atomic(self, path, data):
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _append_index(self, entry):
+        os.makedirs(self.path, exist_ok=True)
+        line = to_bytes(json.dumps(entry, sort_keys=True) + "\n")
+        # a single O_APPEND write keeps the lines of concurrent writers intact
+        fd = os.open(os.path.join(self.path, "index.jsonl"), os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
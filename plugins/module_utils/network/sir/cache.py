@@ -0,0 +1,124 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible.module_utils._text import to_bytes
+
+
+DEFAULT_CACHE_DIR = "~/.ansible/sir_config_cache"
+
+
+class ConfigCache(object):
+    """
+    File backed cache of device configurations on the controller.
+
+    Every entry is stored together with the `Running-config` timestamp of
+    the device and is only returned while that timestamp is unchanged.
+    Entries older than `max_age` seconds are evicted, and the least recently
+    used entries are evicted while the cache is larger than `max_size` bytes.
+    """
+
+    def __init__(self, path=None, max_age=None, max_size=None):
+        self.path = os.path.expanduser(path or DEFAULT_CACHE_DIR)
+        self.max_age = max_age
+        self.max_size = max_size
+
+    def _device_prefix(self, device):
+        # a fixed length digest, so the prefix of a device never matches the
+        # entries of another device
+        return hashlib.sha1(to_bytes(device, errors="surrogate_or_strict")).hexdigest() + "_"
+
+    def _entry_path(self, device, key):
+        digest = hashlib.sha1(to_bytes(key, errors="surrogate_or_strict")).hexdigest()
+        return os.path.join(self.path, self._device_prefix(device) + digest + ".json")
+
+    def get(self, device, key, timestamp):
+        path = self._entry_path(device, key)
+        try:
+            if self.max_age and time.time() - os.stat(path).st_mtime > self.max_age:
+                return None
+            with open(path) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if entry.get("timestamp") != timestamp:
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, device, key, timestamp, value):
+        os.makedirs(self.path, exist_ok=True)
+
+        entry = {"device": device, "key": key, "timestamp": timestamp, "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.rename(tmp_path, self._entry_path(device, key))
+        except (IOError, OSError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def delete(self, device, key):
+        self._remove(self._entry_path(device, key))
+
+    def invalidate(self, device):
+        prefix = self._device_prefix(device)
+        for name in self._listdir():
+            if name.startswith(prefix):
+                self._remove(os.path.join(self.path, name))
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        for name in self._listdir():
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if self.max_age and now - st.st_mtime > self.max_age:
+                self._remove(path)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        if self.max_size:
+            total = sum(size for mtime, size, path in entries)
+            for mtime, size, path in sorted(entries):
+                if total <= self.max_size:
+                    break
+                self._remove(path)
+                total -= size
+
+    def _listdir(self):
+        try:
+            return os.listdir(self.path)
+        except OSError:
+            return []
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
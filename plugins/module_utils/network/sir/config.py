@@ -0,0 +1,144 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import hashlib
+import re
+
+from ansible.module_utils._text import to_bytes, to_text
+
+
+COMMENT_TOKENS = ("#", "!", "/*", "*/", "echo")
+
+
+class SirConfig(object):
+    """
+    Model of a flat Si-R configuration.
+
+    Every configuration line is stored stripped, in order, and indexed by its
+    leading keyword (`ether`, `lan`, `remote`, ...) so lines can be looked up by
+    keyword path and two configurations can be compared with set operations.
+    With `unique` a line that is already in the configuration is not added
+    again.
+    """
+
+    def __init__(self, contents=None, ignore_lines=None, unique=False):
+        self._ignore_lines = [
+            re.compile(item) if isinstance(item, str) else item for item in ignore_lines or []
+        ]
+        self._lines = []
+        self._index = {}
+        self._line_set = None
+        self._unique = set() if unique else None
+        self.config_text = None
+
+        if contents:
+            self.load(contents)
+
+    def load(self, contents):
+        self.config_text = contents
+        self._lines = []
+        self._index = {}
+        self._line_set = None
+        if self._unique is not None:
+            self._unique = set()
+        self.add(to_text(contents, errors="surrogate_or_strict").splitlines())
+
+    def add(self, lines):
+        for line in lines:
+            text = line.strip()
+            if not text or self._ignore_line(text):
+                continue
+            if self._unique is not None:
+                if text in self._unique:
+                    continue
+                self._unique.add(text)
+            self._lines.append(text)
+            self._index.setdefault(text.split(None, 1)[0], []).append(text)
+        self._line_set = None
+
+    def _ignore_line(self, text):
+        if text.startswith(COMMENT_TOKENS):
+            return True
+        for regex in self._ignore_lines:
+            if regex.match(text):
+                return True
+        return False
+
+    @property
+    def lines(self):
+        return self._lines
+
+    @property
+    def line_set(self):
+        if self._line_set is None:
+            self._line_set = frozenset(self._lines)
+        return self._line_set
+
+    @property
+    def sections(self):
+        """The leading keywords of the configuration in order of appearance"""
+        return list(self._index)
+
+    @property
+    def sha1(self):
+        return hashlib.sha1(to_bytes(str(self), errors="surrogate_or_strict")).digest()
+
+    def section(self, keyword):
+        """Return the lines of the top level section `keyword`"""
+        return list(self._index.get(keyword, []))
+
+    def get(self, path):
+        """
+        Return the lines that start with the keyword path, for example
+        `ether 2 1` or `lan 0 ip`.
+        """
+        words = path.split() if isinstance(path, str) else list(path)
+        if not words:
+            return list(self._lines)
+        prefix = " ".join(words)
+        return [
+            line
+            for line in self._index.get(words[0], [])
+            if line == prefix or line.startswith(prefix + " ")
+        ]
+
+    def difference(self, other):
+        """Return the lines of this configuration that are not in `other`"""
+        other_set = other.line_set
+        return [line for line in self._lines if line not in other_set]
+
+    def __contains__(self, line):
+        return line.strip() in self.line_set
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __str__(self):
+        return "\n".join(self._lines)
+
+
+def config_diff(candidate, running=None, diff_match="line", diff_ignore_lines=None):
+    """
+    Return the lines of the candidate configuration that have to be sent to
+    the device, i.e. the lines that are not already in the running
+    configuration unless diff_match is `none`.
+
+    The configurations are either texts or SirConfig objects, which are used
+    as they are, so diff_ignore_lines only applies to a running text.
+    """
+    if not isinstance(candidate, SirConfig):
+        candidate = SirConfig(candidate)
+    if running and diff_match != "none":
+        if not isinstance(running, SirConfig):
+            running = SirConfig(running, ignore_lines=diff_ignore_lines)
+        return candidate.difference(running)
+    return list(candidate.lines)
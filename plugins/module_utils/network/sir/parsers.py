@@ -0,0 +1,246 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import re
+
+
+FIRMWARE_VERSION_RE = re.compile(r"Firm Ver\. : V(\d\d\.\d\d)")
+MODEL_RE = re.compile(r"System : ((Si-R|SR-S|SR-X) ?\w{2,6})")
+
+PING_RATE_RE = re.compile(
+    r"[ \t]*(?P<tx>\d+) packets transmitted, (?P<rx>\d+) packets received, "
+    r"(?P<pkt_loss>\d+)% packet loss"
+)
+PING_RTT_RE = re.compile(
+    r"[ \t]*round-trip \(ms\)\s+min/ave/max = "
+    r"(?P<min>\d*)\.?\d*/(?P<avg>\d*)\.?\d*/(?P<max>\d+)\.?\d*"
+)
+
+INTERFACE_HEADER_RE = re.compile(r"^\[(?P<name>[^\]]+)\]\s*$", re.M)
+INTERFACE_STATUS_RE = re.compile(r"^\s*status\s*:?\s*(?P<status>up|down)\b", re.M | re.I)
+INTERFACE_MTU_RE = re.compile(r"^\s*MTU\s*:?\s*(?P<mtu>\d+)", re.M)
+INTERFACE_ADDRESS_RE = re.compile(r"^\s*([0-9a-fA-F:.]+/\d+)\s*$", re.M)
+
+ROUTE_RE = re.compile(
+    r"(?P<destination>[0-9a-fA-F:.]+/\d+)\s+(?P<gateway>\S+)\s+(?P<interface>\S+)\s+"
+    r"(?P<metric>\d+)\s+(?P<type>\S+)\s+(?P<protocol>\S+)\s*$"
+)
+ARP_RE = re.compile(
+    r"(?P<address>[0-9.]+)\s+(?P<mac>[0-9a-fA-F:]{17}|\(incomplete\))\s+(?P<interface>\S+)"
+    r"(?:\s+(?P<type>\S+))?(?:\s+(?P<expire>\S+))?\s*$"
+)
+ETHER_HEADER_RE = re.compile(r"\[ETHER PORT-(?P<port>\d+)\]")
+ETHER_STATUS_RE = re.compile(r"(?P<status>\w+)(?:\((?P<speed>\w+) (?P<duplex>\w+)\))?")
+IPSEC_SA_RE = re.compile(r"remote (?P<remote>\d+) ap (?P<ap>\d+)(?: \((?P<interface>\w+)\))?:?$")
+
+
+def parse_system_information(data):
+    """Parse the output of `show system information` into a dict"""
+    info = {}
+    for line in data.splitlines():
+        key, sep, value = line.partition(" : ")
+        if sep:
+            info[key.strip()] = value.strip()
+    return info
+
+
+def parse_firmware_version(data):
+    """Return the firmware version, e.g. `20.54`, of `show system information`"""
+    match = FIRMWARE_VERSION_RE.search(data)
+    return match.group(1) if match else None
+
+
+def parse_model(data):
+    """Return the model, e.g. `Si-R G120`, of `show system information`"""
+    match = MODEL_RE.search(data)
+    return match.group(1) if match else None
+
+
+def _search_line(regex, data, marker):
+    """Match regex at the start of the lines containing marker"""
+    pos = data.find(marker)
+    while pos != -1:
+        start = data.rfind("\n", 0, pos) + 1
+        match = regex.match(data, start)
+        if match:
+            yield match
+        pos = data.find(marker, pos + len(marker))
+
+
+def parse_ping(output, count=None):
+    """
+    Parse the statistics of the output of a ping command into the
+    packet_loss, packets_rx, packets_tx and rtt results.
+
+    :param output: The output of the ping command
+    :param count: The number of packets transmitted, if given only the
+        statistics line of that many packets is accepted
+    :raises ValueError: If the output has no statistics
+    """
+    rate = None
+    for match in _search_line(PING_RATE_RE, output, " packets transmitted"):
+        if count is None or match.group("tx") == str(count):
+            rate = match
+            break
+    if rate is None:
+        raise ValueError("no ping statistics in the output")
+
+    results = {
+        "packet_loss": rate.group("pkt_loss") + "%",
+        "packets_rx": int(rate.group("rx")),
+        "packets_tx": int(rate.group("tx")),
+    }
+    for match in _search_line(PING_RTT_RE, output, "round-trip"):
+        results["rtt"] = dict((k, int(v)) for k, v in match.groupdict().items() if v)
+        break
+    return results
+
+
+def parse_interface_status(data):
+    """
+    Parse the output of `show interface` into a dict of the status, MTU and
+    addresses of every interface keyed by its name
+    """
+    headers = list(INTERFACE_HEADER_RE.finditer(data))
+    interfaces = {}
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(data)
+        block = data[header.end() : end]
+        interface = {"name": header.group("name")}
+        match = INTERFACE_STATUS_RE.search(block)
+        if match:
+            interface["status"] = match.group("status").lower()
+        match = INTERFACE_MTU_RE.search(block)
+        if match:
+            interface["mtu"] = int(match.group("mtu"))
+        addresses = INTERFACE_ADDRESS_RE.findall(block)
+        if addresses:
+            interface["addresses"] = addresses
+        interfaces[interface["name"]] = interface
+    return interfaces
+
+
+def _key(name):
+    return "_".join(name.lower().split())
+
+
+def _split_value(line):
+    """Return the snake case key and the value of a `key : value` line, or None"""
+    key, sep, value = line.partition(" : ")
+    if not sep or not key.strip():
+        return None
+    return _key(key), value.strip()
+
+
+def parse_ip_route(data):
+    """Parse the output of `show ip route` into a list of routes"""
+    routes = []
+    for line in data.splitlines():
+        match = ROUTE_RE.match(line.strip())
+        if match:
+            route = match.groupdict()
+            route["metric"] = int(route["metric"])
+            routes.append(route)
+    return routes
+
+
+def parse_arp(data):
+    """Parse the output of `show arp` into a list of entries"""
+    entries = []
+    for line in data.splitlines():
+        match = ARP_RE.match(line.strip())
+        if match:
+            entries.append(dict((k, v) for k, v in match.groupdict().items() if v is not None))
+    return entries
+
+
+def parse_ether(data):
+    """
+    Parse the output of `show ether` into a list of the attributes of every
+    port, with the status split into status, speed and duplex
+    """
+    ports = []
+    port = None
+    for line in data.splitlines():
+        match = ETHER_HEADER_RE.match(line.strip())
+        if match:
+            port = {"port": int(match.group("port"))}
+            ports.append(port)
+            continue
+        item = _split_value(line) if port is not None else None
+        if item is None:
+            continue
+        key, value = item
+        match = ETHER_STATUS_RE.match(value) if key == "status" else None
+        if match:
+            port["status"] = match.group("status")
+            if match.group("speed"):
+                port["speed"] = match.group("speed")
+                port["duplex"] = match.group("duplex").lower()
+        else:
+            port[key] = value
+    return ports
+
+
+def parse_ipsec_sa(data):
+    """Parse the output of `show ipsec sa` into a list of the attributes of every SA"""
+    sas = []
+    sa = None
+    for line in data.splitlines():
+        match = IPSEC_SA_RE.match(line.strip())
+        if match:
+            sa = dict((k, v) for k, v in match.groupdict().items() if v is not None)
+            sa["remote"] = int(sa["remote"])
+            sa["ap"] = int(sa["ap"])
+            sas.append(sa)
+            continue
+        item = _split_value(line) if sa is not None else None
+        if item:
+            sa[item[0]] = item[1]
+    return sas
+
+
+# (command, parser, whether the command takes arguments), the output of a
+# command without arguments is only parsed for exactly that command, e.g. not
+# for `show ether statistics`
+PARSERS = [
+    ("show system information", parse_system_information, False),
+    ("show interface", parse_interface_status, False),
+    ("show ip route", parse_ip_route, False),
+    ("show arp", parse_arp, False),
+    ("show ether", parse_ether, False),
+    ("show ipsec sa", parse_ipsec_sa, False),
+    ("ping", parse_ping, True),
+]
+
+
+def get_parser(command):
+    """Return the parser of the output of command, or None"""
+    words = command.split()
+    for name, parser, arguments in PARSERS:
+        keywords = name.split()
+        if words == keywords or (arguments and words[: len(keywords)] == keywords):
+            return parser
+    return None
+
+
+def parse_output(command, output):
+    """
+    Parse the output of command into structured data.
+
+    :returns: The parsed output, or None if there is no parser for command
+        or the output cannot be parsed
+    """
+    parser = get_parser(command)
+    if parser is None:
+        return None
+    try:
+        return parser(output)
+    except ValueError:
+        return None
@@ -0,0 +1,269 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.config import SirConfig
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import (
+    get_config,
+    load_config,
+)
+
+
+class Attribute(object):
+    """
+    One configuration line of a resource instance, e.g. `vlan untag 2` of
+    `ether 2 1 vlan untag 2`.
+
+    :param path: The keywords of the line after the instance name
+    :param fields: The (option, type) of every value following the path, the
+        last one takes the rest of the line.  The type is `str`, `int` or
+        `bool` for `on`/`off` values.
+    """
+
+    def __init__(self, path, fields):
+        self.path = path
+        self.fields = fields
+        self.keys = [key for key, kind in fields]
+
+    def parse(self, rest):
+        """Return the values of the line rest after the instance name, or None"""
+        if not rest.startswith(self.path + " "):
+            return None
+        words = rest[len(self.path) + 1 :].split(None, len(self.fields) - 1)
+        values = {}
+        for (key, kind), word in zip(self.fields, words):
+            if kind == "bool":
+                values[key] = word == "on"
+            elif kind == "int":
+                try:
+                    values[key] = int(word)
+                except ValueError:
+                    return None
+            else:
+                values[key] = word
+        return values
+
+    def render(self, values):
+        words = [self.path]
+        for key, kind in self.fields:
+            value = values.get(key)
+            if value is None:
+                break
+            if kind == "bool":
+                value = "on" if value else "off"
+            words.append(str(value))
+        return " ".join(words)
+
+    def values(self, instance):
+        return dict((key, instance.get(key)) for key in self.keys)
+
+
+class Resource(object):
+    """
+    Declarative model of the instances of a top level section of the
+    running-config, e.g. the ports of `ether` or the interfaces of `lan`.
+
+    The lines of an instance are parsed into a dict of the attribute values
+    keyed by option name, and the commands to get from one state to another
+    only touch the attributes that differ.  Lines that match no attribute are
+    left alone, also when an instance is deleted.
+
+    :param keyword: The leading keyword of the lines of the resource
+    :param name_words: The number of words of the instance name
+    :param attributes: The Attribute of every supported line
+    """
+
+    def __init__(self, keyword, name_words, attributes):
+        self.keyword = keyword
+        self.name_words = name_words
+        self.attributes = attributes
+
+    def parse(self, config):
+        """Return the instances of config, a text or a SirConfig, keyed by name"""
+        if not isinstance(config, SirConfig):
+            config = SirConfig(config)
+        instances = {}
+        for line in config.section(self.keyword):
+            words = line.split(None, self.name_words + 1)
+            if len(words) < self.name_words + 2:
+                continue
+            name = " ".join(words[1 : self.name_words + 1])
+            instance = instances.setdefault(name, {"name": name})
+            for attr in self.attributes:
+                values = attr.parse(words[-1])
+                if values is not None:
+                    instance.update(values)
+                    break
+        return instances
+
+    def _set(self, name, attr, values):
+        return "%s %s %s" % (self.keyword, name, attr.render(values))
+
+    def _delete(self, name, attr):
+        return "delete %s %s %s" % (self.keyword, name, attr.path)
+
+    def delete(self, have):
+        """
+        Return the commands that delete the attributes of the instance have,
+        lines that match no attribute are kept
+        """
+        return [
+            self._delete(have["name"], attr)
+            for attr in self.attributes
+            if any(v is not None for v in attr.values(have).values())
+        ]
+
+    def merge(self, have, want):
+        """
+        Return the commands that set the attributes of want that differ from
+        have, and the resulting instance
+        """
+        name = want["name"]
+        result = dict(have or {"name": name})
+        commands = []
+        for attr in self.attributes:
+            wanted = dict((k, v) for k, v in attr.values(want).items() if v is not None)
+            if not wanted:
+                continue
+            values = attr.values(result)
+            values.update(wanted)
+            if values != attr.values(result):
+                commands.append(self._set(name, attr, values))
+                result.update(values)
+        return commands, result
+
+    def replace(self, have, want):
+        """
+        Return the commands that make the attributes of the instance exactly
+        those of want, and the resulting instance
+        """
+        name = want["name"]
+        have = have or {"name": name}
+        result = {"name": name}
+        commands = []
+        for attr in self.attributes:
+            wanted = attr.values(want)
+            current = attr.values(have)
+            if all(v is None for v in wanted.values()):
+                if any(v is not None for v in current.values()):
+                    commands.insert(0, self._delete(name, attr))
+                continue
+            # values of the line that are not given are kept, e.g. the
+            # broadcast type of an address
+            for key, value in current.items():
+                if wanted[key] is None:
+                    wanted[key] = value
+            if wanted != current:
+                commands.append(self._set(name, attr, wanted))
+            result.update(dict((k, v) for k, v in wanted.items() if v is not None))
+        return commands, result
+
+    def compare(self, state, have, want):
+        """
+        Return the commands that bring the instances of have to the given
+        state with the instances of want, and the resulting instances.
+
+        :param state: merged, replaced, overridden or deleted
+        :param have: The current instances keyed by name
+        :param want: The list of the wanted instances
+        """
+        commands = []
+        result = dict(have)
+        if state == "deleted":
+            names = [item["name"] for item in want] if want else sorted(have)
+            for name in names:
+                if name in have:
+                    commands.extend(self.delete(have[name]))
+                    result.pop(name)
+            return commands, result
+
+        if state == "overridden":
+            wanted = set(item["name"] for item in want)
+            for name in sorted(have):
+                if name not in wanted:
+                    commands.extend(self.delete(have[name]))
+                    result.pop(name)
+
+        for item in want:
+            if state == "merged":
+                changes, instance = self.merge(have.get(item["name"]), item)
+            else:
+                changes, instance = self.replace(have.get(item["name"]), item)
+            commands.extend(changes)
+            result[item["name"]] = instance
+        return commands, result
+
+    def render(self, want):
+        """Return the configuration lines of the wanted instances"""
+        return self.compare("merged", {}, want)[0]
+
+
+def to_list_of_instances(instances):
+    return [instances[name] for name in sorted(instances)]
+
+
+def run_resource(module, resource):
+    """
+    Run a resource module: compare the wanted instances in the config option
+    with the section of the running-config of the resource and push only the
+    commands for the difference.
+    """
+    state = module.params["state"]
+    want = [
+        dict((k, v) for k, v in item.items() if v is not None)
+        for item in module.params["config"] or []
+    ]
+    result = {"changed": False}
+
+    if state == "rendered":
+        result["rendered"] = resource.render(want)
+        return result
+    if state == "parsed":
+        result["parsed"] = to_list_of_instances(resource.parse(module.params["running_config"]))
+        return result
+
+    # only the section of the resource is read from the device
+    have = resource.parse(get_config(module, section=resource.keyword))
+    if state == "gathered":
+        result["gathered"] = to_list_of_instances(have)
+        return result
+
+    commands, after = resource.compare(state, have, want)
+    result["before"] = to_list_of_instances(have)
+    result["commands"] = commands
+    if commands:
+        if not module.check_mode:
+            load_config(module, commands, commit=True)
+        result["changed"] = True
+        result["after"] = to_list_of_instances(after)
+    return result
+
+
+ETHER = Resource(
+    "ether",
+    2,
+    [
+        Attribute("description", [("description", "str")]),
+        Attribute("use", [("enabled", "bool")]),
+        Attribute("mode", [("mode", "str")]),
+        Attribute("mdi", [("mdi", "str")]),
+        Attribute("vlan untag", [("vlan_untag", "int")]),
+        Attribute("vlan tag", [("vlan_tag", "str")]),
+    ],
+)
+
+LAN = Resource(
+    "lan",
+    1,
+    [
+        Attribute("description", [("description", "str")]),
+        Attribute("ip address", [("ip_address", "str"), ("ip_broadcast", "int")]),
+        Attribute("vlan", [("vlan", "int")]),
+        Attribute("mtu", [("mtu", "int")]),
+    ],
+)
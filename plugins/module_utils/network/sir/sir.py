@@ -26,6 +26,8 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.u
     to_list,
 )
 from ansible.module_utils.connection import Connection, ConnectionError
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.cache import ConfigCache
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.config import SirConfig
 
 _DEVICE_CONFIGS = {}
 
@@ -55,29 +57,80 @@ def get_capabilities(module):
     return module._sir_capabilities
 
 
-def get_config(module, flags=None):
-    flags = to_list(flags)
+def get_config_cache(module, force=False):
+    if not (force or module.params.get("config_cache")):
+        return None
+    options = module.params.get("config_cache_options") or {}
+    return ConfigCache(
+        options.get("dir_path"),
+        max_age=options.get("max_age"),
+        max_size=options.get("max_size"),
+    )
+
+
+def set_cache_entry(module, cache, device, key, timestamp, value):
+    """Write a config cache entry, a failed write only costs a cache miss later"""
+    try:
+        cache.set(device, key, timestamp, value)
+    except (IOError, OSError, ValueError) as exc:
+        module.warn("unable to write to the config cache %s: %s" % (cache.path, to_text(exc)))
+
+
+def get_device_info(module):
+    return get_capabilities(module).get("device_info", {})
+
 
-    section_filter = False
-    if flags and "section" in flags[-1]:
-        section_filter = True
+def get_system_information(module):
+    connection = get_connection(module)
+    try:
+        return connection.get_system_information()
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
+
+
+def get_config(module, flags=None, section=None):
+    flags = to_list(flags)
+    if section:
+        flags = flags + [section]
 
     flag_str = " ".join(flags)
 
     try:
         return _DEVICE_CONFIGS[flag_str]
     except KeyError:
+        if section and " ".join(flags[:-1]) in _DEVICE_CONFIGS:
+            cfg = "\n".join(SirConfig(_DEVICE_CONFIGS[" ".join(flags[:-1])]).section(section))
+            _DEVICE_CONFIGS[flag_str] = cfg
+            return cfg
+
+        cache = get_config_cache(module)
+        device, timestamp = None, None
+        if cache:
+            sysinfo = get_system_information(module)
+            device = sysinfo.get("Serial No.")
+            timestamp = sysinfo.get("Running-config")
+            if device and timestamp:
+                cfg = cache.get(device, "running-config %s" % flag_str, timestamp)
+                if cfg is not None:
+                    _DEVICE_CONFIGS[flag_str] = cfg
+                    return cfg
+
         connection = get_connection(module)
         try:
             out = connection.get_config(flags=flags)
         except ConnectionError as exc:
-            if section_filter:
-                module.warn("section %s" % section_filter)
-                out = get_config(module, flags=flags[:-1])
+            if section:
+                module.warn(
+                    "unable to get section %s of the running-config, "
+                    "using the full running-config instead" % section
+                )
+                out = "\n".join(SirConfig(get_config(module, flags=flags[:-1])).section(section))
             else:
                 module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
         cfg = to_text(out, errors="surrogate_then_replace").strip()
         _DEVICE_CONFIGS[flag_str] = cfg
+        if cache and device and timestamp:
+            set_cache_entry(module, cache, device, "running-config %s" % flag_str, timestamp, cfg)
         return cfg
 
 
@@ -90,19 +143,48 @@ def get_defaults_flag(module):
     return to_text(out, errors="surrogate_then_replace").strip()
 
 
-def run_commands(module, commands, check_rc=True):
+def run_commands(module, commands, check_rc=True, batch=False):
+    connection = get_connection(module)
+    try:
+        return connection.run_commands(commands=commands, check_rc=check_rc, batch=batch)
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc))
+
+
+def run_commands_to_file(module, commands, dir_path, check_rc=True, batch=False, lines=0):
     connection = get_connection(module)
     try:
-        return connection.run_commands(commands=commands, check_rc=check_rc)
+        return connection.run_commands_to_file(
+            commands=commands, dir_path=dir_path, check_rc=check_rc, batch=batch, lines=lines
+        )
     except ConnectionError as exc:
         module.fail_json(msg=to_text(exc))
 
 
-def load_config(module, commands, commit=False, commit_timer=None):
+def load_config(module, commands, commit=False, commit_timer=None, pipeline_size=None):
     connection = get_connection(module)
 
+    cache = get_config_cache(module)
+    if cache:
+        device = get_system_information(module).get("Serial No.")
+        if device:
+            cache.invalidate(device)
+
     try:
-        resp = connection.edit_config(candidate=commands, commit=commit, commit_timer=commit_timer)
+        resp = connection.edit_config(
+            candidate=commands,
+            commit=commit,
+            commit_timer=commit_timer,
+            pipeline_size=pipeline_size,
+        )
         return resp.get("response")
     except ConnectionError as exc:
         module.fail_json(msg=to_text(exc))
+
+
+def confirm_commit(module):
+    connection = get_connection(module)
+    try:
+        return connection.confirm_commit()
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc))
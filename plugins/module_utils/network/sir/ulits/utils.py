@@ -4,6 +4,8 @@
 
 import ipaddress
 
+from datetime import datetime
+
 
 def is_valid_ip(ip_str):
     try:
@@ -11,3 +13,17 @@ def is_valid_ip(ip_str):
     except ValueError:
         return False
     return True
+
+
+def parse_config_timestamp(value):
+    """
+    Parse a timestamp of `show system information`, e.g. the value of
+    `Startup-config : Sat Nov 16 18:21:49 2024 config1`, into a datetime.
+    Returns None if the value is not a timestamp.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(" ".join(value.split()[:5]), "%a %b %d %H:%M:%S %Y")
+    except ValueError:
+        return None
@@ -0,0 +1,92 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import random
+import re
+import time
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import run_commands
+
+
+def conditional_commands(conditional, count):
+    """Return the indexes of the commands the conditional refers to"""
+    match = re.match(r"result\[(\d+)\]", conditional.key)
+    if match and int(match.group(1)) < count:
+        return [int(match.group(1))]
+    return list(range(count))
+
+
+def next_interval(interval, backoff, max_interval):
+    interval *= backoff
+    if max_interval and interval > max_interval:
+        interval = max_interval
+    return interval
+
+
+def wait_for_conditionals(
+    module,
+    commands,
+    conditionals,
+    match="all",
+    retries=9,
+    interval=1,
+    backoff=1,
+    max_interval=None,
+    jitter=0,
+    deadline=None,
+    rerun="all",
+    batch=False,
+):
+    """
+    Run commands until the conditionals are satisfied or the retries or the
+    deadline in seconds are exhausted.
+
+    :returns: The last output of every command and the conditionals that are
+        not satisfied
+    """
+    conditionals = list(conditionals)
+    jitter = min(max(jitter, 0), 1)
+    if deadline:
+        deadline += time.time()
+
+    responses = [None] * len(commands)
+    pending = list(range(len(commands)))
+    while retries >= 0:
+        output = run_commands(module, [commands[index] for index in pending], batch=batch)
+        for index, out in zip(pending, output):
+            responses[index] = out
+        for item in list(conditionals):
+            if item(responses):
+                if match == "any":
+                    conditionals = list()
+                    break
+                conditionals.remove(item)
+        if not conditionals:
+            break
+
+        retries -= 1
+        if retries < 0:
+            break
+        delay = interval * (1 - jitter * random.random())
+        if deadline:
+            delay = min(delay, deadline - time.time())
+            if delay <= 0:
+                break
+        time.sleep(delay)
+        interval = next_interval(interval, backoff, max_interval)
+
+        if rerun == "pending":
+            pending = sorted(
+                set(
+                    index
+                    for item in conditionals
+                    for index in conditional_commands(item, len(commands))
+                )
+            )
+    return responses, conditionals
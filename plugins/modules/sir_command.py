@@ -36,6 +36,11 @@ options:
         The resulting output from the command is returned. If the I(wait_for) argument
         is provided, the module is not returned until the condition is satisfied or
         the number of retries has expired.
+      - A command can also be given as a dict with the C(command) and the C(output) keys.
+        With C(output=json) the output of C(show ip route), C(show arp), C(show ether),
+        C(show ipsec sa), C(show interface), C(show system information) and C(ping) is
+        parsed and returned as structured data instead of text.  The C(show) commands
+        must be given without further arguments.
     required: true
     type: list
     elements: raw
@@ -73,6 +78,73 @@ options:
         long to wait before trying the command again.
     default: 1
     type: int
+  backoff:
+    description:
+      - The factor the interval is multiplied by after every retry.  The default of C(1)
+        keeps the interval constant, C(2) doubles it after every retry.
+    default: 1
+    type: float
+    version_added: 1.3.0
+  max_interval:
+    description:
+      - The maximum interval in seconds between retries when I(backoff) is greater than C(1).
+    type: int
+    version_added: 1.3.0
+  jitter:
+    description:
+      - Randomly shorten every interval by up to this fraction of it, e.g. C(0.2) waits
+        between 80% and 100% of the interval.  This spreads the polling of many devices
+        waiting for the same event.
+    default: 0
+    type: float
+    version_added: 1.3.0
+  deadline:
+    description:
+      - The maximum time in seconds to wait for the conditions, regardless of the number of
+        I(retries) left.
+    type: int
+    version_added: 1.3.0
+  rerun:
+    description:
+      - The commands run again on every retry.
+      - If the value is set to C(all), all commands are run again.
+      - If the value is set to C(pending), only the commands referenced by the conditionals
+        of I(wait_for) that are not yet satisfied, e.g. the command C(result[1]) refers to,
+        are run again.  The output of the other commands is the output of their last run.
+    default: all
+    type: str
+    choices:
+      - all
+      - pending
+    version_added: 1.3.0
+  batch:
+    description:
+      - Send all commands to the device in a single write and split the combined output
+        back into the response of every command, instead of waiting for the prompt after
+        each command.  This reduces the number of round trips over high latency links.
+      - Commands with I(prompt) or I(answer) are always sent one by one.
+    default: false
+    type: bool
+    version_added: 1.3.0
+  output_dir:
+    description:
+      - Write the output of every command to a file in this directory on the Ansible control
+        host instead of returning it in I(stdout).  The file is named after the command, e.g.
+        C(show_ip_route.txt), and is written by the persistent connection once the whole output
+        of the command is received, so large outputs are not passed through the module result.
+      - A relative path is relative to the playbook directory, or to the role directory when
+        the task is in a role.
+      - Only the path, size, sha256 and line count of every output are returned in I(output).
+      - This argument can not be used with I(wait_for).
+    type: path
+    version_added: 1.3.0
+  output_lines:
+    description:
+      - The number of lines of the start and of the end of every output to return in the
+        I(head) and I(tail) of I(output) when I(output_dir) is set.
+    default: 0
+    type: int
+    version_added: 1.3.0
 """
 
 EXAMPLES = r"""
@@ -87,32 +159,99 @@ EXAMPLES = r"""
       - show system information
     wait_for: result[0] contains 'Si-R G120'
 
+- name: Wait for the IPsec SA to come up, polling less often the longer it takes
+  caribouhy.sir.sir_command:
+    commands:
+      - show system information
+      - show ipsec sa
+    wait_for: result[1] contains 'ipsec'
+    retries: 20
+    backoff: 2
+    max_interval: 30
+    jitter: 0.2
+    deadline: 300
+    rerun: pending
+
+- name: Return the routing table as structured data
+  caribouhy.sir.sir_command:
+    commands:
+      - command: show ip route
+        output: json
+    wait_for: result[0][0].gateway eq 203.0.113.254
+
 - name: Run multiple commands on remote device
   caribouhy.sir.sir_command:
     commands:
       - show system information
       - show system status
+
+- name: Run multiple commands on remote device in a single round trip
+  caribouhy.sir.sir_command:
+    commands:
+      - show system information
+      - show system status
+      - show ip route
+    batch: true
+
+- name: Save the routing table of the device to a file on the control host
+  caribouhy.sir.sir_command:
+    commands:
+      - show ip route
+    output_dir: "{{ playbook_dir }}/output/{{ inventory_hostname }}"
+    output_lines: 5
 """
 
 RETURN = """
 stdout:
   description: The set of responses from the commands
-  returned: always apart from low level errors (such as action plugin)
+  returned: always apart from low level errors (such as action plugin) when output_dir is not set
   type: list
   sample: ['...', '...']
 stdout_lines:
   description: The value of stdout split into a list
-  returned: always apart from low level errors (such as action plugin)
+  returned: always apart from low level errors (such as action plugin) when output_dir is not set
   type: list
   sample: [['...', '...'], ['...'], ['...']]
+output:
+  description: The file written for every command
+  returned: when output_dir is set
+  type: list
+  elements: dict
+  contains:
+    path:
+      description: The path of the file with the output of the command
+      type: str
+      sample: /playbooks/output/router1/show_ip_route.txt
+    size:
+      description: The size of the output in bytes
+      type: int
+      sample: 3145728
+    sha256:
+      description: The sha256 of the output
+      type: str
+      sample: 9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08
+    lines:
+      description: The number of lines of the output
+      type: int
+      sample: 40000
+    head:
+      description: The first output_lines lines of the output
+      returned: when output_lines is set
+      type: list
+      elements: str
+      sample: ['Codes: C - connected, S - static, R - RIP, O - OSPF, B - BGP']
+    tail:
+      description: The last output_lines lines of the output
+      returned: when output_lines is set
+      type: list
+      elements: str
+      sample: ['C    192.0.2.0/24 [0/0] is directly connected, lan0']
 failed_conditions:
   description: The list of conditionals that have failed
   returned: failed
   type: list
   sample: ['...', '...']
 """
-import time
-
 from ansible.module_utils._text import to_text
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.parsing import (
@@ -124,7 +263,10 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.u
 )
 
 from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import (
-    run_commands,
+    run_commands_to_file,
+)
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.wait import (
+    wait_for_conditionals,
 )
 
 
@@ -149,33 +291,54 @@ def main():
         match=dict(default="all", choices=["all", "any"]),
         retries=dict(default=9, type="int"),
         interval=dict(default=1, type="int"),
+        backoff=dict(default=1, type="float"),
+        max_interval=dict(type="int"),
+        jitter=dict(default=0, type="float"),
+        deadline=dict(type="int"),
+        rerun=dict(default="all", choices=["all", "pending"]),
+        batch=dict(default=False, type="bool"),
+        output_dir=dict(type="path"),
+        output_lines=dict(default=0, type="int"),
+    )
+    mutually_exclusive = [("output_dir", "wait_for")]
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        supports_check_mode=True,
     )
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
     warnings = list()
     result = {"changed": False, "warnings": warnings}
     commands = parse_commands(module, warnings)
+
+    if module.params["output_dir"]:
+        result["output"] = run_commands_to_file(
+            module,
+            commands,
+            module.params["output_dir"],
+            batch=module.params["batch"],
+            lines=module.params["output_lines"],
+        )
+        module.exit_json(**result)
     wait_for = module.params["wait_for"] or list()
     conditionals = []
     try:
         conditionals = [Conditional(c) for c in wait_for]
     except AttributeError as exc:
         module.fail_json(msg=to_text(exc))
-    retries = module.params["retries"]
-    interval = module.params["interval"]
-    match = module.params["match"]
-
-    while retries >= 0:
-        responses = run_commands(module, commands)
-        for item in list(conditionals):
-            if item(responses):
-                if match == "any":
-                    conditionals = list()
-                    break
-                conditionals.remove(item)
-        if not conditionals:
-            break
-        time.sleep(interval)
-        retries -= 1
+    responses, conditionals = wait_for_conditionals(
+        module,
+        commands,
+        conditionals,
+        match=module.params["match"],
+        retries=module.params["retries"],
+        interval=module.params["interval"],
+        backoff=module.params["backoff"],
+        max_interval=module.params["max_interval"],
+        jitter=module.params["jitter"],
+        deadline=module.params["deadline"],
+        rerun=module.params["rerun"],
+        batch=module.params["batch"],
+    )
 
     if conditionals:
         failed_conditions = [item.raw for item in conditionals]
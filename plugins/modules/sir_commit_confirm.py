@@ -0,0 +1,197 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_commit_confirm
+author: caribouHY (@caribouHY)
+short_description: Confirm a commit with a timer on Si-R devices after health checks.
+description:
+  - Confirms the configuration committed by M(caribouhy.sir.sir_config) with I(commit_timer),
+    optionally only after health checks pass.
+  - The health checks are commands and I(wait_for) conditionals like those of
+    M(caribouhy.sir.sir_command).  If they are not satisfied the commit is not confirmed, the
+    task fails and the device rolls the configuration back when the commit timer expires.
+  - The push, the checks and the confirmation are separate short tasks, so with the C(free)
+    strategy every device goes through them at its own pace and no worker is held for the
+    duration of the commit timer.
+  - Only a commit made with I(commit_timer) over the same persistent connection is confirmed.
+    If the connection was restarted since, for example after its idle timeout, the module fails
+    because the commit timer may already have rolled the configuration back.
+version_added: 1.3.0
+options:
+  commands:
+    description:
+      - List of commands to run as health checks before the commit is confirmed.
+      - In check mode only C(show) commands are supported.
+    type: list
+    elements: raw
+  wait_for:
+    description:
+      - List of conditions to evaluate against the output of I(commands).  The commit is only
+        confirmed once the conditions are true.
+    type: list
+    elements: str
+  match:
+    description:
+      - The match policy of I(wait_for), C(all) or C(any).
+    default: all
+    type: str
+    choices:
+      - any
+      - all
+  retries:
+    description:
+      - The number of times the checks are retried before the task fails.
+    default: 9
+    type: int
+  interval:
+    description:
+      - The interval in seconds between retries of the checks.
+    default: 1
+    type: int
+  backoff:
+    description:
+      - The factor the interval is multiplied by after every retry.
+    default: 1
+    type: float
+  max_interval:
+    description:
+      - The maximum interval in seconds between retries when I(backoff) is greater than C(1).
+    type: int
+  deadline:
+    description:
+      - The maximum time in seconds to wait for the conditions.  Set it below the commit timer
+        so that the checks give up before the device rolls the configuration back.
+    type: int
+"""
+
+EXAMPLES = r"""
+- name: Push the configuration, rolled back in 5 minutes unless confirmed
+  caribouhy.sir.sir_config:
+    lines:
+      - lan 1 ip address 203.0.113.1/24 3
+    commit_timer: 5
+
+- name: Confirm the configuration once the remote site is reachable again
+  caribouhy.sir.sir_commit_confirm:
+    commands:
+      - ping 198.51.100.1 repeat 3
+      - show ipsec sa
+    wait_for:
+      - result[0] contains '0% packet loss'
+      - result[1] contains 'established'
+    interval: 5
+    deadline: 240
+"""
+
+RETURN = """
+confirmed:
+  description: Whether the commit was confirmed.
+  returned: always
+  type: bool
+remaining:
+  description: The seconds that were left on the commit timer when the commit was confirmed.
+  returned: when confirmed
+  type: float
+stdout:
+  description: The output of the health check commands.
+  returned: when I(commands) is given
+  type: list
+stdout_lines:
+  description: The output of the health check commands split into lines.
+  returned: when I(commands) is given
+  type: list
+failed_conditions:
+  description: The health checks that were not satisfied.
+  returned: failed
+  type: list
+"""
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.parsing import (
+    Conditional,
+)
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
+    to_lines,
+    transform_commands,
+)
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import confirm_commit
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.wait import (
+    wait_for_conditionals,
+)
+
+
+def main():
+    """main entry point for module execution"""
+    argument_spec = dict(
+        commands=dict(type="list", elements="raw"),
+        wait_for=dict(type="list", elements="str"),
+        match=dict(default="all", choices=["all", "any"]),
+        retries=dict(default=9, type="int"),
+        interval=dict(default=1, type="int"),
+        backoff=dict(default=1, type="float"),
+        max_interval=dict(type="int"),
+        deadline=dict(type="int"),
+    )
+    required_by = {"wait_for": "commands"}
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_by=required_by,
+        supports_check_mode=True,
+    )
+    result = {"changed": False, "confirmed": False}
+
+    if module.params["commands"]:
+        commands = transform_commands(module)
+        if module.check_mode:
+            unsupported = [c["command"] for c in commands if not c["command"].startswith("show")]
+            if unsupported:
+                module.fail_json(
+                    msg="Only show commands are supported when using check mode, not executing %s"
+                    % ", ".join(unsupported)
+                )
+        try:
+            conditionals = [Conditional(c) for c in module.params["wait_for"] or []]
+        except AttributeError as exc:
+            module.fail_json(msg=to_text(exc))
+
+        responses, conditionals = wait_for_conditionals(
+            module,
+            commands,
+            conditionals,
+            match=module.params["match"],
+            retries=module.params["retries"] if conditionals else 0,
+            interval=module.params["interval"],
+            backoff=module.params["backoff"],
+            max_interval=module.params["max_interval"],
+            deadline=module.params["deadline"],
+            rerun="pending",
+        )
+        result.update({"stdout": responses, "stdout_lines": list(to_lines(responses))})
+        if conditionals:
+            result["failed_conditions"] = [item.raw for item in conditionals]
+            msg = (
+                "One or more health checks have not been satisfied, the commit is not confirmed "
+                "and will be rolled back when the commit timer expires"
+            )
+            module.fail_json(msg=msg, **result)
+
+    if not module.check_mode:
+        result["remaining"] = confirm_commit(module)
+        result["confirmed"] = True
+        result["changed"] = True
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
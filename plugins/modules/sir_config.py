@@ -97,6 +97,48 @@ options:
         the commit is confirmed immediately which is also the default behaviour.
     type: int
     default: 0
+  pipeline_size:
+    description:
+      - The number of configuration lines written to the device at once without waiting
+        for the prompt of every line.  The output is checked for errors after every batch,
+        and the errors are reported with the offending lines.  If any line fails, the
+        changes are discarded and nothing is committed.
+      - If the value for this argument is set to 0, every line is sent and checked one
+        by one which is also the default behaviour.
+    type: int
+    default: 0
+    version_added: 1.3.0
+  commit_chunks:
+    description:
+      - Commits the configuration in chunks one after the other instead of all at once, so a
+        failing line only discards the changes of its chunk.
+      - The chunks are committed immediately, this argument can not be used together with
+        I(commit_timer).
+    type: dict
+    version_added: 1.3.0
+    suboptions:
+      size:
+        description:
+          - The maximum number of lines of a chunk.  If the value is set to 0 the size of the
+            chunks is not limited.
+        type: int
+        default: 0
+      sections:
+        description:
+          - End a chunk wherever the top level section of the lines changes, e.g. after the
+            C(acl) lines and after the C(remote) lines.  C(delete) lines belong to the section
+            they delete from.
+        type: bool
+        default: false
+      checkpoint:
+        description:
+          - Record the commands and the number of committed lines after every chunk in the
+            C(checkpoints) subdirectory of the I(config_cache_options) directory.  If the task
+            fails, a rerun with the same candidate configuration and I(before) and I(after)
+            lines resumes with the recorded commands after the last committed chunk.  The
+            record is removed once all chunks are committed.
+        type: bool
+        default: true
   running_config:
     description:
       - The module, by default, will connect to the remote device and retrieve the current
@@ -107,9 +149,67 @@ options:
         The configuration lines for this option should be similar to how it will appear if present
         in the running-configuration of the device including the indentation to ensure idempotency
         and correct diff.
+      - The diff between the candidate and the running-config is always computed by the module
+        itself, so in check mode with I(running_config) set the module does not connect to the
+        device unless I(backup), I(save_when) or a diff against the device requires it.
     type: str
     aliases:
       - config
+  config_scope:
+    description:
+      - Controls how much of the device running-config is retrieved to compare against the
+        contents of I(lines) or I(src).
+      - If set to I(full), the whole running-config is retrieved.
+      - If set to I(section), only the top level sections (C(ether), C(lan), C(remote), C(acl), ...)
+        touched by the candidate configuration are retrieved with C(show running-config <section>),
+        so the amount of data transferred scales with the size of the change instead of the size of
+        the device configuration.  If a section can not be retrieved, it is extracted from the full
+        running-config instead.
+      - This argument is ignored when I(defaults) is enabled.
+    choices:
+      - full
+      - section
+    type: str
+    default: full
+    version_added: 1.3.0
+  config_cache:
+    description:
+      - This argument enables a persistent cache of the device running-config on the Ansible
+        control host.  When enabled, the module first issues C(show system information) and
+        reuses the cached running-config as long as the C(Running-config) timestamp reported
+        by the device is unchanged.  The full running-config is only retrieved from the device
+        when the timestamp changes.
+      - With I(match=line) the hash of a candidate configuration that is already contained in
+        the running-config is cached as well, so the same I(src) or I(lines) is not compared
+        again as long as the timestamp is unchanged.
+    type: bool
+    default: false
+    version_added: 1.3.0
+  config_cache_options:
+    description:
+      - This is a dict object containing configurable options related to the directory on
+        the Ansible control host in which the running-config cache of I(config_cache), the
+        checkpoints of I(commit_chunks) and the save records of I(save_check) are stored.
+    suboptions:
+      dir_path:
+        description:
+          - The path of the directory in which the cached configurations are stored.  If the
+            directory does not exist it will be created.
+        type: path
+        default: ~/.ansible/sir_config_cache
+      max_age:
+        description:
+          - The maximum age in seconds of a cached configuration.  Older entries are evicted.
+        type: int
+        default: 86400
+      max_size:
+        description:
+          - The maximum total size in bytes of the cache directory.  The least recently used
+            entries are evicted when the cache grows larger than this value.
+        type: int
+        default: 104857600
+    type: dict
+    version_added: 1.3.0
   defaults:
     description:
       - This argument specifies whether or not to collect all defaults when getting
@@ -136,6 +236,24 @@ options:
       - modified
       - changed
     type: str
+  save_check:
+    description:
+      - This argument specifies how I(save_when=modified) decides whether the running-config
+        has been modified since the last save.
+      - If the argument is set to I(full), the running-config and the startup-config are
+        retrieved from the device and compared.
+      - If the argument is set to I(timestamp), the C(Running-config), C(Startup-config) and
+        C(Startup-time) timestamps reported by C(show system information) are compared
+        instead.  When the timestamps are not conclusive, the module looks up the digest
+        recorded in the directory of I(config_cache_options) the last time it saved or
+        compared the device configuration, and only falls back to the full comparison if
+        the timestamps changed since then.
+    choices:
+      - full
+      - timestamp
+    type: str
+    default: full
+    version_added: 1.3.0
   diff_against:
     description:
       - When using the C(ansible-playbook --diff) command line argument the module can
@@ -198,7 +316,37 @@ options:
             path value is not given in that case a I(backup) directory will be created
             in the current working directory and backup configuration will be copied
             in C(filename) within I(backup) directory.
+          - When I(dedup) is enabled, this is the directory of the backup store.
         type: path
+      dedup:
+        description:
+          - Write the backup directly from the module to a content addressed store in
+            C(dir_path) instead of returning it to the action plugin.
+          - Every backup is stored once as a blob named after the sha256 of the configuration,
+            so identical configurations of many devices or of many runs share one blob.  Every
+            run appends the device, the hash and the time of the backup to C(index.jsonl) and
+            C(refs/<device>) holds the hash of the latest backup of the device.
+          - C(filename) is ignored when this option is enabled.
+        type: bool
+        default: false
+        version_added: 1.3.0
+      compression:
+        description:
+          - The compression of the blobs written to the backup store when I(dedup) is enabled.
+          - I(zstd) requires the C(zstandard) python library on the control host.
+        choices:
+          - none
+          - gzip
+          - zstd
+        type: str
+        default: none
+        version_added: 1.3.0
+      device:
+        description:
+          - The name the backup is recorded under in the backup store when I(dedup) is enabled.
+          - Defaults to the C(inventory_hostname) of the device.
+        type: str
+        version_added: 1.3.0
     type: dict
 """
 
@@ -217,11 +365,27 @@ commands:
   returned: always
   type: list
   sample: ['lan 0 description foo', 'lan 0 ip ospf use on 0', 'ospf ip area 0 id 192.0.2.1']
+chunks:
+  description: The number of lines and the seconds taken to send and commit every chunk.
+  returned: when I(commit_chunks) is set and commands were pushed
+  type: list
+  sample: [{"lines": 500, "elapsed": 12.3}, {"lines": 120, "elapsed": 3.1}]
+resumed:
+  description: The number of recorded lines not sent again because a previous run already
+    committed them.
+  returned: when I(commit_chunks) is set and commands were pushed
+  type: int
+  sample: 500
 backup_path:
   description: The full path to the backup file
   returned: when backup is yes
   type: str
   sample: /playbooks/ansible/backup/sir_config.2024-11-20@22:28:34
+backup_hash:
+  description: The sha256 of the backup configuration
+  returned: when backup is yes and dedup is enabled in backup options
+  type: str
+  sample: 9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08
 filename:
   description: The name of the backup file
   returned: when backup is yes and filename is not specified in backup options
@@ -244,56 +408,275 @@ time:
   sample: "22:28:34"
 """
 
-from ansible.module_utils._text import to_text
-from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.connection import ConnectionError
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (
-    NetworkConfig,
-    dumps,
-)
+import binascii
+import hashlib
+import json
+import os
+import time
 
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.backup import (
+    HAS_ZSTANDARD,
+    BackupStore,
+)
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.cache import ConfigCache
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.config import (
+    SirConfig,
+    config_diff,
+)
 from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import (
     get_config,
-    get_connection,
+    get_config_cache,
     get_defaults_flag,
+    get_system_information,
     run_commands,
     load_config,
+    set_cache_entry,
+)
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.ulits.utils import (
+    parse_config_timestamp,
 )
 
+SAVED_CONFIG_KEY = "saved-config"
+IN_SYNC_KEY = "in-sync %s"
+CHECKPOINT_KEY = "checkpoint"
+
 
 def get_candidate_config(module):
-    candidate = ""
+    """
+    Return the candidate configuration of src or lines, parsed once into a
+    SirConfig of stripped and de-duplicated lines
+    """
     if module.params["src"]:
-        commands = module.params["src"].splitlines()
-        if len(commands) > 0:
-            commands = [line.strip() for line in commands if len(line.strip()) > 0]
-        candidate = "\n".join(commands)
-    elif module.params["lines"]:
-        candidate_obj = NetworkConfig(indent=0)
-        candidate_obj.add(module.params["lines"])
-        candidate = dumps(candidate_obj, "raw")
+        return SirConfig(module.params["src"], unique=True)
+    candidate = SirConfig(unique=True)
+    candidate.add(module.params["lines"] or [])
     return candidate
 
 
-def get_running_config(module, current_config=None, flags=None):
+def get_candidate_sections(candidate):
+    """Return the top level sections touched by the candidate configuration"""
+    # delete commands never match a running-config line
+    return [section for section in candidate.sections if section != "delete"]
+
+
+def get_in_sync_entry(module, candidate):
+    """
+    Return the config cache, the device, the Running-config timestamp and the
+    key that record that the running-config already contains the candidate,
+    or None if the check does not apply
+    """
+    if module.params["match"] != "line" or module.params["running_config"]:
+        return None
+    if module.params["defaults"]:
+        return None
+    cache = get_config_cache(module)
+    if not cache:
+        return None
+    sysinfo = get_system_information(module)
+    device = sysinfo.get("Serial No.")
+    timestamp = sysinfo.get("Running-config")
+    if not device or not timestamp:
+        return None
+    key = IN_SYNC_KEY % to_text(binascii.hexlify(candidate.sha1))
+    return cache, device, timestamp, key
+
+
+def get_running_config(module, current_config=None, flags=None, sections=None):
     running = module.params["running_config"]
     if not running:
         if not module.params["defaults"] and current_config:
             running = current_config
+        elif not module.params["defaults"] and sections is not None:
+            running = "\n".join(
+                get_config(module, flags=flags, section=section) for section in sections
+            )
         else:
             running = get_config(module, flags=flags)
     return running
 
 
+def command_section(command):
+    """Return the top level section of a configuration line"""
+    words = command.split(None, 2)
+    if words[0] == "delete" and len(words) > 1:
+        return words[1]
+    return words[0]
+
+
+def split_chunks(commands, size=0, sections=False):
+    """Split the commands into the chunks that are committed one after the other"""
+    chunks = []
+    chunk = []
+    section = None
+    for command in commands:
+        current = command_section(command)
+        full = size and len(chunk) >= size
+        if chunk and (full or sections and current != section):
+            chunks.append(chunk)
+            chunk = []
+        chunk.append(command)
+        section = current
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def get_checkpoint_store(module):
+    """
+    Return the store of the chunk checkpoints, a subdirectory of the config
+    cache that load_config does not invalidate
+    """
+    cache = get_config_cache(module, force=True)
+    return ConfigCache(os.path.join(cache.path, "checkpoints"), max_age=cache.max_age)
+
+
+def checkpoint_digest(module, candidate):
+    """Return the digest of the candidate and the before and after lines of the task"""
+    data = json.dumps([str(candidate), module.params["before"], module.params["after"]])
+    return hashlib.sha1(to_bytes(data, errors="surrogate_or_strict")).hexdigest()
+
+
+def load_config_chunks(module, result, candidate, commands, pipeline_size=None):
+    """
+    Commit the commands chunk by chunk.  With checkpoint the commands and the
+    number of committed lines are recorded against the candidate, and a rerun
+    resumes with the recorded commands after the last committed chunk.
+    """
+    options = module.params["commit_chunks"]
+    store, device = None, None
+    if options["checkpoint"]:
+        store = get_checkpoint_store(module)
+        device = get_system_information(module).get("Serial No.")
+    digest = checkpoint_digest(module, candidate)
+
+    committed = 0
+    if device:
+        checkpoint = store.get(device, CHECKPOINT_KEY, digest)
+        if checkpoint:
+            # the lines committed before are no longer in the diff, resume
+            # with the commands of the interrupted run by position
+            commands = checkpoint["commands"]
+            committed = checkpoint["committed"]
+    result["resumed"] = committed
+
+    result["chunks"] = []
+    for chunk in split_chunks(commands[committed:], options["size"], options["sections"]):
+        start = time.time()
+        load_config(module, chunk, commit=True, pipeline_size=pipeline_size)
+        result["chunks"].append({"lines": len(chunk), "elapsed": round(time.time() - start, 3)})
+        committed += len(chunk)
+        if device:
+            checkpoint = {"commands": commands, "committed": committed}
+            set_cache_entry(module, store, device, CHECKPOINT_KEY, digest, checkpoint)
+
+    if device:
+        store.delete(device, CHECKPOINT_KEY)
+
+
+def store_backup(module, result, contents):
+    """Write the backup to the backup store of backup_options"""
+    options = module.params["backup_options"]
+    if options["compression"] == "zstd" and not HAS_ZSTANDARD:
+        module.fail_json(msg=missing_required_lib("zstandard"))
+    if not options["dir_path"] or not options["device"]:
+        module.fail_json(
+            msg="backup_options dir_path and device are required when dedup is enabled"
+        )
+
+    store = BackupStore(options["dir_path"], compression=options["compression"])
+    try:
+        backup = store.write(options["device"], contents)
+    except (IOError, OSError) as exc:
+        module.fail_json(msg="Could not write to backup store %s: %s" % (store.path, to_text(exc)))
+
+    result["backup_path"] = backup["path"]
+    result["backup_hash"] = backup["hash"]
+    result["date"], result["time"] = backup["timestamp"].split("@")
+    if backup["changed"]:
+        result["changed"] = True
+
+
 def save_config(module, result):
     result["changed"] = True
     run_commands(module, commands=["configure", "save", "exit"])
 
 
+def running_config_modified(sysinfo):
+    """
+    Decide from the config timestamps of `show system information` whether the
+    running-config was modified since it was last saved.  Returns None if the
+    timestamps are not conclusive.
+    """
+    running = parse_config_timestamp(sysinfo.get("Running-config"))
+    startup = parse_config_timestamp(sysinfo.get("Startup-config"))
+    boot = parse_config_timestamp(sysinfo.get("Startup-time"))
+    if running is None or startup is None:
+        return None
+    if running == boot and startup < boot:
+        # the running-config is still the startup-config loaded at boot
+        return False
+    if running > startup and running != boot:
+        return True
+    return None
+
+
+def saved_config_stamp(sysinfo):
+    return "%s / %s" % (sysinfo.get("Running-config"), sysinfo.get("Startup-config"))
+
+
+def save_if_modified(module, result, diff_ignore_lines):
+    """
+    save_when=modified using the config timestamps of the device, the full
+    comparison is only done when the timestamps are not conclusive
+    """
+    configs = None
+    cache = get_config_cache(module, force=True)
+    sysinfo = get_system_information(module)
+    device = sysinfo.get("Serial No.")
+    digest = ""
+
+    modified = running_config_modified(sysinfo)
+    if modified is None and device:
+        if cache.get(device, SAVED_CONFIG_KEY, saved_config_stamp(sysinfo)) is not None:
+            modified = False
+    if modified is None:
+        output = run_commands(module, ["show running-config", "show startup-config"])
+        configs = [SirConfig(out, ignore_lines=diff_ignore_lines) for out in output]
+        modified = configs[0].sha1 != configs[1].sha1
+        digest = to_text(binascii.hexlify(configs[0].sha1))
+
+    if modified:
+        save_config(module, result)
+        sysinfo = get_system_information(module)
+    if device:
+        set_cache_entry(
+            module, cache, device, SAVED_CONFIG_KEY, saved_config_stamp(sysinfo), digest
+        )
+    return configs
+
+
 def main():
     """main entry point for module execution"""
     backup_spec = dict(
-        filename=dict(), dir_path=dict(type="path"), append_eof=dict(type="bool", default=False)
+        filename=dict(),
+        dir_path=dict(type="path"),
+        append_eof=dict(type="bool", default=False),
+        dedup=dict(type="bool", default=False),
+        compression=dict(choices=["none", "gzip", "zstd"], default="none"),
+        device=dict(),
+    )
+    cache_spec = dict(
+        dir_path=dict(type="path", default="~/.ansible/sir_config_cache"),
+        max_age=dict(type="int", default=86400),
+        max_size=dict(type="int", default=104857600),
+    )
+    commit_chunks_spec = dict(
+        size=dict(type="int", default=0),
+        sections=dict(type="bool", default=False),
+        checkpoint=dict(type="bool", default=True),
     )
     argument_spec = dict(
         src=dict(type="path"),
@@ -302,14 +685,20 @@ def main():
         after=dict(type="list", elements="str"),
         match=dict(default="line", choices=["line", "none"]),
         running_config=dict(aliases=["config"]),
+        config_scope=dict(choices=["full", "section"], default="full"),
         intended_config=dict(),
+        config_cache=dict(type="bool", default=False),
+        config_cache_options=dict(type="dict", options=cache_spec, apply_defaults=True),
         defaults=dict(type="bool", default=False),
         backup=dict(type="bool", default=False),
         backup_options=dict(type="dict", options=backup_spec),
         save_when=dict(choices=["always", "never", "modified", "changed"], default="never"),
+        save_check=dict(choices=["full", "timestamp"], default="full"),
         diff_against=dict(choices=["startup", "intended", "running"]),
         diff_ignore_lines=dict(type="list", elements="str"),
         commit_timer=dict(type="int", default=0),
+        pipeline_size=dict(type="int", default=0),
+        commit_chunks=dict(type="dict", options=commit_chunks_spec),
     )
 
     mutually_exclusive = [("lines", "src")]
@@ -326,40 +715,51 @@ def main():
         supports_check_mode=True,
     )
 
+    if module.params["commit_chunks"] and module.params["commit_timer"]:
+        module.fail_json(msg="commit_chunks can not be used together with commit_timer")
+
     warnings = list()
     result = dict(changed=False, warnings=warnings)
     diff_ignore_lines = module.params["diff_ignore_lines"]
     config = None
     contents = None
     flags = get_defaults_flag(module) if module.params["defaults"] else []
-    connection = get_connection(module)
 
     if module.params["backup"] or (module._diff and module.params["diff_against"] == "running"):
         contents = get_config(module, flags=flags)
-        config = NetworkConfig(contents=contents)
+        config = SirConfig(contents)
         if module.params["backup"]:
-            result["__backup__"] = contents
-            if module.params["backup_options"]:
-                if module.params["backup_options"]["append_eof"]:
+            backup = contents
+            backup_options = module.params["backup_options"]
+            if backup_options:
+                if backup_options["append_eof"]:
                     if not contents.endswith("\neof"):
-                        result["__backup__"] += "\neof"
+                        backup += "\neof"
+            if backup_options and backup_options["dedup"]:
+                store_backup(module, result, backup)
+            else:
+                result["__backup__"] = backup
 
     if any((module.params["src"], module.params["lines"])):
         match = module.params["match"]
         candidate = get_candidate_config(module)
-        running = get_running_config(module, contents, flags=flags)
-        try:
-            response = connection.get_diff(
-                candidate=candidate,
-                running=running,
-                diff_match=match,
-                diff_ignore_lines=diff_ignore_lines,
-            )
-        except ConnectionError as exc:
-            module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
-        config_diff = response["config_diff"]
-        if config_diff:
-            commands = config_diff.split("\n")
+        in_sync = get_in_sync_entry(module, candidate)
+        if in_sync:
+            cache, device, timestamp, key = in_sync
+        if in_sync and cache.get(device, key, timestamp) is not None:
+            # the same candidate matched the unchanged running-config before
+            commands = []
+        else:
+            sections = None
+            if module.params["config_scope"] == "section":
+                sections = get_candidate_sections(candidate)
+            running = get_running_config(module, contents, flags=flags, sections=sections)
+            # the diff is computed locally, the device is only contacted when
+            # running_config has to be retrieved or the commands are pushed
+            commands = config_diff(candidate, running, diff_match=match)
+            if in_sync and not commands:
+                set_cache_entry(module, cache, device, key, timestamp, True)
+        if commands:
             if module.params["before"]:
                 commands[:0] = module.params["before"]
             if module.params["after"]:
@@ -374,17 +774,31 @@ def main():
                     commit_timer = (
                         module.params["commit_timer"] if module.params["commit_timer"] > 0 else None
                     )
-                    load_config(module, commands, commit=True, commit_timer=commit_timer)
+                    pipeline_size = module.params["pipeline_size"] or None
+                    if module.params["commit_chunks"]:
+                        load_config_chunks(module, result, candidate, commands, pipeline_size)
+                    else:
+                        load_config(
+                            module,
+                            commands,
+                            commit=True,
+                            commit_timer=commit_timer,
+                            pipeline_size=pipeline_size,
+                        )
             result["changed"] = True
 
     running_config = module.params["running_config"]
     startup_config = None
     if module.params["save_when"] == "always":
         save_config(module, result)
+    elif module.params["save_when"] == "modified" and module.params["save_check"] == "timestamp":
+        configs = save_if_modified(module, result, diff_ignore_lines)
+        if configs:
+            running_config, startup_config = configs
     elif module.params["save_when"] == "modified":
         output = run_commands(module, ["show running-config", "show startup-config"])
-        running_config = NetworkConfig(indent=1, contents=output[0], ignore_lines=diff_ignore_lines)
-        startup_config = NetworkConfig(indent=1, contents=output[1], ignore_lines=diff_ignore_lines)
+        running_config = SirConfig(output[0], ignore_lines=diff_ignore_lines)
+        startup_config = SirConfig(output[1], ignore_lines=diff_ignore_lines)
         if running_config.sha1 != startup_config.sha1:
             save_config(module, result)
     elif module.params["save_when"] == "changed" and result["changed"]:
@@ -398,7 +812,7 @@ def main():
             contents = running_config
 
         # recreate the object in order to process diff_ignore_lines
-        running_config = NetworkConfig(indent=1, contents=contents, ignore_lines=diff_ignore_lines)
+        running_config = SirConfig(contents, ignore_lines=diff_ignore_lines)
 
         if module.params["diff_against"] == "running":
             if module.check_mode:
@@ -416,7 +830,7 @@ def main():
             contents = module.params["intended_config"]
 
         if contents is not None:
-            base_config = NetworkConfig(indent=1, contents=contents, ignore_lines=diff_ignore_lines)
+            base_config = SirConfig(contents, ignore_lines=diff_ignore_lines)
             if running_config.sha1 != base_config.sha1:
                 before, after = "", ""
                 if module.params["diff_against"] == "intended":
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_ether
+author: caribouHY (@caribouHY)
+short_description: Manage the ether ports of Si-R devices.
+description:
+  - Manages the C(ether) ports of Si-R devices declaratively.
+  - Only the C(ether) section of the running-config is read, and only the commands for the
+    attributes that differ from the wanted state are sent to the device.
+version_added: 1.3.0
+options:
+  config:
+    description:
+      - The list of ether port configurations.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - The port as written in the running-config, e.g. C(2 1) for C(ether 2 1).
+        type: str
+        required: true
+      description:
+        description:
+          - The description of the port.
+        type: str
+      enabled:
+        description:
+          - Whether the port is used, C(ether <port> use on|off).
+        type: bool
+      mode:
+        description:
+          - The speed and duplex of the port, e.g. C(auto) or C(100full).
+        type: str
+      mdi:
+        description:
+          - The MDI mode of the port, e.g. C(auto).
+        type: str
+      vlan_untag:
+        description:
+          - The VLAN ID of the untagged VLAN of the port.
+        type: int
+      vlan_tag:
+        description:
+          - The VLAN IDs of the tagged VLANs of the port, e.g. C(10,20).
+        type: str
+  running_config:
+    description:
+      - The running-config to parse with I(state=parsed), e.g. the output of
+        C(show running-config ether).
+    type: str
+  state:
+    description:
+      - The state the configuration should be left in.
+      - C(merged) sets the given attributes and leaves the others alone.
+      - C(replaced) makes the attributes of the given ports exactly the given ones.
+      - C(overridden) also deletes the attributes of the ports that are not given.
+      - C(deleted) deletes the attributes of the given ports, or of all ports if
+        none are given.
+      - C(gathered) returns the current configuration as structured data, C(rendered) returns
+        the commands for I(config) without connecting to the device and C(parsed) returns the
+        structured data of I(running_config).
+      - Lines of the C(ether) section that do not match an option are left alone.
+    type: str
+    choices:
+      - merged
+      - replaced
+      - overridden
+      - deleted
+      - gathered
+      - rendered
+      - parsed
+    default: merged
+"""
+
+EXAMPLES = r"""
+- name: Move port 2 1 to VLAN 3 and leave its other attributes alone
+  caribouhy.sir.sir_ether:
+    config:
+      - name: "2 1"
+        vlan_untag: 3
+    state: merged
+
+- name: Manage the ports 1 1 and 2 1 and delete the attributes of all other ports
+  caribouhy.sir.sir_ether:
+    config:
+      - name: "1 1"
+        vlan_untag: 1
+      - name: "2 1"
+        description: spare
+        enabled: false
+        vlan_untag: 2
+    state: overridden
+"""
+
+RETURN = """
+before:
+  description: The configuration prior to the module execution.
+  returned: when I(state) is C(merged), C(replaced), C(overridden) or C(deleted)
+  type: list
+  sample: [{"name": "2 1", "enabled": false, "vlan_untag": 2}]
+after:
+  description: The resulting configuration after the module execution.
+  returned: when changed
+  type: list
+  sample: [{"name": "2 1", "enabled": false, "vlan_untag": 3}]
+commands:
+  description: The set of commands pushed to the remote device.
+  returned: when I(state) is C(merged), C(replaced), C(overridden) or C(deleted)
+  type: list
+  sample: ["ether 2 1 vlan untag 3"]
+gathered:
+  description: The current configuration of the device.
+  returned: when I(state) is C(gathered)
+  type: list
+rendered:
+  description: The commands for the provided configuration.
+  returned: when I(state) is C(rendered)
+  type: list
+parsed:
+  description: The structured data of I(running_config).
+  returned: when I(state) is C(parsed)
+  type: list
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource import (
+    ETHER,
+    run_resource,
+)
+
+
+def main():
+    """main entry point for module execution"""
+    config_spec = dict(
+        name=dict(type="str", required=True),
+        description=dict(type="str"),
+        enabled=dict(type="bool"),
+        mode=dict(type="str"),
+        mdi=dict(type="str"),
+        vlan_untag=dict(type="int"),
+        vlan_tag=dict(type="str"),
+    )
+    argument_spec = dict(
+        config=dict(type="list", elements="dict", options=config_spec),
+        running_config=dict(type="str"),
+        state=dict(
+            default="merged",
+            choices=[
+                "merged",
+                "replaced",
+                "overridden",
+                "deleted",
+                "gathered",
+                "rendered",
+                "parsed",
+            ],
+        ),
+    )
+    required_if = [
+        ("state", "merged", ("config",)),
+        ("state", "replaced", ("config",)),
+        ("state", "overridden", ("config",)),
+        ("state", "rendered", ("config",)),
+        ("state", "parsed", ("running_config",)),
+    ]
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_if=required_if,
+        supports_check_mode=True,
+    )
+
+    result = run_resource(module, ETHER)
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
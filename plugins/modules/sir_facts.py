@@ -0,0 +1,288 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_facts
+author: caribouHY (@caribouHY)
+short_description: Collect facts from Si-R devices.
+description:
+  - Collects facts from Si-R devices and returns them as C(ansible_net_*) facts.
+  - Every subset only runs the commands it needs.  The C(default) subset reuses the device
+    information cached by the connection, so gathering only the default facts does not run
+    any command on a device once the connection has been opened.
+version_added: 1.3.0
+options:
+  gather_subset:
+    description:
+      - When supplied, this argument restricts the facts collected to a given subset.
+      - Possible values for this argument include C(all), C(default), C(hardware), C(config),
+        C(interfaces) and C(routing).
+      - Specify a list of values to include a larger subset, or prefix a value with C(!) to
+        exclude it, e.g. C(!routing) for all subsets but C(routing).
+      - The C(default) subset is always collected.
+    default:
+      - default
+    type: list
+    elements: str
+"""
+
+EXAMPLES = r"""
+- name: Collect the default facts
+  caribouhy.sir.sir_facts:
+
+- name: Collect the hardware and interface facts
+  caribouhy.sir.sir_facts:
+    gather_subset:
+      - hardware
+      - interfaces
+
+- name: Collect all facts but the running-config and the routing table
+  caribouhy.sir.sir_facts:
+    gather_subset:
+      - all
+      - "!config"
+      - "!routing"
+"""
+
+RETURN = """
+ansible_net_gather_subset:
+  description: The list of fact subsets collected from the device.
+  returned: always
+  type: list
+ansible_net_system:
+  description: The network OS of the device.
+  returned: always
+  type: str
+  sample: sir
+ansible_net_api:
+  description: The name of the transport.
+  returned: always
+  type: str
+  sample: cliconf
+ansible_net_python_version:
+  description: The Python version of the Ansible controller.
+  returned: always
+  type: str
+ansible_net_hostname:
+  description: The configured hostname of the device.
+  returned: always
+  type: str
+ansible_net_model:
+  description: The model name of the device.
+  returned: always
+  type: str
+  sample: Si-R G120
+ansible_net_version:
+  description: The firmware version of the device.
+  returned: always
+  type: str
+  sample: "20.54"
+ansible_net_serialnum:
+  description: The serial number of the device.
+  returned: when hardware is configured
+  type: str
+ansible_net_image:
+  description: The running firmware of the device.
+  returned: when hardware is configured
+  type: str
+  sample: firmware2
+ansible_net_firmware:
+  description: The firmware versions of the device.
+  returned: when hardware is configured
+  type: dict
+ansible_net_rom_version:
+  description: The ROM version of the device.
+  returned: when hardware is configured
+  type: str
+ansible_net_memtotal_mb:
+  description: The total memory of the device in MB.
+  returned: when hardware is configured
+  type: int
+ansible_net_startup_time:
+  description: The time the device was started.
+  returned: when hardware is configured
+  type: str
+ansible_net_config:
+  description: The running-config of the device.
+  returned: when config is configured
+  type: str
+ansible_net_interfaces:
+  description: The status, MTU and addresses of every interface.
+  returned: when interfaces is configured
+  type: dict
+ansible_net_all_ipv4_addresses:
+  description: All IPv4 addresses configured on the device.
+  returned: when interfaces is configured
+  type: list
+ansible_net_all_ipv6_addresses:
+  description: All IPv6 addresses configured on the device.
+  returned: when interfaces is configured
+  type: list
+ansible_net_routes:
+  description: The IPv4 routing table of the device.
+  returned: when routing is configured
+  type: list
+"""
+
+import platform
+import re
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import (
+    get_capabilities,
+    get_config,
+    get_system_information,
+    run_commands,
+)
+
+
+class FactsBase(object):
+    COMMANDS = []
+
+    def __init__(self, module):
+        self.module = module
+        self.facts = dict()
+
+    def populate(self, responses):
+        pass
+
+
+class Default(FactsBase):
+    def populate(self, responses):
+        capabilities = get_capabilities(self.module)
+        device_info = capabilities.get("device_info", {})
+        self.facts["system"] = device_info.get("network_os")
+        self.facts["api"] = capabilities.get("network_api")
+        self.facts["python_version"] = platform.python_version()
+        self.facts["hostname"] = device_info.get("network_os_hostname")
+        self.facts["model"] = device_info.get("network_os_model")
+        self.facts["version"] = device_info.get("network_os_version")
+
+
+class Hardware(FactsBase):
+    def populate(self, responses):
+        info = get_system_information(self.module)
+        self.facts["serialnum"] = info.get("Serial No.")
+        self.facts["image"] = info.get("Running-firmware")
+        self.facts["rom_version"] = info.get("ROM Ver.")
+        self.facts["startup_time"] = info.get("Startup-time")
+        self.facts["firmware"] = dict(
+            (key[: -len(" Ver.")].lower(), value)
+            for key, value in info.items()
+            if re.match(r"Firmware\d+ Ver\.$", key)
+        )
+        match = re.match(r"(\d+)\s*MB", info.get("Memory", ""))
+        if match:
+            self.facts["memtotal_mb"] = int(match.group(1))
+
+
+class Config(FactsBase):
+    def populate(self, responses):
+        self.facts["config"] = get_config(self.module)
+
+
+class Interfaces(FactsBase):
+    COMMANDS = [{"command": "show interface", "output": "json"}]
+
+    def populate(self, responses):
+        interfaces = responses[0] or {}
+        self.facts["interfaces"] = interfaces
+        self.facts["all_ipv4_addresses"] = []
+        self.facts["all_ipv6_addresses"] = []
+        for interface in interfaces.values():
+            for address in interface.get("addresses", []):
+                if ":" in address:
+                    self.facts["all_ipv6_addresses"].append(address)
+                else:
+                    self.facts["all_ipv4_addresses"].append(address)
+
+
+class Routing(FactsBase):
+    COMMANDS = [{"command": "show ip route", "output": "json"}]
+
+    def populate(self, responses):
+        self.facts["routes"] = responses[0] or []
+
+
+FACT_SUBSETS = dict(
+    default=Default,
+    hardware=Hardware,
+    config=Config,
+    interfaces=Interfaces,
+    routing=Routing,
+)
+
+VALID_SUBSETS = frozenset(FACT_SUBSETS.keys())
+
+
+def gather_subsets(module):
+    """Return the subsets selected by gather_subset, always with default"""
+    runable_subsets = set()
+    exclude_subsets = set()
+
+    for subset in module.params["gather_subset"]:
+        if subset == "all":
+            runable_subsets.update(VALID_SUBSETS)
+            continue
+
+        if subset.startswith("!"):
+            subset = subset[1:]
+            if subset == "all":
+                exclude_subsets.update(VALID_SUBSETS)
+                continue
+            exclude = True
+        else:
+            exclude = False
+
+        if subset not in VALID_SUBSETS:
+            module.fail_json(
+                msg="Subset must be one of [%s], got %s"
+                % (", ".join(sorted(VALID_SUBSETS)), subset)
+            )
+
+        if exclude:
+            exclude_subsets.add(subset)
+        else:
+            runable_subsets.add(subset)
+
+    if not runable_subsets:
+        runable_subsets.update(VALID_SUBSETS)
+
+    runable_subsets.difference_update(exclude_subsets)
+    runable_subsets.add("default")
+    return runable_subsets
+
+
+def main():
+    """main entry point for module execution"""
+    argument_spec = dict(gather_subset=dict(default=["default"], type="list", elements="str"))
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    runable_subsets = gather_subsets(module)
+    instances = [FACT_SUBSETS[key](module) for key in sorted(runable_subsets)]
+
+    # the commands of all subsets are sent in a single batch
+    commands = [cmd for inst in instances for cmd in inst.COMMANDS]
+    responses = run_commands(module, commands, batch=True) if commands else []
+
+    facts = dict(gather_subset=sorted(runable_subsets))
+    for inst in instances:
+        count = len(inst.COMMANDS)
+        inst.populate(responses[:count])
+        responses = responses[count:]
+        facts.update(inst.facts)
+
+    ansible_facts = dict(("ansible_net_%s" % key, value) for key, value in facts.items())
+    module.exit_json(ansible_facts=ansible_facts, warnings=[])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_fanout
+author: caribouHY (@caribouHY)
+short_description: Run commands on many Si-R devices in parallel from the controller.
+description:
+  - Opens the persistent C(network_cli) connections of a list of Si-R devices from the Ansible
+    control host and runs the same list of commands on every device through a bounded pool
+    of threads.
+  - The output of every device is returned in a single result, which avoids starting a module
+    process for every device when collecting C(show) output across a large fleet.
+  - This module is executed entirely on the control host, it is usually run with C(run_once).
+version_added: 1.3.0
+options:
+  commands:
+    description:
+      - List of commands to send to every device.
+    required: true
+    type: list
+    elements: str
+  hosts:
+    description:
+      - List of inventory hostnames to run the commands on.  The connection variables of every
+        host are taken from its inventory variables.
+      - Defaults to all hosts of the current play batch.
+    type: list
+    elements: str
+  max_workers:
+    description:
+      - The maximum number of devices the commands are run on at the same time.
+    default: 20
+    type: int
+  timeout:
+    description:
+      - The command timeout in seconds for every device.  Defaults to the
+        C(persistent_command_timeout) of the connection.
+    type: int
+  batch:
+    description:
+      - Send all commands to every device in a single write, see the I(batch) option of
+        M(caribouhy.sir.sir_command).
+    default: false
+    type: bool
+  fail_on_host_error:
+    description:
+      - Fail the task if the commands fail on any device.  By default the task only fails
+        if the commands fail on every device, and the errors are returned in I(failed_hosts).
+    default: false
+    type: bool
+notes:
+  - Only the C(network_cli) connection is supported.
+"""
+
+EXAMPLES = """
+- name: Collect system information from all Si-R devices
+  caribouhy.sir.sir_fanout:
+    commands:
+      - show system information
+      - show ip route
+    hosts: "{{ groups['sir'] }}"
+    max_workers: 50
+    timeout: 60
+  run_once: true
+  register: sweep
+"""
+
+RETURN = """
+results:
+  description: The output of the commands for every device that succeeded.
+  returned: always
+  type: dict
+  sample: {"router1": {"stdout": ["..."], "stdout_lines": [["..."]], "elapsed": 1.2}}
+failed_hosts:
+  description: The error message for every device the commands failed on.
+  returned: always
+  type: dict
+  sample: {"router2": "timeout value 30 seconds reached while trying to send command: show ip route"}
+elapsed:
+  description: The total time in seconds taken to run the commands on all devices.
+  returned: always
+  type: float
+  sample: 12.5
+"""
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_lan
+author: caribouHY (@caribouHY)
+short_description: Manage the lan interfaces of Si-R devices.
+description:
+  - Manages the C(lan) interfaces of Si-R devices declaratively.
+  - Only the C(lan) section of the running-config is read, and only the commands for the
+    attributes that differ from the wanted state are sent to the device.
+version_added: 1.3.0
+options:
+  config:
+    description:
+      - The list of lan interface configurations.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - The number of the lan interface, e.g. C(0) for C(lan 0).
+        type: str
+        required: true
+      description:
+        description:
+          - The description of the interface.
+        type: str
+      ip_address:
+        description:
+          - The IPv4 address and prefix length of the interface, e.g. C(192.168.1.1/24).
+        type: str
+      ip_broadcast:
+        description:
+          - The broadcast address type of I(ip_address).
+          - If it is not given, the broadcast address type of the current address is kept.
+        type: int
+      vlan:
+        description:
+          - The VLAN ID of the interface.
+        type: int
+      mtu:
+        description:
+          - The MTU of the interface.
+        type: int
+  running_config:
+    description:
+      - The running-config to parse with I(state=parsed), e.g. the output of
+        C(show running-config lan).
+    type: str
+  state:
+    description:
+      - The state the configuration should be left in.
+      - C(merged) sets the given attributes and leaves the others alone.
+      - C(replaced) makes the attributes of the given interfaces exactly the given ones.
+      - C(overridden) also deletes the attributes of the interfaces that are not given.
+      - C(deleted) deletes the attributes of the given interfaces, or of all interfaces if
+        none are given.
+      - C(gathered) returns the current configuration as structured data, C(rendered) returns
+        the commands for I(config) without connecting to the device and C(parsed) returns the
+        structured data of I(running_config).
+      - Lines of the C(lan) section that do not match an option are left alone.
+    type: str
+    choices:
+      - merged
+      - replaced
+      - overridden
+      - deleted
+      - gathered
+      - rendered
+      - parsed
+    default: merged
+"""
+
+EXAMPLES = r"""
+- name: Set the address of lan 1 and leave its other attributes alone
+  caribouhy.sir.sir_lan:
+    config:
+      - name: "1"
+        ip_address: 192.168.2.1/24
+        ip_broadcast: 3
+    state: merged
+
+- name: Make vlan and description the only managed attributes of lan 0
+  caribouhy.sir.sir_lan:
+    config:
+      - name: "0"
+        description: uplink
+        vlan: 10
+    state: replaced
+
+- name: Delete the configuration of lan 2
+  caribouhy.sir.sir_lan:
+    config:
+      - name: "2"
+    state: deleted
+"""
+
+RETURN = """
+before:
+  description: The configuration prior to the module execution.
+  returned: when I(state) is C(merged), C(replaced), C(overridden) or C(deleted)
+  type: list
+  sample: [{"name": "0", "ip_address": "192.168.1.1/24", "ip_broadcast": 3, "vlan": 1}]
+after:
+  description: The resulting configuration after the module execution.
+  returned: when changed
+  type: list
+  sample: [{"name": "0", "ip_address": "192.168.2.1/24", "ip_broadcast": 3, "vlan": 1}]
+commands:
+  description: The set of commands pushed to the remote device.
+  returned: when I(state) is C(merged), C(replaced), C(overridden) or C(deleted)
+  type: list
+  sample: ["lan 0 ip address 192.168.2.1/24 3"]
+gathered:
+  description: The current configuration of the device.
+  returned: when I(state) is C(gathered)
+  type: list
+rendered:
+  description: The commands for the provided configuration.
+  returned: when I(state) is C(rendered)
+  type: list
+parsed:
+  description: The structured data of I(running_config).
+  returned: when I(state) is C(parsed)
+  type: list
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource import (
+    LAN,
+    run_resource,
+)
+
+
+def main():
+    """main entry point for module execution"""
+    config_spec = dict(
+        name=dict(type="str", required=True),
+        description=dict(type="str"),
+        ip_address=dict(type="str"),
+        ip_broadcast=dict(type="int"),
+        vlan=dict(type="int"),
+        mtu=dict(type="int"),
+    )
+    argument_spec = dict(
+        config=dict(type="list", elements="dict", options=config_spec),
+        running_config=dict(type="str"),
+        state=dict(
+            default="merged",
+            choices=[
+                "merged",
+                "replaced",
+                "overridden",
+                "deleted",
+                "gathered",
+                "rendered",
+                "parsed",
+            ],
+        ),
+    )
+    required_if = [
+        ("state", "merged", ("config",)),
+        ("state", "replaced", ("config",)),
+        ("state", "overridden", ("config",)),
+        ("state", "rendered", ("config",)),
+        ("state", "parsed", ("running_config",)),
+    ]
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_if=required_if,
+        supports_check_mode=True,
+    )
+
+    result = run_resource(module, LAN)
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,8 +31,20 @@ options:
   dest:
     description:
       - The IP Address or hostname (resolvable by router) of the remote node.
-    required: true
+      - Either I(dest) or I(dests) is required.
     type: str
+  dests:
+    description:
+      - A list of IP Addresses or hostnames of remote nodes to test in a single task.
+      - The destinations are pinged back to back with the same options in one module run, and
+        the result of every destination is returned in I(results) together with aggregate
+        statistics in I(summary).
+      - With I(state=present) the task fails if any destination is unreachable, with
+        I(state=absent) if any destination is reachable.
+      - Mutually exclusive with I(dest).
+    type: list
+    elements: str
+    version_added: 1.3.0
   df_bit:
     description:
       - Set the DF bit.
@@ -53,6 +65,8 @@ options:
   state:
     description:
       - Determines if the expected result is success or fail.
+      - A ping that could not be run, e.g. to a hostname the router can not resolve, fails
+        with either state.
     choices:
       - absent
       - present
@@ -85,6 +99,14 @@ EXAMPLES = """
 - name: Test reachability to ipv6 address
   caribouhy.sir.sir_ping:
     dest: 2001:db8:ffff:ffff:ffff:ffff:ffff:ffff
+
+- name: Test reachability to all tunnel peers in one task
+  caribouhy.sir.sir_ping:
+    dests:
+      - 198.51.100.1
+      - 198.51.100.2
+      - 198.51.100.3
+    count: 3
 """
 
 RETURN = """
@@ -95,30 +117,49 @@ commands:
   sample: ["ping 198.51.100.251 source 192.168.10.1 repeat 20"]
 packet_loss:
   description: Percentage of packets lost.
-  returned: always
+  returned: when dest is set
   type: str
   sample: "0%"
 packets_rx:
   description: Packets successfully received.
-  returned: always
+  returned: when dest is set
   type: int
   sample: 20
 packets_tx:
   description: Packets successfully transmitted.
-  returned: always
+  returned: when dest is set
   type: int
   sample: 20
 rtt:
   description: Show RTT stats.
-  returned: always
+  returned: when dest is set
   type: dict
   sample: {"avg": 2, "max": 8, "min": 1}
+results:
+  description:
+    - The result of every destination of I(dests), with the same keys as the result of a
+      single I(dest), plus C(dest) and C(command).
+    - C(msg) holds the output of the device if the ping could not be run.
+  returned: when dests is set
+  type: list
+  elements: dict
+  sample: [{"dest": "198.51.100.1", "command": "ping 198.51.100.1 repeat 5",
+            "packet_loss": "0%", "packets_rx": 5, "packets_tx": 5,
+            "rtt": {"avg": 2, "max": 8, "min": 1}}]
+summary:
+  description:
+    - Aggregate statistics of all destinations of I(dests).  The packet loss is computed over
+      all packets, the average RTT is weighted by the received packets.
+  returned: when dests is set
+  type: dict
+  sample: {"destinations": 3, "reachable": 2, "unreachable": ["198.51.100.3"],
+           "packets_tx": 15, "packets_rx": 10, "packet_loss": "33%",
+           "rtt": {"avg": 2, "max": 8, "min": 1}}
 """
 
-import re
-
 from ansible.module_utils.basic import AnsibleModule
 
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.parsers import parse_ping
 from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.sir import run_commands
 from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.ulits.utils import (
     is_valid_ip,
@@ -159,22 +200,45 @@ def generate_command(
     return cmd
 
 
-def parse_rate(rate_info):
-    rate_re = re.compile(
-        r"(?P<tx>\d+) packets transmitted, (?P<rx>\d+) packets received, (?P<pkt_loss>\d+)% packet loss",
-    )
-
-    rate = rate_re.match(rate_info)
-    return rate.group("pkt_loss"), rate.group("rx"), rate.group("tx")
-
-
-def parse_rtt(rtt_info):
-    rtt_re = re.compile(
-        r"round-trip \(ms\)  min/ave/max = (?P<min>\d*).(?:\d*)/(?P<avg>\d*).(?:\d*)/(?P<max>\d+).(?:\d*)",
-    )
-    rtt = rtt_re.match(rtt_info)
-
-    return rtt.groupdict()
+def summarize(results):
+    """Aggregate loss and RTT statistics of the results of many destinations"""
+    tx = sum(item.get("packets_tx", 0) for item in results)
+    rx = sum(item.get("packets_rx", 0) for item in results)
+    summary = {
+        "destinations": len(results),
+        "reachable": len([item for item in results if item.get("packets_rx")]),
+        "unreachable": [item["dest"] for item in results if not item.get("packets_rx")],
+        "packets_tx": tx,
+        "packets_rx": rx,
+        "packet_loss": "%d%%" % (100 - rx * 100 // tx if tx else 100),
+    }
+
+    rtts = [(item["rtt"], item["packets_rx"]) for item in results if item.get("rtt")]
+    if rtts:
+        received = sum(count for rtt, count in rtts)
+        summary["rtt"] = {
+            "min": min(rtt["min"] for rtt, count in rtts),
+            "avg": sum(rtt["avg"] * count for rtt, count in rtts) // received,
+            "max": max(rtt["max"] for rtt, count in rtts),
+        }
+    return summary
+
+
+def ping_dests(module, dests, **kwargs):
+    """Ping every destination back to back in one run_commands call"""
+    commands = [generate_command(dest=dest, **kwargs) for dest in dests]
+    outputs = run_commands(module, commands=commands, check_rc=False)
+
+    results = []
+    for dest, command, output in zip(dests, commands, outputs):
+        item = {"dest": dest, "command": command}
+        try:
+            item.update(parse_ping(output, kwargs["count"]))
+        except ValueError:
+            # no statistics, e.g. the destination could not be resolved
+            item["msg"] = output
+        results.append(item)
+    return commands, results
 
 
 def validate_results(module, loss, results):
@@ -188,6 +252,22 @@ def validate_results(module, loss, results):
         module.fail_json(msg="Ping succeeded unexpectedly", **results)
 
 
+def validate_dests(module, results):
+    """validate_results for every destination of dests"""
+    state = module.params["state"]
+    summary = results["summary"]
+    not_run = [item["dest"] for item in results["results"] if "msg" in item]
+    if state == "absent" and not_run:
+        module.fail_json(msg="Ping could not be run to %s" % ", ".join(not_run), **results)
+    if state == "present" and summary["unreachable"]:
+        module.fail_json(
+            msg="Ping failed unexpectedly to %s" % ", ".join(summary["unreachable"]), **results
+        )
+    elif state == "absent" and summary["reachable"]:
+        reachable = [item["dest"] for item in results["results"] if item.get("packets_rx")]
+        module.fail_json(msg="Ping succeeded unexpectedly to %s" % ", ".join(reachable), **results)
+
+
 def main():
     """
     Main entry point for module execution
@@ -197,7 +277,8 @@ def main():
     argument_spec = dict(
         count=dict(type="int", default=5),
         afi=dict(type="str", choices=["ip", "ipv6"]),
-        dest=dict(type="str", required=True),
+        dest=dict(type="str"),
+        dests=dict(type="list", elements="str"),
         df_bit=dict(type="bool", default=False),
         source=dict(type="str"),
         size=dict(type="int"),
@@ -205,7 +286,11 @@ def main():
         state=dict(type="str", choices=["absent", "present"], default="present"),
         ttl=dict(type="int"),
     )
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[("dest", "dests")],
+        required_one_of=[("dest", "dests")],
+    )
 
     count = module.params["count"]
     afi = module.params["afi"]
@@ -222,6 +307,22 @@ def main():
     if warnings:
         results["warnings"] = warnings
 
+    if module.params["dests"]:
+        results["commands"], results["results"] = ping_dests(
+            module,
+            module.params["dests"],
+            count=count,
+            afi=afi,
+            df_bit=df_bit,
+            source=source,
+            size=size,
+            timeout=timeout,
+            ttl=ttl,
+        )
+        results["summary"] = summarize(results["results"])
+        validate_dests(module, results)
+        module.exit_json(**results)
+
     results["commands"] = generate_command(
         dest=dest,
         count=count,
@@ -237,26 +338,12 @@ def main():
     if isinstance(ping_results, list):
         ping_results = ping_results[0]
 
-    ping_results_list = ping_results.splitlines()
-    rtt_info, rate_info = None, None
-    for line in ping_results_list:
-        if line.startswith("round-trip"):
-            rtt_info = line
-        if line.startswith(f"{count} packets transmitted"):
-            rate_info = line
-
-    if rtt_info:
-        rtt = parse_rtt(rtt_info)
-        for k, v in rtt.items():
-            if rtt[k] is not None:
-                rtt[k] = int(v)
-        results["rtt"] = rtt
-
-    pkt_loss, rx, tx = parse_rate(rate_info)
-    results["packet_loss"] = str(pkt_loss) + "%"
-    results["packets_rx"] = int(rx)
-    results["packets_tx"] = int(tx)
-    validate_results(module, int(pkt_loss), results)
+    try:
+        results.update(parse_ping(ping_results, count))
+    except ValueError:
+        # no statistics, e.g. the destination could not be resolved
+        module.fail_json(msg=ping_results, **results)
+    validate_results(module, int(results["packet_loss"].rstrip("%")), results)
 
     module.exit_json(**results)
 
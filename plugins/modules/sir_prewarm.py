@@ -0,0 +1,124 @@
+#!/usr/bin/python
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: sir_prewarm
+author: caribouHY (@caribouHY)
+short_description: Open the persistent connections of many Si-R devices in parallel.
+description:
+  - Opens the persistent C(network_cli) connections of a list of Si-R devices from the Ansible
+    control host through a bounded pool of threads, and readies every session so that the
+    tasks that follow find the SSH session open, the terminal set up and the device info
+    cached.
+  - Sessions that are already open are reused as they are, the terminal setup commands are
+    only sent when a session is opened.
+  - The time taken for every device is returned, which also makes the module a health check
+    of the connections before the first task of a play.
+  - This module is executed entirely on the control host, it is usually run with C(run_once)
+    before plays that use C(serial), so that the devices of later batches do not pay the
+    connection setup in turn.
+version_added: 1.3.0
+options:
+  hosts:
+    description:
+      - List of inventory hostnames to open the connections of.  The connection variables of
+        every host are taken from its inventory variables.
+      - Defaults to all hosts of the current play batch.
+    type: list
+    elements: str
+  max_workers:
+    description:
+      - The maximum number of connections opened at the same time.
+    default: 20
+    type: int
+  timeout:
+    description:
+      - The time in seconds the persistent connections stay open while idle.  Defaults to the
+        C(persistent_connect_timeout) of the connection.  Set it so that the connections are
+        still open when the tasks that use them run.
+    type: int
+  device_info:
+    description:
+      - Gather the device info of every device, so the first task that needs it finds it
+        cached by the connection.
+      - The device info needs the admin class, it is only gathered when the task is run with
+        C(become) like the tasks that use the connections.
+    default: true
+    type: bool
+  fail_on_host_error:
+    description:
+      - Fail the task if the connection of any device can not be opened.  By default the task
+        only fails if no connection can be opened, and the errors are returned in
+        I(failed_hosts).
+    default: false
+    type: bool
+notes:
+  - Only the C(network_cli) connection is supported.
+  - A connection is only reused by later tasks when it is opened with the same connection
+    variables as the tasks, including C(ansible_connection).
+"""
+
+EXAMPLES = """
+- name: Open the connections of all Si-R devices
+  hosts: sir
+  gather_facts: false
+  tasks:
+    - name: Prewarm the connections
+      caribouhy.sir.sir_prewarm:
+        max_workers: 50
+        timeout: 600
+      run_once: true
+      become: true
+      register: prewarm
+
+- name: Roll out the configuration in batches
+  hosts: sir
+  gather_facts: false
+  serial: 10
+  tasks:
+    - name: Push the configuration
+      caribouhy.sir.sir_config:
+        src: sir.cfg
+"""
+
+RETURN = """
+results:
+  description: The connection times for every device that succeeded.
+  returned: always
+  type: dict
+  contains:
+    reused:
+      description: Whether the SSH session of the device was already open.
+      type: bool
+    socket:
+      description: The seconds taken to start or find the persistent connection.
+      type: float
+    handshake:
+      description: The seconds taken to open the SSH session and set up the terminal.
+      type: float
+    device_info:
+      description: The seconds taken to gather the device info.
+      returned: when I(device_info) is set and the session is in the admin class
+      type: float
+    elapsed:
+      description: The total seconds taken for the device.
+      type: float
+  sample: {"router1": {"reused": false, "socket": 0.2, "handshake": 1.4, "device_info": 0.3, "elapsed": 1.9}}
+failed_hosts:
+  description: The error message for every device the connection could not be opened to.
+  returned: always
+  type: dict
+  sample: {"router2": "ssh connect failed: timed out"}
+elapsed:
+  description: The total time in seconds taken to open the connections of all devices.
+  returned: always
+  type: float
+  sample: 12.5
+"""
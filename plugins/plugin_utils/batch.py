@@ -0,0 +1,131 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import re
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_bytes, to_text
+
+
+PROMPT_RE = re.compile(r"^[\w\+\-\.:\/\[\]]+(?:\(config\))?[>#](?:\s|$)")
+ERROR_RE = re.compile(r"<ERROR> ")
+
+
+def _prompt_text(line, prompt):
+    """
+    Return the text following the prompt on line, or None if line does not
+    start with a prompt.
+    """
+    if prompt:
+        if line == prompt or line.startswith(prompt + " "):
+            return line[len(prompt) :].strip()
+        return None
+    match = PROMPT_RE.match(line)
+    if match:
+        return line[match.end() :].strip()
+    return None
+
+
+def count_prompts(output, prompt=None):
+    count = 0
+    for line in output.splitlines():
+        if _prompt_text(line.strip(), prompt) is not None:
+            count += 1
+    return count
+
+
+def split_output(output, commands, prompt=None):
+    """
+    Split the output of a batch of commands into the response of every command
+    using the command echo and the prompt as boundaries.
+    """
+    responses = [[] for cmd in commands]
+    index = -1
+    after_prompt = True
+
+    for line in output.splitlines():
+        stripped = line.strip()
+        text = _prompt_text(stripped, prompt)
+        is_prompt = text is not None
+        if not is_prompt:
+            text = stripped
+
+        if is_prompt or after_prompt:
+            # the echo of a command may be lost with the output of an error,
+            # so look for the echo of any of the following commands
+            following = [cmd.strip() for cmd in commands[index + 1 :]]
+            if text and text in following:
+                index += following.index(text) + 1
+                after_prompt = False
+                continue
+
+        after_prompt = is_prompt and not text
+        if is_prompt:
+            continue
+        if index >= 0:
+            responses[index].append(line.rstrip())
+
+    return ["\n".join(lines).strip() for lines in responses]
+
+
+def _synced(response, prompt=None):
+    """
+    Return True if response ends with the prompt of the empty line written to
+    resynchronise the session.  Every other response starts with the echo of
+    a command, so it is either the prompt alone or two prompts without a
+    command.
+    """
+    lines = [line.strip() for line in response.splitlines() if line.strip()]
+    return bool(lines) and all(_prompt_text(line, prompt) == "" for line in lines[-2:])
+
+
+def send_batch(connection, commands):
+    """
+    Write all commands to the device with a single send and collect the output
+    until the prompt of the last command is received.
+
+    If a command fails, the connection only reports the output read so far
+    with libssh and the last window of it with paramiko, so the prompts of the
+    remaining commands can not be counted anymore.  An empty line is written
+    instead and the output is read until its prompt is received.
+
+    :param connection: The network_cli connection of the device
+    :param commands: The list of command strings to send
+    :returns: A list with the response of every command
+    """
+    prompt = connection.get_prompt()
+    if prompt:
+        prompt = to_text(prompt, errors="surrogate_then_replace").strip()
+
+    connection.send(command=to_bytes("\r".join(commands)), sendonly=True)
+
+    output = []
+    errors = []
+    seen = 0
+    while seen < len(commands) or errors:
+        try:
+            resp = connection.receive(strip_prompt=False)
+        except AnsibleConnectionFailure as exc:
+            if not ERROR_RE.search(exc.message):
+                raise
+            if not errors:
+                connection.send(command=b"", sendonly=True)
+            errors.append(exc.message)
+            resp = exc.message
+        resp = to_text(resp, errors="surrogate_then_replace")
+        seen += count_prompts(resp, prompt)
+        output.append(resp)
+        if errors and _synced(resp, prompt):
+            break
+
+    responses = split_output("\n".join(output), commands, prompt)
+    if errors and not any(ERROR_RE.search(resp) for resp in responses):
+        # the echo of the failed command was lost, it can not be told which one failed
+        raise AnsibleConnectionFailure(errors[0])
+    return responses
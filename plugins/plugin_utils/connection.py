@@ -0,0 +1,147 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ansible.executor.task_executor import start_connection
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.plugins.loader import connection_loader
+from ansible.template import Templar
+from ansible.utils.display import Display
+
+
+display = Display()
+
+NETWORK_CLI = "ansible.netcommon.network_cli"
+
+# the arguments of the action plugins that run over the hosts with run_hosts
+HOSTS_ARGS = frozenset(("hosts", "max_workers", "timeout", "fail_on_host_error"))
+
+
+def is_network_cli(name):
+    return bool(name) and name.rsplit(".", 1)[-1] == "network_cli"
+
+
+def open_connection(action, host, host_vars, options=None):
+    """
+    Start the persistent network_cli connection of an inventory host from an
+    action plugin, or reuse it if it is already running.
+
+    :param action: The action plugin the connection is opened from
+    :param host: The inventory hostname
+    :param host_vars: The variables of the host
+    :param options: Connection options overriding the host variables
+    :returns: A tuple of the Connection object and its socket path
+    """
+    templar = Templar(loader=action._loader, variables=host_vars)
+    play_context = action._play_context.set_task_and_variable_override(
+        task=action._task, variables=host_vars, templar=templar
+    )
+    # the socket path of a persistent connection is derived from the
+    # connection name, so keep the name the tasks of the host use, e.g.
+    # `network_cli`, to share their connection instead of opening another
+    if not is_network_cli(play_context.connection):
+        play_context.connection = NETWORK_CLI
+    if not play_context.remote_addr:
+        play_context.remote_addr = host_vars.get("ansible_host", host)
+
+    connection = connection_loader.get(
+        play_context.connection,
+        play_context,
+        os.devnull,
+        task_uuid=action._task._uuid,
+        ansible_playbook_pid=os.getppid(),
+    )
+    play_context.set_attributes_from_plugin(connection)
+    connection.set_options(var_options=host_vars, direct=options)
+    play_context.timeout = connection.get_option("persistent_command_timeout")
+
+    socket_path = start_connection(play_context, connection.get_options(), action._task._uuid)
+    return Connection(socket_path), socket_path
+
+
+def run_parallel(hosts, func, max_workers, callback=None):
+    """
+    Run func(host) for every host in a bounded thread pool.
+
+    :returns: A tuple of dicts with the results and the errors of every host
+    """
+    results = {}
+    errors = {}
+    if not hosts:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = dict((executor.submit(func, host), host) for host in hosts)
+        for future in as_completed(futures):
+            host = futures[future]
+            try:
+                results[host] = future.result()
+            except Exception as exc:
+                errors[host] = exc
+            if callback:
+                callback(host, results.get(host), errors.get(host))
+
+    return results, errors
+
+
+def _error_msg(exc):
+    if isinstance(exc, ConnectionError):
+        return to_text(exc, errors="surrogate_then_replace")
+    return "%s: %s" % (type(exc).__name__, to_text(exc))
+
+
+def run_hosts(action, task_vars, func, fail_msg):
+    """
+    Run func(host, host_vars) in parallel for the hosts of the `hosts`
+    argument of an action plugin, or the hosts of the play batch, and build
+    the result of the action from the results of the hosts.
+
+    :param action: The action plugin
+    :param task_vars: The variables of the task
+    :param func: The function run for every host, returns the result of the
+        host with its `elapsed` time
+    :param fail_msg: The message of the failed task, formatted with the
+        number of failed hosts and of all hosts
+    :returns: A dict with the `results`, `failed_hosts` and `elapsed` of the
+        action, and `failed` and `msg` if it failed
+    """
+    args = action._task.args
+    name = action._task.action.rsplit(".", 1)[-1]
+    hosts = args.get("hosts") or task_vars.get("ansible_play_batch") or []
+    if not isinstance(hosts, list):
+        hosts = [hosts]
+    max_workers = int(args.get("max_workers", 20))
+    hostvars = task_vars["hostvars"]
+
+    def report(host, output, error):
+        if error:
+            display.vv("%s: %s failed: %s" % (name, host, to_text(error)))
+        else:
+            display.vv("%s: %s done in %ss" % (name, host, output["elapsed"]))
+
+    start = time.time()
+    results, errors = run_parallel(
+        hosts, lambda host: func(host, hostvars[host]), max_workers, callback=report
+    )
+
+    result = {
+        "changed": False,
+        "results": results,
+        "failed_hosts": dict((host, _error_msg(exc)) for host, exc in errors.items()),
+        "elapsed": round(time.time() - start, 3),
+    }
+    if errors and (args.get("fail_on_host_error") or not results):
+        result["failed"] = True
+        result["msg"] = fail_msg % (len(errors), len(hosts))
+    return result
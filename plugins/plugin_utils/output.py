@@ -0,0 +1,99 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import hashlib
+import os
+import re
+import tempfile
+
+from ansible.module_utils._text import to_bytes
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def output_filename(command, used=None):
+    """
+    Return the file name for the output of command, e.g.
+    `show_ip_route.txt`, numbered if it is already in used.
+    """
+    name = re.sub(r"[^\w.-]+", "_", command.strip()).strip("_") or "output"
+    filename = name + ".txt"
+    if used is not None:
+        count = 1
+        while filename in used:
+            count += 1
+            filename = "%s_%d.txt" % (name, count)
+        used.add(filename)
+    return filename
+
+
+def head_lines(data, count):
+    lines = []
+    start = 0
+    while len(lines) < count and start < len(data):
+        end = data.find("\n", start)
+        if end == -1:
+            end = len(data)
+        lines.append(data[start:end].rstrip("\r"))
+        start = end + 1
+    return lines
+
+
+def tail_lines(data, count):
+    lines = []
+    end = len(data)
+    while len(lines) < count and end > 0:
+        start = data.rfind("\n", 0, end) + 1
+        lines.insert(0, data[start:end].rstrip("\r"))
+        end = start - 1
+    return lines
+
+
+def write_output(path, data, lines=0):
+    """
+    Write the output of a command to path in chunks and return a summary of
+    it instead of the output itself.
+
+    :param path: The path of the file
+    :param data: The output of the command
+    :param lines: The number of lines of the start and the end of the output
+        to include in the summary
+    :returns: A dict with the path, size, sha256 and line count of the output
+    """
+    digest = hashlib.sha256()
+    size = 0
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=dirname or None, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for start in range(0, len(data), CHUNK_SIZE):
+                chunk = to_bytes(data[start : start + CHUNK_SIZE], errors="surrogate_then_replace")
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        os.rename(tmp_path, path)
+    except (IOError, OSError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    summary = {
+        "path": path,
+        "size": size,
+        "sha256": digest.hexdigest(),
+        "lines": data.count("\n") + 1 if data else 0,
+    }
+    if lines:
+        summary["head"] = head_lines(data, lines)
+        summary["tail"] = tail_lines(data, lines)
+    return summary
@@ -0,0 +1,106 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import re
+
+
+DEFAULT_THRESHOLD = 16384
+
+
+class IncrementalRegex(object):
+    """
+    Drop-in replacement for a compiled bytes regex in terminal_stdout_re and
+    terminal_stderr_re of a terminal plugin.
+
+    network_cli applies the terminal regexes to the whole response received
+    so far after every read, which is quadratic in the size of the output.
+    Up to `threshold` bytes the regex is searched as usual.  For larger
+    buffers an `anchored` regex, i.e. one that only matches at the end of
+    the buffer like the prompt, is only searched in the last `window` bytes,
+    and any other regex is only searched in the data appended since the last
+    search of the same growing buffer.
+
+    :param pattern: The bytes pattern of the regex
+    :param flags: The flags of the regex
+    :param anchored: True if the regex can only match at the end of the buffer
+    :param threshold: The buffer size in bytes above which the buffer is
+        scanned incrementally
+    :param window: The maximum length in bytes of a match of an anchored regex
+    :param overlap: The maximum length in bytes of a match of any other regex
+    """
+
+    def __init__(
+        self,
+        pattern,
+        flags=0,
+        anchored=False,
+        threshold=DEFAULT_THRESHOLD,
+        window=512,
+        overlap=256,
+    ):
+        self.regex = re.compile(pattern, flags)
+        self.anchored = anchored
+        self.threshold = threshold
+        self.window = window
+        self.overlap = overlap
+        self._reset()
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    @property
+    def flags(self):
+        return self.regex.flags
+
+    def __repr__(self):
+        return "IncrementalRegex(%r)" % self.regex.pattern
+
+    def _reset(self):
+        self._scanned = 0
+        self._match_start = None
+        self._head = b""
+        self._tail = b""
+
+    def _continues(self, data):
+        """Whether data is the buffer of the last search with more data appended"""
+        size = self._scanned
+        return (
+            0 < size < len(data)
+            and data[: len(self._head)] == self._head
+            and data[size - len(self._tail) : size] == self._tail
+        )
+
+    def search(self, data, pos=0, endpos=None):
+        if endpos is not None or pos or len(data) <= self.threshold:
+            self._reset()
+            return self.regex.search(data, pos, len(data) if endpos is None else endpos)
+
+        if self.anchored:
+            start = len(data) - self.window
+            match = self.regex.search(data, start)
+            if match and match.start() == start and data[start - 1 : start] not in (b"\r", b"\n"):
+                # the match may be the tail of a longer one
+                line = max(data.rfind(b"\n", 0, start), data.rfind(b"\r", 0, start))
+                match = self.regex.search(data, max(line, 0))
+            return match
+
+        if not self._continues(data):
+            start = 0
+        elif self._match_start is not None:
+            # keep returning the first match like a search of the whole buffer
+            start = self._match_start
+        else:
+            start = max(self._scanned - self.overlap, 0)
+        match = self.regex.search(data, start)
+        self._match_start = match.start() if match else None
+        self._scanned = len(data)
+        self._head = data[:64]
+        self._tail = data[-64:]
+        return match
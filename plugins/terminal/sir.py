@@ -28,29 +28,47 @@ from ansible.module_utils._text import to_bytes, to_text
 from ansible.plugins.terminal import TerminalBase
 from ansible.utils.display import Display
 
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.batch import send_batch
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.prompt import IncrementalRegex
+
 display = Display()
 
+TERMINAL_SETTINGS = (
+    "terminal timestamp disable",
+    "terminal pager disable",
+    "terminal window column 512",
+)
+
 
 class TerminalModule(TerminalBase):
+    # responses larger than this are scanned incrementally for the prompt and errors
+    terminal_incremental_threshold = 16384
+
     terminal_stdout_re = [
-        re.compile(rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\(config\))?(?:[>#]) $"),
+        IncrementalRegex(
+            rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\(config\))?(?:[>#]) $",
+            anchored=True,
+            threshold=terminal_incremental_threshold,
+        ),
     ]
 
     terminal_stderr_re = [
-        re.compile(rb"<ERROR> "),
+        IncrementalRegex(rb"<ERROR> ", threshold=terminal_incremental_threshold),
     ]
 
     terminal_config_prompt = re.compile(r"^.+\(config\)#$")
 
     def on_open_shell(self):
         try:
-            self._exec_cli_command(b"terminal timestamp disable")
-            self._exec_cli_command(b"terminal pager disable")
-            self._exec_cli_command(b"terminal window column 512")
+            # all settings are sent in a single write
+            responses = send_batch(self._connection, list(TERMINAL_SETTINGS))
         except AnsibleConnectionFailure:
             raise AnsibleConnectionFailure("unable to set terminal parameters")
+        if any("<ERROR>" in resp for resp in responses):
+            raise AnsibleConnectionFailure("unable to set terminal parameters")
 
     def on_become(self, passwd=None):
+        # the prompt is the one matched by the last response, no command is sent
         if self._get_prompt().strip().endswith(b"#"):
             return
 
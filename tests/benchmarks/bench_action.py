@@ -0,0 +1,120 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Cost of the action plugin of the Si-R modules.
+
+Measures the time to load the action plugin of every module of the collection
+through the action plugin loader of a fresh process, and the overhead the
+plugin adds to every task before it hands the task to the network action of
+ansible.netcommon.  Run from the root of the collections tree, e.g.:
+
+    python -m ansible_collections.caribouhy.sir.tests.benchmarks.bench_action
+"""
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from unittest.mock import MagicMock, patch
+
+
+ACTIONS = (
+    "command",
+    "config",
+    "facts",
+    "ping",
+    "sir_command",
+    "sir_commit_confirm",
+    "sir_config",
+    "sir_ether",
+    "sir_facts",
+    "sir_lan",
+    "sir_ping",
+)
+
+LOAD_SCRIPT = """
+import sys, time
+from ansible.plugins.loader import action_loader, init_plugin_loader
+init_plugin_loader([%r])
+names = sys.argv[1:]
+start = time.perf_counter()
+for name in names:
+    action_loader.get("caribouhy.sir." + name, MagicMock(), MagicMock(), MagicMock(), None, None, None)
+elapsed = time.perf_counter() - start
+modules = [m for m in sys.modules if m.startswith("ansible_collections.caribouhy.sir.plugins.action")]
+print("%%f %%d" %% (elapsed, len(modules)))
+"""
+
+
+def collections_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", ".."))
+
+
+def measure_load(names, rounds):
+    """Return the best time to load the action plugins of names, and the modules imported"""
+    script = "from unittest.mock import MagicMock\n" + LOAD_SCRIPT % collections_root()
+    best = None
+    for dummy in range(rounds):
+        output = subprocess.check_output([sys.executable, "-c", script] + list(names))
+        elapsed, modules = output.split()
+        best = min(best, float(elapsed)) if best is not None else float(elapsed)
+    return best, int(modules)
+
+
+def measure_dispatch(action, min_time):
+    """Return the tasks per second the action plugin dispatches for action"""
+    from ansible_collections.ansible.netcommon.plugins.action.network import (
+        ActionModule as ActionNetworkModule,
+    )
+    from ansible_collections.caribouhy.sir.plugins.action.sir import ActionModule
+
+    task = MagicMock()
+    task.action = "caribouhy.sir." + action
+    task.args = {}
+    play_context = MagicMock()
+    play_context.connection = "ansible.netcommon.network_cli"
+    plugin = ActionModule(task, MagicMock(), play_context, MagicMock(), None, None)
+    task_vars = {"inventory_hostname": "sir1"}
+
+    with patch.object(ActionNetworkModule, "run", return_value={}):
+        tasks = 0
+        start = time.perf_counter()
+        while True:
+            for dummy in range(1000):
+                plugin.run(task_vars=task_vars)
+            tasks += 1000
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                return tasks / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="processes per load measurement")
+    parser.add_argument("--min-time", type=float, default=2.0, help="minimum seconds per dispatch")
+    args = parser.parse_args(argv)
+
+    print("%-24s %10s  %8s" % ("load", "ms", "modules"))
+    for label, names in (("1 action", ACTIONS[:1]), ("%d actions" % len(ACTIONS), ACTIONS)):
+        elapsed, modules = measure_load(names, args.rounds)
+        print("%-24s %10.2f  %8d" % (label, elapsed * 1000, modules))
+        sys.stdout.flush()
+
+    print("%-24s %10s" % ("dispatch", "tasks/sec"))
+    for action in ("sir_command", "sir_config"):
+        print("%-24s %10.0f" % (action, measure_dispatch(action, args.min_time)))
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Throughput and latency of the cliconf plugin against a simulated Si-R CLI.
+
+Run from the root of the collections tree, e.g.:
+
+    python -m ansible_collections.caribouhy.sir.tests.benchmarks.bench_cliconf \\
+        --sizes 1000,10000,100000 --json result.json
+
+and compare a later run against a saved result with --baseline result.json,
+which exits with a non zero status when an operation got slower than the
+tolerance.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import argparse
+import json
+import math
+import sys
+import time
+
+from ansible_collections.caribouhy.sir.plugins.cliconf.sir import Cliconf
+from ansible_collections.caribouhy.sir.tests.benchmarks.fake_sir import (
+    FakeConnection,
+    FakeSirShell,
+    generate_config,
+)
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[max(int(math.ceil(p * len(ordered))) - 1, 0)]
+
+
+def measure(func, iterations, min_time, max_time):
+    samples = []
+    start = time.time()
+    while len(samples) < iterations or time.time() - start < min_time:
+        begin = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - begin)
+        if len(samples) >= iterations * 100 or time.time() - start > max_time:
+            break
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total if total else float("inf"),
+        "p50_ms": percentile(samples, 0.5) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+
+
+def modified_config(config, ratio=0.01):
+    """Return config with about ratio of its lines changed"""
+    lines = config.splitlines()
+    step = max(int(1 / ratio), 1)
+    for index in range(0, len(lines), step):
+        if lines[index].endswith("use off"):
+            lines[index] = lines[index][: -len("off")] + "on"
+        else:
+            lines[index] += "0"
+    return "\n".join(lines)
+
+
+def operations(cliconf, config, pipeline_size):
+    candidate = modified_config(config)
+    changes = cliconf.get_diff(candidate=candidate, running=config)["config_diff"].splitlines()
+    commands = ["show system information"] * 10
+
+    return [
+        ("run_commands", lambda: cliconf.run_commands(commands[:1])),
+        ("run_commands_x10", lambda: cliconf.run_commands(commands)),
+        ("run_commands_x10_batch", lambda: cliconf.run_commands(commands, batch=True)),
+        ("get_config", lambda: cliconf.get_config()),
+        ("get_diff", lambda: cliconf.get_diff(candidate=candidate, running=config)),
+        ("edit_config", lambda: cliconf.edit_config(changes)),
+        (
+            "edit_config_pipeline",
+            lambda: cliconf.edit_config(changes, pipeline_size=pipeline_size),
+        ),
+    ]
+
+
+def run(args):
+    results = []
+    for size in args.sizes:
+        config = generate_config(size)
+        shell = FakeSirShell(config, latency=args.latency, chunk_size=args.chunk_size)
+        connection = FakeConnection(shell.client, ssh_type=args.ssh_type)
+        cliconf = Cliconf(connection)
+        try:
+            for name, func in operations(cliconf, config, args.pipeline_size):
+                if args.ops and name not in args.ops:
+                    continue
+                result = measure(func, args.iterations, args.min_time, args.max_time)
+                result.update({"size": size, "op": name})
+                results.append(result)
+                print(
+                    "%8d  %-24s %6d  %12.1f  %10.3f  %10.3f"
+                    % (
+                        size,
+                        name,
+                        result["iterations"],
+                        result["ops_per_sec"],
+                        result["p50_ms"],
+                        result["p99_ms"],
+                    )
+                )
+                sys.stdout.flush()
+        finally:
+            shell.close()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return the operations whose p50 is slower than the baseline"""
+    previous = dict(((r["size"], r["op"]), r) for r in baseline)
+    regressions = []
+    for result in results:
+        base = previous.get((result["size"], result["op"]))
+        if base and result["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append((result, base))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        type=lambda v: [int(s) for s in v.split(",")],
+        help="comma separated running-config sizes in lines",
+    )
+    parser.add_argument("--ops", type=lambda v: v.split(","), help="operations to run")
+    parser.add_argument("--iterations", type=int, default=5, help="minimum iterations per op")
+    parser.add_argument("--min-time", type=float, default=1.0, help="minimum seconds per op")
+    parser.add_argument(
+        "--max-time", type=float, default=30.0, help="stop an op after this many seconds"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="device latency per command")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="device write size")
+    parser.add_argument("--ssh-type", choices=["libssh", "paramiko"], default="libssh")
+    parser.add_argument("--pipeline-size", type=int, default=100)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare the results with this file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown")
+    args = parser.parse_args(argv)
+
+    print(
+        "%8s  %-24s %6s  %12s  %10s  %10s" % ("lines", "op", "iter", "ops/sec", "p50 ms", "p99 ms")
+    )
+    results = run(args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for result, base in regressions:
+            print(
+                "REGRESSION %s at %d lines: p50 %.3f ms, baseline %.3f ms"
+                % (result["op"], result["size"], result["p50_ms"], base["p50_ms"])
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Throughput of the Si-R output parsers.
+
+Parses a fleet sweep, i.e. the output of `show system information`, ping and
+`show interface` of many devices, with the parsers of module_utils and with
+the per call compiled regexes they replaced.  Run from the root of the
+collections tree, e.g.:
+
+    python -m ansible_collections.caribouhy.sir.tests.benchmarks.bench_parsers \\
+        --devices 5000
+
+A sweep log replayed offline can be parsed instead of the generated one with
+--replay, a file with one JSON object with the `command` and the `output` of
+a command per line.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir import parsers
+from ansible_collections.caribouhy.sir.tests.benchmarks.fake_sir import load_fixture
+
+
+PING_TEMPLATE = """PING {dest}: 46 data bytes.
+54 bytes from {dest}: icmp_seq=0 ttl=60 time={rtt}.{min:03d} ms
+54 bytes from {dest}: icmp_seq=1 ttl=60 time={rtt}.{max:03d} ms
+
+----{dest} PING Statistics----
+2 packets transmitted, 2 packets received, 0% packet loss
+round-trip (ms)  min/ave/max = {rtt}.{min:03d}/{rtt}.{avg:03d}/{rtt}.{max:03d}
+"""
+
+PING_UNREACHABLE = """PING {dest}: 46 data bytes.
+
+----{dest} PING Statistics----
+2 packets transmitted, 0 packets received, 100% packet loss
+"""
+
+
+def generate_sweep(devices):
+    """
+    Return the (command, output) pairs of a sweep of devices.  Like the
+    output of a real fleet no two outputs are the same, the uptime, the round
+    trip times and the addresses differ from device to device.
+    """
+    system_information = load_fixture("show_system_information")
+    interface = load_fixture("show_interface")
+    sweep = []
+    for device in range(devices):
+        prefix = "10.%d.%d." % (device // 256 % 256, device % 256)
+        sweep.append(
+            (
+                "show system information",
+                system_information.replace(
+                    "21:29:20", "21:%02d:%02d" % (device // 60 % 60, device % 60)
+                ),
+            )
+        )
+        for dest in (prefix + "254", prefix + "253", "8.8.8.8"):
+            if device % 50 == 0 and dest.endswith(".253"):
+                output = PING_UNREACHABLE.format(dest=dest)
+            else:
+                low, high = device % 500, device % 500 + 400
+                output = PING_TEMPLATE.format(
+                    dest=dest, rtt=device // 500 % 9 + 1, min=low, avg=(low + high) // 2, max=high
+                )
+            sweep.append(("ping %s repeat 2" % dest, output))
+        sweep.append(("show interface", interface.replace("192.168.1.1/24", prefix + "1/24")))
+    return sweep
+
+
+def load_replay(path):
+    sweep = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                sweep.append((entry["command"], entry["output"]))
+    return sweep
+
+
+def legacy_system_information(data):
+    info = {}
+    for line in data.splitlines():
+        key, sep, value = line.partition(" : ")
+        if sep:
+            info[key.strip()] = value.strip()
+    match = re.search(r"Firm Ver. : V(\d\d\.\d\d)", data)
+    if match:
+        info["version"] = match.group(1)
+    match = re.search(r"System : ((Si-R|SR-S|SR-X) ?\w{2,6})", data)
+    if match:
+        info["model"] = match.group(1)
+    return info
+
+
+def legacy_ping(output):
+    rate_re = re.compile(
+        r"(?P<tx>\d+) packets transmitted, (?P<rx>\d+) packets received, (?P<pkt_loss>\d+)% packet loss",
+    )
+    rtt_re = re.compile(
+        r"round-trip \(ms\)  min/ave/max = (?P<min>\d*).(?:\d*)/(?P<avg>\d*).(?:\d*)/(?P<max>\d+).(?:\d*)",
+    )
+    results = {}
+    for line in output.splitlines():
+        if line.startswith("round-trip"):
+            results["rtt"] = dict((k, int(v)) for k, v in rtt_re.match(line).groupdict().items())
+        match = rate_re.match(line)
+        if match:
+            results["packet_loss"] = match.group("pkt_loss") + "%"
+            results["packets_rx"] = int(match.group("rx"))
+            results["packets_tx"] = int(match.group("tx"))
+    return results
+
+
+def legacy_interface(data):
+    interfaces = {}
+    name = None
+    for line in data.splitlines():
+        match = re.match(r"\[([^\]]+)\]", line)
+        if match:
+            name = match.group(1)
+            interfaces[name] = {"name": name}
+            continue
+        if name is None:
+            continue
+        match = re.match(r"\s*status\s*:?\s*(up|down)\b", line, re.I)
+        if match:
+            interfaces[name]["status"] = match.group(1).lower()
+        match = re.match(r"\s*MTU\s*:?\s*(\d+)", line)
+        if match:
+            interfaces[name]["mtu"] = int(match.group(1))
+        match = re.match(r"\s*([0-9a-fA-F:.]+/\d+)\s*$", line)
+        if match:
+            interfaces[name].setdefault("addresses", []).append(match.group(1))
+    return interfaces
+
+
+def legacy_parse(command, output):
+    if command.startswith("show system information"):
+        return legacy_system_information(output)
+    if command.startswith("ping "):
+        return legacy_ping(output)
+    if command.startswith("show interface"):
+        return legacy_interface(output)
+    return None
+
+
+def registry_parse(command, output):
+    result = parsers.parse_output(command, output)
+    if command.startswith("show system information"):
+        result["version"] = parsers.parse_firmware_version(output)
+        result["model"] = parsers.parse_model(output)
+    return result
+
+
+def measure(func, sweep, min_time):
+    rounds = 0
+    start = time.perf_counter()
+    while True:
+        for command, output in sweep:
+            func(command, output)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return rounds * len(sweep) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000, help="devices in the generated sweep")
+    parser.add_argument("--replay", help="parse the sweep log in this file")
+    parser.add_argument("--min-time", type=float, default=2.0, help="minimum seconds per parser")
+    args = parser.parse_args(argv)
+
+    sweep = load_replay(args.replay) if args.replay else generate_sweep(args.devices)
+    print("%d outputs" % len(sweep))
+    print("%-20s %14s  %8s" % ("parser", "outputs/sec", "speedup"))
+    legacy = None
+    for name, func in (
+        ("legacy", legacy_parse),
+        ("registry", registry_parse),
+    ):
+        rate = measure(func, sweep, args.min_time)
+        legacy = legacy or rate
+        print("%-20s %14.0f  %7.2fx" % (name, rate, rate / legacy))
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+A simulated Si-R CLI for benchmarks.
+
+FakeSirShell serves one end of a socketpair from a thread and behaves like
+the shell of a Si-R device: it echoes every command, answers the show
+commands used by the cliconf plugin and ends every response with a prompt
+matched by TerminalModule.terminal_stdout_re.  FakeConnection drives the
+other end the way the network_cli connection does, reading until the
+terminal regexes match the received buffer.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import os
+import socket
+import threading
+import time
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_bytes, to_text
+
+from ansible_collections.caribouhy.sir.plugins.terminal.sir import TerminalModule
+
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "unit", "modules", "network", "sir", "fixtures"
+)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_PATH, name)) as f:
+        return f.read()
+
+
+def generate_config(size):
+    """
+    Generate a running-config of about size lines from the ether and time
+    lines of the sir_config_config.cfg fixture, with one block of ether and
+    lan lines for every port.
+    """
+    template = [line for line in load_fixture("sir_config_config.cfg").splitlines() if line]
+    ether = [line.split(None, 3)[3] for line in template if line.startswith("ether 2 1 ")]
+    other = [line for line in template if not line.startswith("ether")]
+
+    lines = []
+    port = 0
+    while len(lines) + len(other) < size:
+        port += 1
+        for attr in ether:
+            lines.append("ether %d 1 %s" % (port, attr))
+        lines.append("lan %d ip address 10.%d.%d.1/24 3" % (port, port // 256 % 256, port % 256))
+        lines.append("lan %d vlan %d" % (port, port))
+    return "\n".join(lines[: size - len(other)] + other)
+
+
+class FakeSirShell(object):
+    """
+    :param config: The running-config returned by `show running-config`
+    :param latency: Seconds to wait before answering every command
+    :param chunk_size: The size of the writes the response is split into
+    :param hostname: The hostname shown in the prompt
+    """
+
+    def __init__(self, config="", latency=0.0, chunk_size=4096, hostname="router"):
+        self.config = config
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.hostname = hostname
+        self.system_information = load_fixture("show_system_information")
+        self.config_mode = False
+        self.candidate = []
+        self.commands = 0
+        self.client, self._server = socket.socketpair()
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def prompt(self):
+        return "%s%s# " % (self.hostname, "(config)" if self.config_mode else "")
+
+    def close(self):
+        self.client.close()
+        self._thread.join()
+        self._server.close()
+
+    def _serve(self):
+        buf = b""
+        while True:
+            try:
+                data = self._server.recv(65536)
+            except OSError:
+                return
+            if not data:
+                return
+            buf += data
+            while b"\r" in buf:
+                line, buf = buf.split(b"\r", 1)
+                self._respond(to_text(line).strip())
+
+    def _respond(self, command):
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+        output = self.execute(command)
+        data = "%s\r\n" % command
+        if output:
+            data += output.replace("\n", "\r\n") + "\r\n"
+        data = to_bytes(data + self.prompt)
+        for start in range(0, len(data), self.chunk_size):
+            try:
+                self._server.sendall(data[start : start + self.chunk_size])
+            except OSError:
+                return
+
+    def execute(self, command):
+        if command.startswith("invalid"):
+            return "<ERROR> Invalid command"
+
+        if self.config_mode:
+            if command in ("end", "exit"):
+                self.config_mode = False
+            elif command == "commit" or command.startswith("commit try time"):
+                self.candidate = []
+            elif command == "discard":
+                self.candidate = []
+            elif command == "save":
+                pass
+            else:
+                self.candidate.append(command)
+            return ""
+
+        if command == "configure":
+            self.config_mode = True
+        elif command == "show system information":
+            return self.system_information
+        elif command == "show running-config sysname":
+            return self.hostname
+        elif command.startswith("show running-config") or command.startswith("show startup-config"):
+            section = command.split()[2:]
+            if section and section != ["all"]:
+                prefix = section[0] + " "
+                return "\n".join(
+                    line for line in self.config.splitlines() if line.startswith(prefix)
+                )
+            return self.config
+        return ""
+
+
+class FakeConnection(object):
+    """
+    The parts of the network_cli connection used by the cliconf plugin.
+
+    receive() follows the read loop of network_cli: with ssh_type `libssh`
+    the terminal regexes are matched against the whole buffer received so
+    far, with `paramiko` against a window of the last 256 bytes.
+    """
+
+    def __init__(self, sock, ssh_type="libssh", recv_size=4096):
+        self._sock = sock
+        self.ssh_type = ssh_type
+        self.recv_size = recv_size
+        self._matched_prompt = b"router# "
+        self._history = []
+
+    def get_prompt(self):
+        return self._matched_prompt
+
+    def send(
+        self,
+        command,
+        prompt=None,
+        answer=None,
+        newline=True,
+        sendonly=False,
+        prompt_retry_check=False,
+        check_all=False,
+        strip_prompt=True,
+    ):
+        cmd = b"%s\r" % command
+        self._history.append(cmd)
+        self._sock.sendall(cmd)
+        if sendonly:
+            return
+        response = self.receive(command, strip_prompt=strip_prompt)
+        return to_text(response, errors="surrogate_then_replace")
+
+    def receive(self, command=None, strip_prompt=True):
+        resp = b""
+        errored_response = None
+        while True:
+            data = self._sock.recv(self.recv_size)
+            if not data:
+                raise AnsibleConnectionFailure("connection closed")
+            resp += data
+            window = resp if self.ssh_type == "libssh" else resp[-256:]
+
+            if self._find_error(window):
+                errored_response = window
+            if self._find_prompt(window):
+                if errored_response:
+                    raise AnsibleConnectionFailure(to_text(errored_response))
+                return self._sanitize(resp, command, strip_prompt)
+
+    def _find_error(self, response):
+        return any(regex.search(response) for regex in TerminalModule.terminal_stderr_re)
+
+    def _find_prompt(self, response):
+        for regex in TerminalModule.terminal_stdout_re:
+            match = regex.search(response)
+            if match:
+                self._matched_prompt = match.group()
+                return True
+        return False
+
+    def _sanitize(self, resp, command=None, strip_prompt=True):
+        cleaned = []
+        prompt = self._matched_prompt.strip()
+        for line in resp.splitlines():
+            if command and line.strip() == command.strip():
+                continue
+            if strip_prompt and prompt in line:
+                continue
+            cleaned.append(line)
+        return b"\n".join(cleaned).strip()
@@ -0,0 +1,99 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+
+from unittest import TestCase, skipUnless
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.backup import (
+    HAS_ZSTANDARD,
+    BackupStore,
+)
+
+from .sir_module import load_fixture
+
+
+class TestSirBackupStore(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.config = load_fixture("sir_config_config.cfg")
+
+    def test_write_dedup(self):
+        store = BackupStore(self.path)
+        first = store.write("router1", self.config)
+        second = store.write("router2", self.config)
+        self.assertEqual(first["hash"], second["hash"])
+        self.assertEqual(first["path"], second["path"])
+        self.assertTrue(first["changed"])
+        self.assertTrue(second["changed"])
+        blobs = os.listdir(os.path.join(self.path, "blobs", first["hash"][:2]))
+        self.assertEqual(blobs, [first["hash"]])
+        self.assertEqual(store.read(first["hash"]), self.config)
+
+    def test_write_unchanged(self):
+        store = BackupStore(self.path)
+        store.write("router1", self.config, timestamp="2024-11-20@22:28:34")
+        result = store.write("router1", self.config, timestamp="2024-11-21@22:28:34")
+        self.assertFalse(result["changed"])
+        self.assertEqual(store.latest("router1"), result["hash"])
+        self.assertEqual(
+            [entry["timestamp"] for entry in store.index("router1")],
+            ["2024-11-20@22:28:34", "2024-11-21@22:28:34"],
+        )
+
+    def test_write_changed(self):
+        store = BackupStore(self.path)
+        store.write("router1", self.config)
+        result = store.write("router1", self.config + "\nether 3 1 use off")
+        self.assertTrue(result["changed"])
+        self.assertEqual(len(list(store.index())), 2)
+
+    def test_write_concurrent(self):
+        store = BackupStore(self.path)
+        errors = []
+
+        def write(device):
+            try:
+                store.write(device, self.config)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write, args=("router%d" % i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(list(store.index())), 8)
+
+    def test_write_gzip(self):
+        store = BackupStore(self.path, compression="gzip")
+        result = store.write("router1", self.config)
+        self.assertTrue(result["path"].endswith(".gz"))
+        with gzip.open(result["path"], "rt") as f:
+            self.assertEqual(f.read(), self.config)
+        self.assertEqual(store.read(result["hash"]), self.config)
+
+        # a blob stored with another compression is reused
+        result = BackupStore(self.path).write("router2", self.config)
+        self.assertTrue(result["path"].endswith(".gz"))
+
+    @skipUnless(HAS_ZSTANDARD, "zstandard is not installed")
+    def test_write_zstd(self):
+        store = BackupStore(self.path, compression="zstd")
+        result = store.write("router1", self.config)
+        self.assertTrue(result["path"].endswith(".zst"))
+        self.assertEqual(store.read(result["hash"]), self.config)
+
+    def test_invalid_compression(self):
+        self.assertRaises(ValueError, BackupStore, self.path, compression="bzip2")
@@ -0,0 +1,368 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import json
+import os
+import shutil
+import tempfile
+
+from textwrap import dedent
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from ansible.errors import AnsibleConnectionFailure
+
+from ansible_collections.caribouhy.sir.plugins.cliconf.sir import Cliconf
+
+from .sir_module import load_fixture
+
+
+class TestSirCliconf(TestCase):
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.get_prompt.return_value = b"\r\nrouter# "
+        self.cliconf = Cliconf(self.connection)
+
+    def test_run_commands_batch(self):
+        self.connection.receive.side_effect = [
+            dedent(
+                """\
+                show system information
+                System : Si-R G120
+                router# show ip route
+                Codes: C - connected
+                C    192.0.2.0/24 [0/0] is directly connected, lan0
+                router# show arp"""
+            ).encode(),
+            dedent(
+                """\
+                192.0.2.1  00:00:5e:00:53:01  lan0
+                router#"""
+            ).encode(),
+        ]
+        responses = self.cliconf.run_commands(
+            ["show system information", "show ip route", "show arp"], batch=True
+        )
+        self.assertEqual(
+            responses,
+            [
+                "System : Si-R G120",
+                "Codes: C - connected\nC    192.0.2.0/24 [0/0] is directly connected, lan0",
+                "192.0.2.1  00:00:5e:00:53:01  lan0",
+            ],
+        )
+        self.connection.send.assert_called_once_with(
+            command=b"show system information\rshow ip route\rshow arp", sendonly=True
+        )
+        self.assertEqual(self.connection.receive.call_count, 2)
+
+    def test_run_commands_batch_split_prompt(self):
+        self.connection.receive.side_effect = [
+            b"show system information\r\nSystem : Si-R G120\r\nrouter#",
+            b"show ether\r\nether 1 up\r\nrouter#",
+        ]
+        responses = self.cliconf.run_commands(
+            [{"command": "show system information"}, {"command": "show ether"}], batch=True
+        )
+        self.assertEqual(responses, ["System : Si-R G120", "ether 1 up"])
+
+    def test_run_commands_batch_error(self):
+        self.connection.receive.side_effect = [
+            AnsibleConnectionFailure("show foo\r\n<ERROR> invalid parameter\r\nrouter# "),
+            b"show ether\r\nether 1 up\r\nrouter#",
+            b"router#",
+        ]
+        with self.assertRaises(AnsibleConnectionFailure):
+            self.cliconf.run_commands(["show foo", "show ether"], batch=True)
+        self.assertEqual(self.connection.receive.call_count, 3)
+        self.connection.send.assert_called_with(command=b"", sendonly=True)
+
+    def test_run_commands_batch_error_no_check_rc(self):
+        self.connection.receive.side_effect = [
+            AnsibleConnectionFailure("show foo\r\n<ERROR> invalid parameter\r\nrouter# "),
+            b"show ether\r\nether 1 up\r\nrouter#",
+            b"router#",
+        ]
+        responses = self.cliconf.run_commands(
+            ["show foo", "show ether"], check_rc=False, batch=True
+        )
+        self.assertEqual(responses, ["<ERROR> invalid parameter", "ether 1 up"])
+
+    def test_run_commands_batch_error_truncated(self):
+        # with paramiko the error only carries the last window of the output
+        self.connection.receive.side_effect = [
+            AnsibleConnectionFailure(
+                "tem information\r\nSystem : Si-R G120\r\nrouter# show foo\r\n"
+                "<ERROR> invalid parameter\r\nrouter# "
+            ),
+            b"show ether\r\nether 1 up\r\nrouter# \r\nrouter#",
+        ]
+        responses = self.cliconf.run_commands(
+            ["show system information", "show foo", "show ether"], check_rc=False, batch=True
+        )
+        self.assertEqual(responses, ["", "<ERROR> invalid parameter", "ether 1 up"])
+        self.assertEqual(self.connection.receive.call_count, 2)
+
+    def test_run_commands_batch_timeout(self):
+        self.connection.receive.side_effect = [
+            b"show system information\r\nSystem : Si-R G120\r\nrouter#",
+            AnsibleConnectionFailure("command timeout triggered"),
+        ]
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            self.cliconf.run_commands(
+                ["show system information", "show ether"], check_rc=False, batch=True
+            )
+        self.assertEqual(exc.exception.message, "command timeout triggered")
+
+    def test_run_commands_batch_prompt_fallback(self):
+        self.connection.send.return_value = "System : Si-R G120"
+        commands = [
+            {"command": "show system information"},
+            {"command": "save", "prompt": "overwrite?", "answer": "y"},
+        ]
+        self.cliconf.run_commands(commands, batch=True)
+        self.assertEqual(self.connection.send.call_count, 2)
+        self.connection.receive.assert_not_called()
+
+    def test_run_commands_output_json(self):
+        self.connection.send.side_effect = [load_fixture("show_ip_route"), "router"]
+        responses = self.cliconf.run_commands(
+            [{"command": "show ip route", "output": "json"}, "show running-config sysname"]
+        )
+        self.assertEqual(len(responses[0]), 6)
+        self.assertEqual(
+            responses[0][0],
+            {
+                "destination": "0.0.0.0/0",
+                "gateway": "203.0.113.254",
+                "interface": "lan1",
+                "metric": 1,
+                "type": "remote",
+                "protocol": "static",
+            },
+        )
+        self.assertEqual(responses[1], "router")
+
+    def test_run_commands_output_json_unsupported(self):
+        self.assertRaises(
+            ValueError,
+            self.cliconf.run_commands,
+            [{"command": "show running-config", "output": "json"}],
+        )
+        self.assertRaises(
+            ValueError,
+            self.cliconf.run_commands,
+            [{"command": "show ip route", "output": "xml"}],
+        )
+        self.connection.send.assert_not_called()
+
+    def test_edit_config_pipeline(self):
+        self.connection.get_prompt.return_value = b"router(config)# "
+        self.connection.receive.side_effect = [
+            b"ether 1 1 use on\r\nrouter(config)# ether 2 1 use on\r\nrouter(config)#",
+            b"lan 0 description foo\r\nrouter(config)#",
+        ]
+        candidate = ["ether 1 1 use on", "ether 2 1 use on", "!", "lan 0 description foo"]
+        resp = self.cliconf.edit_config(candidate, pipeline_size=2)
+        self.assertEqual(
+            resp["request"], ["ether 1 1 use on", "ether 2 1 use on", "lan 0 description foo"]
+        )
+        sent = [call[1]["command"] for call in self.connection.send.call_args_list]
+        self.assertEqual(
+            sent,
+            [
+                b"configure",
+                b"ether 1 1 use on\rether 2 1 use on",
+                b"lan 0 description foo",
+                b"commit",
+                b"end",
+            ],
+        )
+
+    def test_edit_config_pipeline_error(self):
+        self.connection.get_prompt.return_value = b"router(config)# "
+        self.connection.receive.side_effect = [
+            AnsibleConnectionFailure(
+                "ether 1 1 use on\r\nrouter(config)# ether 9 1 use on\r\n"
+                "<ERROR> invalid port\r\nrouter(config)#"
+            ),
+            b"router(config)#",
+        ]
+        candidate = ["ether 1 1 use on", "ether 9 1 use on", "lan 0 description foo"]
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            self.cliconf.edit_config(candidate, pipeline_size=2)
+        self.assertIn("line 2 'ether 9 1 use on': <ERROR> invalid port", exc.exception.message)
+        sent = [call[1]["command"] for call in self.connection.send.call_args_list]
+        self.assertEqual(
+            sent, [b"configure", b"ether 1 1 use on\rether 9 1 use on", b"", b"discard", b"end"]
+        )
+
+    def test_edit_config_pipeline_timeout(self):
+        self.connection.get_prompt.return_value = b"router(config)# "
+        self.connection.receive.side_effect = [
+            b"ether 1 1 use on\r\nrouter(config)#",
+            AnsibleConnectionFailure("command timeout triggered"),
+        ]
+        candidate = ["ether 1 1 use on", "ether 2 1 use on"]
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            self.cliconf.edit_config(candidate, pipeline_size=2)
+        self.assertEqual(exc.exception.message, "command timeout triggered")
+        sent = [call[1]["command"] for call in self.connection.send.call_args_list]
+        self.assertEqual(
+            sent, [b"configure", b"ether 1 1 use on\rether 2 1 use on", b"discard", b"end"]
+        )
+
+
+class TestSirCliconfDeviceInfo(TestCase):
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.get_prompt.return_value = b"\r\nrouter# "
+        self.cliconf = Cliconf(self.connection)
+        self.system_information = load_fixture("show_system_information")
+
+        def send(command, **kwargs):
+            if command == b"show system information":
+                return self.system_information
+            if command == b"show running-config sysname":
+                return "router"
+            return ""
+
+        self.connection.send.side_effect = send
+
+    def sent_commands(self):
+        return [c.kwargs["command"] for c in self.connection.send.call_args_list]
+
+    def test_get_device_info(self):
+        device_info = self.cliconf.get_device_info()
+        self.assertEqual(device_info["network_os_version"], "20.54")
+        self.assertEqual(device_info["network_os_model"], "Si-R G120")
+        self.assertEqual(device_info["network_os_hostname"], "router")
+
+    def test_get_capabilities_cached(self):
+        first = self.cliconf.get_capabilities()
+        second = self.cliconf.get_capabilities()
+        self.assertEqual(first, second)
+        self.assertEqual(self.sent_commands().count(b"show system information"), 1)
+        self.assertIn("get_system_information", json.loads(first)["rpc"])
+
+    def test_commit_invalidates_device_info(self):
+        self.cliconf.get_capabilities()
+        self.cliconf.commit()
+        self.cliconf.get_capabilities()
+        self.assertEqual(self.sent_commands().count(b"show system information"), 2)
+
+    def test_get_system_information_firmware_changed(self):
+        self.cliconf.get_device_info()
+        info = self.cliconf.get_system_information()
+        self.assertEqual(info["Serial No."], "12130566")
+        self.assertTrue(self.cliconf._device_info)
+
+        self.system_information = self.system_information.replace("V20.54", "V20.60")
+        self.cliconf.get_system_information()
+        self.assertEqual(self.cliconf._device_info, {})
+        self.assertEqual(self.cliconf.get_device_info()["network_os_version"], "20.60")
+
+    def test_confirm_commit(self):
+        self.cliconf.commit(commit_timer=5)
+        self.assertEqual(self.sent_commands()[-1], b"commit try time 5m")
+        remaining = self.cliconf.confirm_commit()
+        self.assertGreater(remaining, 290)
+        self.assertEqual(self.sent_commands()[-3:], [b"configure", b"commit", b"end"])
+        self.assertIsNone(self.cliconf._commit_deadline)
+
+    def test_confirm_commit_expired(self):
+        self.cliconf.commit(commit_timer=5)
+        self.cliconf._commit_deadline -= 301
+        self.assertRaises(ValueError, self.cliconf.confirm_commit)
+        self.assertEqual(self.sent_commands()[-1], b"commit try time 5m")
+
+    def test_confirm_commit_not_pending(self):
+        self.assertRaises(ValueError, self.cliconf.confirm_commit)
+        self.cliconf.commit()
+        self.assertRaises(ValueError, self.cliconf.confirm_commit)
+        self.assertEqual(self.sent_commands(), [b"commit"])
+
+    def test_prewarm(self):
+        self.connection._connected = False
+        result = self.cliconf.prewarm()
+        self.assertFalse(result["reused"])
+        self.assertIn("device_info", result)
+        self.connection._connect.assert_called_once_with()
+        # the device info is cached for the tasks that follow
+        self.cliconf.get_device_info()
+        self.assertEqual(self.sent_commands().count(b"show system information"), 1)
+
+    def test_prewarm_get_capabilities(self):
+        self.connection._connected = True
+        self.cliconf.prewarm()
+        sent = self.sent_commands()
+        capabilities = json.loads(self.cliconf.get_capabilities())
+        self.assertEqual(capabilities["device_info"]["network_os_model"], "Si-R G120")
+        self.assertEqual(self.sent_commands(), sent)
+
+    def test_prewarm_reused(self):
+        self.connection._connected = True
+        result = self.cliconf.prewarm(device_info=False)
+        self.assertTrue(result["reused"])
+        self.assertNotIn("device_info", result)
+        self.assertEqual(self.connection._connect.call_count, 0)
+        self.assertEqual(self.sent_commands(), [])
+
+    def test_prewarm_without_admin(self):
+        self.connection._connected = True
+        self.connection.get_prompt.return_value = b"\r\nrouter> "
+        result = self.cliconf.prewarm()
+        self.assertNotIn("device_info", result)
+        self.assertEqual(self.sent_commands(), [])
+
+    def test_device_info_ttl(self):
+        self.cliconf.get_option = MagicMock(return_value=60)
+        self.cliconf.get_device_info()
+        self.cliconf._device_info_time -= 61
+        self.cliconf.get_device_info()
+        self.assertEqual(self.sent_commands().count(b"show system information"), 2)
+
+
+class TestSirCliconfOutputFile(TestCase):
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.get_prompt.return_value = b"\r\nrouter# "
+        self.cliconf = Cliconf(self.connection)
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_run_commands_to_file(self):
+        self.connection.send.return_value = load_fixture("show_system_information")
+        results = self.cliconf.run_commands_to_file(
+            ["show system information", "show system information"], self.path, lines=2
+        )
+        self.assertEqual(
+            [os.path.basename(r["path"]) for r in results],
+            ["show_system_information.txt", "show_system_information_2.txt"],
+        )
+        with open(results[0]["path"]) as f:
+            self.assertEqual(f.read(), load_fixture("show_system_information"))
+        self.assertEqual(results[0]["lines"], 14)
+        self.assertEqual(results[0]["head"][0], "Current-time : Sat Nov 16 21:29:20 2024")
+        self.assertEqual(results[0]["tail"], ["Memory : 320MB", "USB   : ------"])
+        self.assertEqual(len(results[0]["sha256"]), 64)
+
+    def test_run_commands_to_file_new_dir(self):
+        self.connection.send.return_value = "router"
+        path = os.path.join(self.path, "output", "router")
+        for _ in range(2):
+            results = self.cliconf.run_commands_to_file(["show running-config sysname"], path)
+        self.assertEqual(results[0]["path"], os.path.join(path, "show_running-config_sysname.txt"))
+        self.assertEqual(results[0]["size"], 6)
+
+    def test_run_commands_to_file_error(self):
+        self.connection.send.side_effect = AnsibleConnectionFailure("<ERROR> Invalid command")
+        self.assertRaises(
+            AnsibleConnectionFailure, self.cliconf.run_commands_to_file, ["show foo"], self.path
+        )
+        self.assertEqual(os.listdir(self.path), [])
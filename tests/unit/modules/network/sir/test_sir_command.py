@@ -21,8 +21,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from unittest.mock import patch
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
+from ansible_collections.caribouhy.sir.plugins.action.sir import ActionModule
 from ansible_collections.caribouhy.sir.plugins.modules import sir_command
 from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
 
@@ -35,7 +37,7 @@ class TestSirCommandModule(TestSirModule):
     def setUp(self):
         super(TestSirCommandModule, self).setUp()
         self.mock_run_commands = patch(
-            "ansible_collections.caribouhy.sir.plugins.modules.sir_command.run_commands",
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.wait.run_commands",
         )
         self.run_commands = self.mock_run_commands.start()
 
@@ -66,9 +68,7 @@ class TestSirCommandModule(TestSirModule):
         self.assertTrue(result["stdout"][0].startswith("Current-time : "))
 
     def test_sir_command_multiple(self):
-        set_module_args(
-            dict(commands=["show system information", "show system information"])
-        )
+        set_module_args(dict(commands=["show system information", "show system information"]))
         result = self.execute_module()
         self.assertEqual(len(result["stdout"]), 2)
         self.assertTrue(result["stdout"][0].startswith("Current-time : "))
@@ -86,17 +86,13 @@ class TestSirCommandModule(TestSirModule):
 
     def test_sir_command_retries(self):
         wait_for = 'result[0] contains "test string"'
-        set_module_args(
-            dict(commands=["show system information"], wait_for=wait_for, retries=2)
-        )
+        set_module_args(dict(commands=["show system information"], wait_for=wait_for, retries=2))
         self.execute_module(failed=True)
         self.assertEqual(self.run_commands.call_count, 3)
 
     def test_sir_command_no_retries(self):
         wait_for = 'result[0] contains "test string"'
-        set_module_args(
-            dict(commands=["show system information"], wait_for=wait_for, retries=0)
-        )
+        set_module_args(dict(commands=["show system information"], wait_for=wait_for, retries=0))
         self.execute_module(failed=True)
         self.assertEqual(self.run_commands.call_count, 1)
 
@@ -105,9 +101,7 @@ class TestSirCommandModule(TestSirModule):
             'result[0] contains "System : S"',
             'result[0] contains "test string"',
         ]
-        set_module_args(
-            dict(commands=["show system information"], wait_for=wait_for, match="any")
-        )
+        set_module_args(dict(commands=["show system information"], wait_for=wait_for, match="any"))
         self.execute_module()
 
     def test_sir_command_match_all(self):
@@ -115,9 +109,7 @@ class TestSirCommandModule(TestSirModule):
             'result[0] contains "System : S"',
             'result[0] contains "Firm Ver. : V"',
         ]
-        set_module_args(
-            dict(commands=["show system information"], wait_for=wait_for, match="all")
-        )
+        set_module_args(dict(commands=["show system information"], wait_for=wait_for, match="all"))
         self.execute_module()
 
     def test_sir_command_match_all_failure(self):
@@ -145,3 +137,137 @@ class TestSirCommandModule(TestSirModule):
         set_module_args(dict(commands=commands))
         result = self.execute_module()
         self.assertEqual(result["warnings"], [])
+
+    def test_sir_command_output_dir(self):
+        output = [{"path": "/tmp/output/show_ip_route.txt", "size": 10, "sha256": "0", "lines": 1}]
+        with patch.object(sir_command, "run_commands_to_file", return_value=output) as mock:
+            set_module_args(
+                dict(commands=["show ip route"], output_dir="/tmp/output", output_lines=5)
+            )
+            result = self.execute_module()
+        self.assertEqual(result["output"], output)
+        self.assertNotIn("stdout", result)
+        self.assertEqual(self.run_commands.call_count, 0)
+        self.assertEqual(mock.call_args[0][2], "/tmp/output")
+        self.assertEqual(mock.call_args[1]["lines"], 5)
+
+    def test_sir_command_output_dir_wait_for(self):
+        wait_for = 'result[0] contains "System : S"'
+        set_module_args(
+            dict(commands=["show system information"], wait_for=wait_for, output_dir="/tmp")
+        )
+        self.execute_module(failed=True)
+
+    def test_sir_command_wait_for_backoff(self):
+        wait_for = 'result[0] contains "test string"'
+        set_module_args(
+            dict(
+                commands=["show system information"],
+                wait_for=wait_for,
+                retries=4,
+                interval=2,
+                backoff=2,
+                max_interval=10,
+            )
+        )
+        with patch("time.sleep") as sleep:
+            self.execute_module(failed=True)
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [2, 4, 8, 10])
+        self.assertEqual(self.run_commands.call_count, 5)
+
+    def test_sir_command_wait_for_jitter(self):
+        wait_for = 'result[0] contains "test string"'
+        set_module_args(
+            dict(
+                commands=["show system information"],
+                wait_for=wait_for,
+                retries=1,
+                interval=10,
+                jitter=0.2,
+            )
+        )
+        with patch("time.sleep") as sleep, patch("random.random", return_value=0.5):
+            self.execute_module(failed=True)
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [9.0])
+
+    def test_sir_command_wait_for_deadline(self):
+        wait_for = 'result[0] contains "test string"'
+        set_module_args(
+            dict(
+                commands=["show system information"],
+                wait_for=wait_for,
+                interval=5,
+                deadline=12,
+            )
+        )
+        clock = [1000.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        with patch("time.sleep", side_effect=sleep) as mock_sleep, patch(
+            "time.time", side_effect=lambda: clock[0]
+        ):
+            self.execute_module(failed=True)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [5, 5, 2])
+        self.assertEqual(self.run_commands.call_count, 4)
+
+    def test_sir_command_wait_for_rerun_pending(self):
+        wait_for = [
+            'result[0] contains "System : S"',
+            'result[1] contains "test string"',
+        ]
+        commands = ["show system information", "show system information"]
+        set_module_args(dict(commands=commands, wait_for=wait_for, retries=2, rerun="pending"))
+        self.execute_module(failed=True)
+        self.assertEqual(self.run_commands.call_count, 3)
+        self.assertEqual(len(self.run_commands.call_args_list[0][0][1]), 2)
+        self.assertEqual(len(self.run_commands.call_args_list[1][0][1]), 1)
+        self.assertEqual(len(self.run_commands.call_args_list[2][0][1]), 1)
+
+    def test_sir_command_output_json_wait_for(self):
+        routes = [{"destination": "0.0.0.0/0", "gateway": "203.0.113.254", "metric": 1}]
+        self.load_fixtures = lambda *args, **kwargs: None
+        self.run_commands.return_value = [routes]
+        commands = [{"command": "show ip route", "output": "json"}]
+        wait_for = 'result[0][0].gateway eq "203.0.113.254"'
+        set_module_args(dict(commands=commands, wait_for=wait_for))
+        result = self.execute_module()
+        self.assertEqual(result["stdout"], [routes])
+        self.assertEqual(self.run_commands.call_args[0][1][0]["output"], "json")
+
+
+class TestSirCommandAction(TestCase):
+    def setUp(self):
+        self.task = MagicMock()
+        self.task.action = "caribouhy.sir.sir_command"
+        self.task._role = None
+        self.play_context = MagicMock()
+        self.play_context.connection = "ansible.netcommon.network_cli"
+        self.loader = MagicMock()
+        self.loader.get_basedir.return_value = "/playbooks"
+        self.action = ActionModule(
+            task=self.task,
+            connection=MagicMock(),
+            play_context=self.play_context,
+            loader=self.loader,
+            templar=MagicMock(),
+            shared_loader_obj=None,
+        )
+
+        self.mock_run = patch(
+            "ansible_collections.ansible.netcommon.plugins.action.network.ActionModule.run",
+            return_value={},
+        )
+        self.mock_run.start()
+        self.addCleanup(self.mock_run.stop)
+
+    def test_sir_command_output_dir_relative(self):
+        self.task.args = {"commands": ["show ip route"], "output_dir": "output/router"}
+        self.action.run(task_vars={})
+        self.assertEqual(self.task.args["output_dir"], "/playbooks/output/router")
+
+    def test_sir_command_output_dir_absolute(self):
+        self.task.args = {"commands": ["show ip route"], "output_dir": "/tmp/output"}
+        self.action.run(task_vars={})
+        self.assertEqual(self.task.args["output_dir"], "/tmp/output")
@@ -0,0 +1,88 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from ansible_collections.caribouhy.sir.plugins.modules import sir_commit_confirm
+from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
+
+from .sir_module import TestSirModule, load_fixture
+
+
+class TestSirCommitConfirmModule(TestSirModule):
+    module = sir_commit_confirm
+
+    def setUp(self):
+        super(TestSirCommitConfirmModule, self).setUp()
+        self.mock_run_commands = patch(
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.wait.run_commands"
+        )
+        self.run_commands = self.mock_run_commands.start()
+        self.mock_confirm_commit = patch.object(sir_commit_confirm, "confirm_commit")
+        self.confirm_commit = self.mock_confirm_commit.start()
+        self.confirm_commit.return_value = 180.0
+
+    def tearDown(self):
+        super(TestSirCommitConfirmModule, self).tearDown()
+        self.mock_run_commands.stop()
+        self.mock_confirm_commit.stop()
+
+    def load_fixtures(self, commands=None):
+        def run_commands(module, commands, **kwargs):
+            return [load_fixture(str(item["command"]).replace(" ", "_")) for item in commands]
+
+        self.run_commands.side_effect = run_commands
+
+    def test_sir_commit_confirm(self):
+        set_module_args(dict())
+        result = self.execute_module(changed=True)
+        self.assertTrue(result["confirmed"])
+        self.assertEqual(result["remaining"], 180.0)
+        self.run_commands.assert_not_called()
+
+    def test_sir_commit_confirm_checks_pass(self):
+        set_module_args(
+            dict(
+                commands=["show system information"],
+                wait_for=['result[0] contains "System : Si-R"'],
+            )
+        )
+        result = self.execute_module(changed=True)
+        self.assertTrue(result["confirmed"])
+        self.assertTrue(result["stdout"][0].startswith("Current-time"))
+        self.confirm_commit.assert_called_once()
+
+    def test_sir_commit_confirm_checks_fail(self):
+        set_module_args(
+            dict(
+                commands=["show system information"],
+                wait_for=['result[0] contains "test string"'],
+                retries=2,
+            )
+        )
+        result = self.execute_module(failed=True)
+        self.assertEqual(result["failed_conditions"], ['result[0] contains "test string"'])
+        self.assertIn("rolled back", result["msg"])
+        self.assertEqual(self.run_commands.call_count, 3)
+        self.confirm_commit.assert_not_called()
+
+    def test_sir_commit_confirm_check_mode(self):
+        set_module_args(dict(_ansible_check_mode=True))
+        result = self.execute_module()
+        self.assertFalse(result["confirmed"])
+        self.confirm_commit.assert_not_called()
+
+    def test_sir_commit_confirm_check_mode_not_show(self):
+        set_module_args(
+            dict(commands=["ping 192.0.2.1", "show system information"], _ansible_check_mode=True)
+        )
+        result = self.execute_module(failed=True)
+        self.assertIn("ping 192.0.2.1", result["msg"])
+        self.run_commands.assert_not_called()
+        self.confirm_commit.assert_not_called()
@@ -21,9 +21,17 @@ from __future__ import absolute_import, division, print_function
 
 
 __metaclass__ = type
-from unittest.mock import MagicMock, patch
+import shutil
+import tempfile
 
-from ansible_collections.caribouhy.sir.plugins.cliconf.sir import Cliconf
+from unittest.mock import ANY, patch
+
+from ansible.module_utils.connection import ConnectionError
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir import sir
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.parsers import (
+    parse_system_information,
+)
 from ansible_collections.caribouhy.sir.plugins.modules import sir_config
 from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
 
@@ -41,14 +49,6 @@ class TestSirConfigModule(TestSirModule):
         )
         self.get_config = self.mock_get_config.start()
 
-        self.mock_get_connection = patch(
-            "ansible_collections.caribouhy.sir.plugins.modules.sir_config.get_connection",
-        )
-        self.get_connection = self.mock_get_connection.start()
-
-        self.conn = self.get_connection()
-        self.conn.edit_config = MagicMock()
-
         self.mock_run_commands = patch(
             "ansible_collections.caribouhy.sir.plugins.modules.sir_config.run_commands",
         )
@@ -59,36 +59,42 @@ class TestSirConfigModule(TestSirModule):
         )
         self.load_config = self.mock_load_config.start()
 
-        self.cliconf_obj = Cliconf(MagicMock())
+        self.mock_get_system_information = patch(
+            "ansible_collections.caribouhy.sir.plugins.modules.sir_config.get_system_information",
+        )
+        self.get_system_information = self.mock_get_system_information.start()
+
         self.running_config = load_fixture("sir_config_config.cfg")
 
     def tearDown(self):
         super(TestSirConfigModule, self).tearDown()
         self.mock_get_config.stop()
         self.mock_run_commands.stop()
-        self.mock_get_connection.stop()
         self.mock_load_config.stop()
+        self.mock_get_system_information.stop()
 
     def load_fixtures(self, commands=None):
         config_file = "sir_config_config.cfg"
         self.get_config.return_value = load_fixture(config_file)
-        self.get_connection.edit_config.return_value = None
 
     def test_sir_config_unchanged(self):
         src = load_fixture("sir_config_config.cfg")
-        self.conn.get_diff = MagicMock(return_value=self.cliconf_obj.get_diff(src, src))
         set_module_args(dict(src=src))
         self.execute_module()
 
     def test_sir_config_src(self):
         src = load_fixture("sir_config_src.cfg")
         set_module_args(dict(src=src))
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(src, self.running_config),
-        )
         commands = ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"]
         self.execute_module(changed=True, commands=commands)
 
+    def test_sir_config_scope_section(self):
+        src = load_fixture("sir_config_src.cfg")
+        set_module_args(dict(src=src, config_scope="section"))
+        commands = ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"]
+        self.execute_module(changed=True, commands=commands)
+        self.get_config.assert_called_once_with(ANY, flags=[], section="ether")
+
     def test_sir_config_commit_timer(self):
         src = load_fixture("sir_config_src.cfg")
         set_module_args(dict(src=src, commit_timer=40))
@@ -96,6 +102,13 @@ class TestSirConfigModule(TestSirModule):
         args = self.load_config.call_args[1]["commit_timer"]
         self.assertEqual(args, 40)
 
+    def test_sir_config_pipeline_size(self):
+        src = load_fixture("sir_config_src.cfg")
+        set_module_args(dict(src=src, pipeline_size=100))
+        self.execute_module(changed=True)
+        args = self.load_config.call_args[1]["pipeline_size"]
+        self.assertEqual(args, 100)
+
     def test_sir_config_backup(self):
         set_module_args(dict(backup=True))
         result = self.execute_module()
@@ -108,13 +121,23 @@ class TestSirConfigModule(TestSirModule):
         self.assertIn("__backup__", result)
         self.assertEqual(result["__backup__"].endswith("\neof"), True)
 
+    def test_sir_config_backup_dedup(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        backup_options = dict(dedup=True, compression="gzip", dir_path=path, device="router1")
+        set_module_args(dict(backup=True, backup_options=backup_options))
+        result = self.execute_module(changed=True)
+        self.assertNotIn("__backup__", result)
+        self.assertTrue(result["backup_path"].startswith(path))
+        self.assertTrue(result["backup_path"].endswith(result["backup_hash"] + ".gz"))
+
+        set_module_args(dict(backup=True, backup_options=backup_options))
+        self.execute_module(changed=False)
+
     def test_sir_config_save_changed_true(self):
         src = load_fixture("sir_config_src.cfg")
         set_module_args(dict(src=src, save_when="changed"))
         commands = ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"]
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(src, self.running_config),
-        )
         self.execute_module(changed=True, commands=commands)
         self.assertEqual(self.run_commands.call_count, 1)
         self.assertEqual(self.get_config.call_count, 1)
@@ -139,27 +162,219 @@ class TestSirConfigModule(TestSirModule):
         args = self.run_commands.call_args[1]["commands"]
         self.assertIn("save", args)
 
+    def set_system_information(self, *replacements):
+        data = load_fixture("show_system_information")
+        for old, new in replacements:
+            data = data.replace(old, new)
+        self.get_system_information.return_value = parse_system_information(data)
+
+    def save_check_args(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        return dict(
+            save_when="modified",
+            save_check="timestamp",
+            config_cache_options=dict(dir_path=path),
+        )
+
+    def test_sir_config_save_check_timestamp_unmodified(self):
+        # the running-config is the startup-config loaded at boot
+        self.set_system_information()
+        set_module_args(self.save_check_args())
+        self.execute_module(changed=False)
+        self.assertEqual(self.run_commands.call_count, 0)
+
+    def test_sir_config_save_check_timestamp_modified(self):
+        self.set_system_information(
+            ("Running-config : Sat Nov 16 18:22:19", "Running-config : Sat Nov 16 19:00:00")
+        )
+        set_module_args(self.save_check_args())
+        self.execute_module(changed=True)
+        self.assertEqual(self.run_commands.call_count, 1)
+        self.assertIn("save", self.run_commands.call_args[1]["commands"])
+
+    def test_sir_config_save_check_timestamp_ambiguous(self):
+        # the startup-config was written after the last change
+        self.set_system_information(("18:21:49 2024 config1", "19:00:00 2024 config1"))
+        self.run_commands.return_value = [self.running_config, self.running_config]
+        args = self.save_check_args()
+        set_module_args(args)
+        self.execute_module(changed=False)
+        self.run_commands.assert_called_once_with(
+            ANY, ["show running-config", "show startup-config"]
+        )
+
+        # the digest recorded by the full comparison is reused
+        self.run_commands.reset_mock()
+        set_module_args(args)
+        self.execute_module(changed=False)
+        self.assertEqual(self.run_commands.call_count, 0)
+
+    def test_sir_config_src_duplicates(self):
+        src = "ether 2 1 description foo\n  ether 2 1 description foo\n\nether 2 1 use off\n"
+        set_module_args(dict(src=src))
+        self.execute_module(changed=True, commands=["ether 2 1 description foo"])
+
+    def test_sir_config_in_sync_cached(self):
+        self.set_system_information()
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        args = dict(
+            lines=["ether 2 1 use off", "time zone 0900"],
+            config_cache=True,
+            config_cache_options=dict(dir_path=path),
+        )
+        set_module_args(args)
+        self.execute_module(changed=False)
+        self.assertEqual(self.get_config.call_count, 1)
+
+        # the candidate is known to be in the unchanged running-config
+        set_module_args(args)
+        self.execute_module(changed=False)
+        self.assertEqual(self.get_config.call_count, 1)
+
+        self.set_system_information(
+            ("Running-config : Sat Nov 16 18:22:19", "Running-config : Sat Nov 16 19:00:00")
+        )
+        set_module_args(args)
+        self.execute_module(changed=False)
+        self.assertEqual(self.get_config.call_count, 2)
+
+    def commit_chunks_args(self, **commit_chunks):
+        self.set_system_information()
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        lines = [
+            "ether 1 1 description foo",
+            "ether 3 1 use on",
+            "ether 4 1 use on",
+            "delete time auto",
+            "lan 0 mtu 1500",
+        ]
+        return dict(
+            lines=lines,
+            commit_chunks=commit_chunks,
+            config_cache_options=dict(dir_path=path),
+        )
+
+    def test_sir_config_split_chunks(self):
+        commands = ["ether 1 1 use on", "ether 2 1 use on", "delete ether 3", "lan 0 mtu 1500"]
+        self.assertEqual(sir_config.split_chunks(commands), [commands])
+        self.assertEqual(sir_config.split_chunks(commands, size=2), [commands[:2], commands[2:]])
+        self.assertEqual(
+            sir_config.split_chunks(commands, sections=True), [commands[:3], commands[3:]]
+        )
+        self.assertEqual(
+            sir_config.split_chunks(commands, size=2, sections=True),
+            [commands[:2], commands[2:3], commands[3:]],
+        )
+
+    def test_sir_config_commit_chunks(self):
+        set_module_args(self.commit_chunks_args(size=2, sections=True))
+        result = self.execute_module(changed=True)
+        chunks = [call[0][1] for call in self.load_config.call_args_list]
+        self.assertEqual(
+            chunks,
+            [
+                ["ether 1 1 description foo", "ether 3 1 use on"],
+                ["ether 4 1 use on"],
+                ["delete time auto"],
+                ["lan 0 mtu 1500"],
+            ],
+        )
+        self.assertEqual([chunk["lines"] for chunk in result["chunks"]], [2, 1, 1, 1])
+        self.assertEqual(result["resumed"], 0)
+
+    def test_sir_config_commit_chunks_resume(self):
+        args = self.commit_chunks_args(size=2)
+
+        def load_config(module, commands, **kwargs):
+            if "delete time auto" in commands:
+                module.fail_json(msg="commit failed")
+
+        self.load_config.side_effect = load_config
+        set_module_args(args)
+        self.execute_module(failed=True)
+        self.assertEqual(self.load_config.call_count, 2)
+
+        # the first chunk is not sent again
+        self.load_config.reset_mock()
+        self.load_config.side_effect = None
+        set_module_args(args)
+        result = self.execute_module(changed=True)
+        self.assertEqual(result["resumed"], 2)
+        chunks = [call[0][1] for call in self.load_config.call_args_list]
+        self.assertEqual(chunks, [["ether 4 1 use on", "delete time auto"], ["lan 0 mtu 1500"]])
+
+        # the checkpoint is removed once all chunks are committed
+        self.load_config.reset_mock()
+        set_module_args(args)
+        result = self.execute_module(changed=True)
+        self.assertEqual(result["resumed"], 0)
+        self.assertEqual(self.load_config.call_count, 3)
+
+    def test_sir_config_commit_chunks_resume_repeated_line(self):
+        args = self.commit_chunks_args(size=2)
+        args["after"] = ["ether 1 1 description foo"]
+
+        def load_config(module, commands, **kwargs):
+            if "lan 0 mtu 1500" in commands:
+                module.fail_json(msg="commit failed")
+
+        self.load_config.side_effect = load_config
+        set_module_args(args)
+        self.execute_module(failed=True)
+
+        # the line committed in the first chunk is sent again in the last one
+        self.load_config.reset_mock()
+        self.load_config.side_effect = None
+        set_module_args(args)
+        result = self.execute_module(changed=True)
+        self.assertEqual(result["resumed"], 4)
+        chunks = [call[0][1] for call in self.load_config.call_args_list]
+        self.assertEqual(chunks, [["lan 0 mtu 1500", "ether 1 1 description foo"]])
+
+    def test_sir_config_commit_chunks_resume_config_cache(self):
+        # load_config invalidates the config cache of the device before every chunk
+        self.mock_load_config.stop()
+        self.addCleanup(self.mock_load_config.start)
+        mock_get_connection = patch.object(sir, "get_connection")
+        connection = mock_get_connection.start()
+        self.addCleanup(mock_get_connection.stop)
+        self.addCleanup(sir._DEVICE_CONFIGS.clear)
+        connection.return_value.get_system_information.return_value = parse_system_information(
+            load_fixture("show_system_information")
+        )
+        edit_config = connection.return_value.edit_config
+        edit_config.side_effect = [{}, {}, ConnectionError("commit failed"), {}, {}, {}]
+
+        args = self.commit_chunks_args(size=1)
+        args["config_cache"] = True
+        set_module_args(args)
+        self.execute_module(failed=True)
+        self.assertEqual(edit_config.call_count, 3)
+
+        set_module_args(args)
+        result = self.execute_module(changed=True)
+        self.assertEqual(result["resumed"], 2)
+        chunks = [call[1]["candidate"] for call in edit_config.call_args_list[3:]]
+        self.assertEqual(chunks, [["ether 4 1 use on"], ["delete time auto"], ["lan 0 mtu 1500"]])
+
+    def test_sir_config_commit_chunks_commit_timer(self):
+        args = self.commit_chunks_args(size=2)
+        args["commit_timer"] = 5
+        set_module_args(args)
+        self.execute_module(failed=True)
+
     def test_sir_config_before(self):
         lines = ["ether 2 1 description foo"]
         set_module_args(dict(lines=lines, before=["test1", "test2"]))
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(
-                "\n".join(lines),
-                self.running_config,
-            ),
-        )
         commands = ["test1", "test2", "ether 2 1 description foo"]
         self.execute_module(changed=True, commands=commands, sort=False)
 
     def test_sir_config_after(self):
         lines = ["ether 2 1 description foo"]
         set_module_args(dict(lines=lines, after=["test1", "test2"]))
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(
-                "\n".join(lines),
-                self.running_config,
-            ),
-        )
         commands = ["ether 2 1 description foo", "test1", "test2"]
         self.execute_module(changed=True, commands=commands, sort=False)
 
@@ -168,34 +383,29 @@ class TestSirConfigModule(TestSirModule):
         set_module_args(
             dict(lines=lines, before=["test1", "test2"], after=["test3", "test4"]),
         )
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(
-                "\n".join(lines),
-                self.running_config,
-            ),
-        )
         self.execute_module()
 
     def test_sir_config_config(self):
         config = "ether 2 1 description foo"
         lines = ["ether 2 1 description bar"]
         set_module_args(dict(lines=lines, config=config))
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff("\n".join(lines), config),
-        )
         commands = ["ether 2 1 description bar"]
         self.execute_module(changed=True, commands=commands)
 
+    def test_sir_config_check_mode_local_diff(self):
+        config = "ether 2 1 description foo\nether 2 1 use off"
+        lines = ["ether 2 1 description bar", "ether 2 1 use off"]
+        set_module_args(dict(lines=lines, config=config, _ansible_check_mode=True))
+        with patch.object(sir, "get_connection") as get_connection:
+            result = self.execute_module(changed=True, commands=["ether 2 1 description bar"])
+        self.assertEqual(result["updates"], ["ether 2 1 description bar"])
+        self.assertEqual(get_connection.call_count, 0)
+        self.assertEqual(self.get_config.call_count, 0)
+        self.assertEqual(self.load_config.call_count, 0)
+
     def test_sir_config_match_none(self):
         lines = ["ether 2 1 description foo"]
         set_module_args(dict(lines=lines, match="none"))
-        self.conn.get_diff = MagicMock(
-            return_value=self.cliconf_obj.get_diff(
-                "\n".join(lines),
-                self.running_config,
-                diff_match="none",
-            ),
-        )
         self.execute_module(changed=True, commands=lines)
 
     def test_sir_config_src_and_lines_fails(self):
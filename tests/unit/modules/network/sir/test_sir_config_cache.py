@@ -0,0 +1,121 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir import sir
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.cache import ConfigCache
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.parsers import (
+    parse_system_information,
+)
+
+from .sir_module import load_fixture
+
+
+class TestSirConfigCache(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_get_same_timestamp(self):
+        cache = ConfigCache(self.path)
+        cache.set("12130566", "running-config", "Sat Nov 16 18:22:19 2024", "ether 1 1 use on")
+        value = cache.get("12130566", "running-config", "Sat Nov 16 18:22:19 2024")
+        self.assertEqual(value, "ether 1 1 use on")
+
+    def test_get_timestamp_changed(self):
+        cache = ConfigCache(self.path)
+        cache.set("12130566", "running-config", "Sat Nov 16 18:22:19 2024", "ether 1 1 use on")
+        value = cache.get("12130566", "running-config", "Sat Nov 16 19:00:00 2024")
+        self.assertIsNone(value)
+
+    def test_invalidate(self):
+        cache = ConfigCache(self.path)
+        cache.set("12130566", "running-config", "ts", "ether 1 1 use on")
+        cache.set("99999999", "running-config", "ts", "ether 1 1 use off")
+        cache.invalidate("12130566")
+        self.assertIsNone(cache.get("12130566", "running-config", "ts"))
+        self.assertEqual(cache.get("99999999", "running-config", "ts"), "ether 1 1 use off")
+
+    def test_invalidate_similar_device(self):
+        cache = ConfigCache(self.path)
+        cache.set("ABC", "running-config", "ts", "ether 1 1 use on")
+        cache.set("ABC_X", "running-config", "ts", "ether 1 1 use off")
+        cache.invalidate("ABC")
+        self.assertEqual(cache.get("ABC_X", "running-config", "ts"), "ether 1 1 use off")
+
+    def test_set_existing_dir(self):
+        cache = ConfigCache(os.path.join(self.path, "cache"))
+        os.makedirs(cache.path)
+        cache.set("12130566", "running-config", "ts", "ether 1 1 use on")
+        self.assertEqual(cache.get("12130566", "running-config", "ts"), "ether 1 1 use on")
+
+    def test_evict_max_size(self):
+        cache = ConfigCache(self.path, max_size=300)
+        for i in range(5):
+            cache.set("device%d" % i, "running-config", "ts", "x" * 100)
+            os.utime(cache._entry_path("device%d" % i, "running-config"), (i, i))
+        cache.evict()
+        self.assertEqual(len(os.listdir(self.path)), 1)
+        self.assertIsNotNone(cache.get("device4", "running-config", "ts"))
+
+    def test_evict_max_age(self):
+        cache = ConfigCache(self.path, max_age=60)
+        cache.set("12130566", "running-config", "ts", "ether 1 1 use on")
+        os.utime(cache._entry_path("12130566", "running-config"), (0, 0))
+        self.assertIsNone(cache.get("12130566", "running-config", "ts"))
+        cache.evict()
+        self.assertEqual(os.listdir(self.path), [])
+
+
+class TestSirGetConfigCache(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.addCleanup(sir._DEVICE_CONFIGS.clear)
+
+        self.module = MagicMock()
+        self.module.params = {
+            "config_cache": True,
+            "config_cache_options": {"dir_path": self.path, "max_age": 3600, "max_size": None},
+        }
+
+        self.mock_get_connection = patch.object(sir, "get_connection")
+        self.connection = self.mock_get_connection.start().return_value
+        self.connection.get_config.return_value = load_fixture("sir_config_config.cfg")
+        self.connection.get_system_information.return_value = parse_system_information(
+            load_fixture("show_system_information")
+        )
+        self.addCleanup(self.mock_get_connection.stop)
+
+    def test_get_config_uses_cache(self):
+        first = sir.get_config(self.module)
+        sir._DEVICE_CONFIGS.clear()
+        second = sir.get_config(self.module)
+        self.assertEqual(first, second)
+        self.assertEqual(self.connection.get_config.call_count, 1)
+
+    def test_get_config_timestamp_changed(self):
+        sir.get_config(self.module)
+        sir._DEVICE_CONFIGS.clear()
+        self.connection.get_system_information.return_value = parse_system_information(
+            load_fixture("show_system_information").replace("18:22:19", "18:30:00"),
+        )
+        sir.get_config(self.module)
+        self.assertEqual(self.connection.get_config.call_count, 2)
+
+    def test_get_config_cache_write_error(self):
+        with patch.object(ConfigCache, "set", side_effect=OSError("Permission denied")):
+            cfg = sir.get_config(self.module)
+        self.assertEqual(cfg, load_fixture("sir_config_config.cfg").strip())
+        self.assertEqual(self.module.warn.call_count, 1)
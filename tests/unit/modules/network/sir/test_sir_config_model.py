@@ -0,0 +1,79 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from unittest import TestCase
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.config import (
+    SirConfig,
+    config_diff,
+)
+
+from .sir_module import load_fixture
+
+
+class TestSirConfigModel(TestCase):
+    def setUp(self):
+        self.config = SirConfig(load_fixture("sir_config_config.cfg"))
+
+    def test_load(self):
+        self.assertEqual(len(self.config), 6)
+        self.assertIn("ether 2 1 use off", self.config)
+        self.assertNotIn("#", self.config.lines)
+
+    def test_sections(self):
+        self.assertEqual(self.config.sections, ["ether", "time"])
+        self.assertEqual(
+            self.config.section("time"),
+            ["time auto server 10.3.2.207 sntp", "time zone 0900"],
+        )
+
+    def test_get_keyword_path(self):
+        self.assertEqual(
+            self.config.get("ether 2 1"),
+            ["ether 2 1 description test_string", "ether 2 1 use off", "ether 2 1 vlan untag 2"],
+        )
+        self.assertEqual(self.config.get("ether 2 1 vlan"), ["ether 2 1 vlan untag 2"])
+        self.assertEqual(self.config.get("lan"), [])
+
+    def test_difference(self):
+        candidate = SirConfig(load_fixture("sir_config_src.cfg"))
+        self.assertEqual(
+            candidate.difference(self.config),
+            ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"],
+        )
+
+    def test_config_diff(self):
+        candidate = load_fixture("sir_config_src.cfg")
+        running = load_fixture("sir_config_config.cfg")
+        self.assertEqual(
+            config_diff(candidate, running),
+            ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"],
+        )
+        self.assertEqual(len(config_diff(candidate, running, diff_match="none")), 6)
+        self.assertEqual(len(config_diff(candidate)), 6)
+
+    def test_unique(self):
+        config = SirConfig("lan 0 mtu 1500\nlan 0 mtu 1500\n lan 0 mtu 1500", unique=True)
+        self.assertEqual(config.lines, ["lan 0 mtu 1500"])
+        config.add(["lan 0 mtu 1500", "lan 0 vlan 1"])
+        self.assertEqual(config.lines, ["lan 0 mtu 1500", "lan 0 vlan 1"])
+
+    def test_config_diff_parsed(self):
+        candidate = SirConfig(load_fixture("sir_config_src.cfg"))
+        self.assertEqual(
+            config_diff(candidate, self.config),
+            ["ether 1 1 description foo", "ether 2 1 vlan untag 3", "delete time auto"],
+        )
+
+    def test_ignore_lines(self):
+        config = SirConfig(load_fixture("sir_config_config.cfg"), ignore_lines=["time .*"])
+        self.assertEqual(config.sections, ["ether"])
+
+    def test_sha1(self):
+        other = SirConfig("\n".join(self.config.lines))
+        self.assertEqual(self.config.sha1, other.sha1)
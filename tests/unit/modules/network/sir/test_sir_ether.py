@@ -0,0 +1,139 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from ansible_collections.caribouhy.sir.plugins.modules import sir_ether
+from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
+
+from .sir_module import TestSirModule, load_fixture
+
+
+class TestSirEtherModule(TestSirModule):
+    module = sir_ether
+
+    def setUp(self):
+        super(TestSirEtherModule, self).setUp()
+        self.mock_get_config = patch(
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource.get_config"
+        )
+        self.get_config = self.mock_get_config.start()
+        self.mock_load_config = patch(
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource.load_config"
+        )
+        self.load_config = self.mock_load_config.start()
+
+    def tearDown(self):
+        super(TestSirEtherModule, self).tearDown()
+        self.mock_get_config.stop()
+        self.mock_load_config.stop()
+
+    def load_fixtures(self, commands=None):
+        config = load_fixture("sir_config_config.cfg")
+        self.get_config.return_value = "\n".join(
+            line for line in config.splitlines() if line.startswith("ether")
+        )
+
+    def test_sir_ether_merged(self):
+        set_module_args(dict(config=[dict(name="2 1", vlan_untag=3, description="test_string")]))
+        result = self.execute_module(changed=True, commands=["ether 2 1 vlan untag 3"])
+        self.assertEqual(self.get_config.call_args[1], {"section": "ether"})
+        self.assertEqual(self.load_config.call_args[0][1], ["ether 2 1 vlan untag 3"])
+        self.assertEqual(
+            result["after"][1],
+            {"name": "2 1", "description": "test_string", "enabled": False, "vlan_untag": 3},
+        )
+
+    def test_sir_ether_merged_idempotent(self):
+        set_module_args(dict(config=[dict(name="2 1", enabled=False, vlan_untag=2)]))
+        self.execute_module(commands=[])
+        self.load_config.assert_not_called()
+
+    def test_sir_ether_merged_new_port(self):
+        set_module_args(dict(config=[dict(name="3 1", enabled=True, vlan_tag="10,20")]))
+        self.execute_module(
+            changed=True, commands=["ether 3 1 use on", "ether 3 1 vlan tag 10,20"], sort=False
+        )
+
+    def test_sir_ether_replaced(self):
+        set_module_args(dict(config=[dict(name="2 1", vlan_untag=2)], state="replaced"))
+        self.execute_module(
+            changed=True,
+            commands=["delete ether 2 1 use", "delete ether 2 1 description"],
+        )
+
+    def test_sir_ether_overridden(self):
+        set_module_args(dict(config=[dict(name="2 1", vlan_untag=4)], state="overridden"))
+        self.execute_module(
+            changed=True,
+            commands=[
+                "delete ether 1 1 vlan untag",
+                "delete ether 2 1 use",
+                "delete ether 2 1 description",
+                "ether 2 1 vlan untag 4",
+            ],
+            sort=False,
+        )
+
+    def test_sir_ether_deleted(self):
+        set_module_args(dict(config=[dict(name="2 1"), dict(name="9 1")], state="deleted"))
+        self.execute_module(
+            changed=True,
+            commands=[
+                "delete ether 2 1 description",
+                "delete ether 2 1 use",
+                "delete ether 2 1 vlan untag",
+            ],
+            sort=False,
+        )
+
+    def test_sir_ether_deleted_all(self):
+        set_module_args(dict(state="deleted"))
+        self.execute_module(
+            changed=True,
+            commands=[
+                "delete ether 1 1 vlan untag",
+                "delete ether 2 1 description",
+                "delete ether 2 1 use",
+                "delete ether 2 1 vlan untag",
+            ],
+            sort=False,
+        )
+
+    def test_sir_ether_check_mode(self):
+        set_module_args(dict(config=[dict(name="2 1", vlan_untag=3)], _ansible_check_mode=True))
+        self.execute_module(changed=True, commands=["ether 2 1 vlan untag 3"])
+        self.load_config.assert_not_called()
+
+    def test_sir_ether_gathered(self):
+        set_module_args(dict(state="gathered"))
+        result = self.execute_module()
+        self.assertEqual(
+            result["gathered"],
+            [
+                {"name": "1 1", "vlan_untag": 1},
+                {"name": "2 1", "description": "test_string", "enabled": False, "vlan_untag": 2},
+            ],
+        )
+
+    def test_sir_ether_rendered(self):
+        set_module_args(
+            dict(config=[dict(name="1 1", mode="auto", enabled=True)], state="rendered")
+        )
+        result = self.execute_module()
+        self.assertEqual(result["rendered"], ["ether 1 1 use on", "ether 1 1 mode auto"])
+        self.get_config.assert_not_called()
+
+    def test_sir_ether_parsed(self):
+        set_module_args(
+            dict(running_config="ether 1 1 mdi auto\nether 1 1 use off", state="parsed")
+        )
+        result = self.execute_module()
+        self.assertEqual(result["parsed"], [{"name": "1 1", "mdi": "auto", "enabled": False}])
+        self.get_config.assert_not_called()
@@ -0,0 +1,125 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.parsers import (
+    parse_interface_status,
+    parse_ip_route,
+    parse_system_information,
+)
+from ansible_collections.caribouhy.sir.plugins.modules import sir_facts
+from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
+
+from .sir_module import TestSirModule, load_fixture
+
+
+class TestSirFactsModule(TestSirModule):
+    module = sir_facts
+
+    def setUp(self):
+        super(TestSirFactsModule, self).setUp()
+        self.mock_get_capabilities = patch.object(sir_facts, "get_capabilities")
+        self.get_capabilities = self.mock_get_capabilities.start()
+        self.get_capabilities.return_value = {
+            "network_api": "cliconf",
+            "device_info": {
+                "network_os": "sir",
+                "network_os_hostname": "router",
+                "network_os_model": "Si-R G120",
+                "network_os_version": "20.54",
+            },
+        }
+        self.mock_get_system_information = patch.object(sir_facts, "get_system_information")
+        self.get_system_information = self.mock_get_system_information.start()
+        self.get_system_information.return_value = parse_system_information(
+            load_fixture("show_system_information")
+        )
+        self.mock_get_config = patch.object(sir_facts, "get_config")
+        self.get_config = self.mock_get_config.start()
+        self.get_config.return_value = load_fixture("sir_config_config.cfg")
+        self.mock_run_commands = patch.object(sir_facts, "run_commands")
+        self.run_commands = self.mock_run_commands.start()
+
+    def tearDown(self):
+        super(TestSirFactsModule, self).tearDown()
+        self.mock_get_capabilities.stop()
+        self.mock_get_system_information.stop()
+        self.mock_get_config.stop()
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+        parsed = {
+            "show interface": parse_interface_status(load_fixture("show_interface")),
+            "show ip route": parse_ip_route(load_fixture("show_ip_route")),
+        }
+
+        def run_commands(module, commands, **kwargs):
+            return [parsed[cmd["command"]] for cmd in commands]
+
+        self.run_commands.side_effect = run_commands
+
+    def test_sir_facts_default(self):
+        set_module_args(dict())
+        result = self.execute_module()
+        facts = result["ansible_facts"]
+        self.assertEqual(facts["ansible_net_gather_subset"], ["default"])
+        self.assertEqual(facts["ansible_net_hostname"], "router")
+        self.assertEqual(facts["ansible_net_model"], "Si-R G120")
+        self.assertEqual(facts["ansible_net_version"], "20.54")
+        self.assertNotIn("ansible_net_config", facts)
+        self.run_commands.assert_not_called()
+        self.get_system_information.assert_not_called()
+        self.get_config.assert_not_called()
+
+    def test_sir_facts_hardware(self):
+        set_module_args(dict(gather_subset=["hardware"]))
+        facts = self.execute_module()["ansible_facts"]
+        self.assertEqual(facts["ansible_net_serialnum"], "12130566")
+        self.assertEqual(facts["ansible_net_image"], "firmware2")
+        self.assertEqual(facts["ansible_net_memtotal_mb"], 320)
+        self.assertEqual(
+            facts["ansible_net_firmware"],
+            {
+                "firmware1": "V20.14 NY0067 Thu Dec 16 18:14:38 JST 2021",
+                "firmware2": "V20.54 NY0115 Wed Nov 15 12:38:13 JST 2023",
+            },
+        )
+        self.run_commands.assert_not_called()
+
+    def test_sir_facts_interfaces_and_routing(self):
+        set_module_args(dict(gather_subset=["interfaces", "routing"]))
+        facts = self.execute_module()["ansible_facts"]
+        self.assertEqual(facts["ansible_net_interfaces"]["lan1"]["status"], "down")
+        self.assertEqual(facts["ansible_net_all_ipv4_addresses"], ["192.168.1.1/24", "10.0.0.1/24"])
+        self.assertEqual(facts["ansible_net_all_ipv6_addresses"], ["fe80::6a84:7eff:febd:caf7/64"])
+        self.assertEqual(len(facts["ansible_net_routes"]), 6)
+        self.assertEqual(self.run_commands.call_count, 1)
+        self.assertTrue(self.run_commands.call_args[1]["batch"])
+        self.get_config.assert_not_called()
+
+    def test_sir_facts_all_but_config(self):
+        set_module_args(dict(gather_subset=["all", "!config"]))
+        facts = self.execute_module()["ansible_facts"]
+        self.assertEqual(
+            facts["ansible_net_gather_subset"],
+            ["default", "hardware", "interfaces", "routing"],
+        )
+        self.get_config.assert_not_called()
+
+    def test_sir_facts_config(self):
+        set_module_args(dict(gather_subset=["config"]))
+        facts = self.execute_module()["ansible_facts"]
+        self.assertIn("ether 2 1 use off", facts["ansible_net_config"])
+        self.run_commands.assert_not_called()
+
+    def test_sir_facts_invalid_subset(self):
+        set_module_args(dict(gather_subset=["foo"]))
+        result = self.execute_module(failed=True)
+        self.assertIn("Subset must be one of", result["msg"])
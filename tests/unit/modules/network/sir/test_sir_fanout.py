@@ -0,0 +1,143 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ansible.module_utils.connection import ConnectionError
+from ansible.parsing.dataloader import DataLoader
+from ansible.playbook.play_context import PlayContext
+from ansible.playbook.task import Task
+from ansible.plugins.connection.ssh import Connection as SshConnection
+from ansible.template import Templar
+
+from ansible_collections.caribouhy.sir.plugins.action.sir_fanout import ActionModule
+from ansible_collections.caribouhy.sir.plugins.plugin_utils import connection
+
+from .sir_module import load_fixture
+
+
+class TestSirFanoutAction(TestCase):
+    def setUp(self):
+        self.task = MagicMock()
+        self.task.async_val = 0
+        self.task.check_mode = False
+        self.task.diff = False
+        self.action = ActionModule(
+            task=self.task,
+            connection=MagicMock(),
+            play_context=MagicMock(),
+            loader=MagicMock(),
+            templar=MagicMock(),
+            shared_loader_obj=None,
+        )
+        self.task_vars = {
+            "ansible_play_batch": ["router1", "router2"],
+            "hostvars": {"router1": {}, "router2": {}},
+        }
+
+        self.mock_open_connection = patch(
+            "ansible_collections.caribouhy.sir.plugins.action.sir_fanout.open_connection",
+        )
+        self.open_connection = self.mock_open_connection.start()
+        self.addCleanup(self.mock_open_connection.stop)
+
+        self.connection = MagicMock()
+        self.connection.run_commands.return_value = [load_fixture("show_system_information")]
+        self.open_connection.return_value = (self.connection, "/tmp/socket")
+
+    def test_sir_fanout(self):
+        self.task.args = {"commands": ["show system information"]}
+        result = self.action.run(task_vars=self.task_vars)
+        self.assertEqual(sorted(result["results"]), ["router1", "router2"])
+        self.assertEqual(result["failed_hosts"], {})
+        self.assertTrue(result["results"]["router1"]["stdout"][0].startswith("Current-time : "))
+        self.assertEqual(self.open_connection.call_count, 2)
+
+    def test_sir_fanout_host_error(self):
+        self.task.args = {"commands": ["show system information"], "timeout": 10}
+
+        def open_connection(action, host, host_vars, options):
+            if host == "router2":
+                raise ConnectionError("unable to connect")
+            return self.connection, "/tmp/socket"
+
+        self.open_connection.side_effect = open_connection
+        result = self.action.run(task_vars=self.task_vars)
+        self.assertEqual(list(result["results"]), ["router1"])
+        self.assertEqual(result["failed_hosts"], {"router2": "unable to connect"})
+        self.assertNotIn("failed", result)
+        self.assertEqual(self.open_connection.call_args[0][3], {"persistent_command_timeout": 10})
+
+    def test_sir_fanout_fail_on_host_error(self):
+        self.task.args = {
+            "commands": ["show system information"],
+            "hosts": ["router1"],
+            "fail_on_host_error": True,
+        }
+        self.connection.run_commands.side_effect = ConnectionError("timeout")
+        result = self.action.run(task_vars=self.task_vars)
+        self.assertTrue(result["failed"])
+        self.assertEqual(result["failed_hosts"], {"router1": "timeout"})
+
+
+class TestSirOpenConnection(TestCase):
+    def setUp(self):
+        self.action = MagicMock()
+        self.action._loader = DataLoader()
+        self.action._play_context = PlayContext()
+        self.action._task = Task()
+
+        self.mock_start_connection = patch.object(connection, "start_connection")
+        self.start_connection = self.mock_start_connection.start()
+        self.addCleanup(self.mock_start_connection.stop)
+        self.mock_connection_loader = patch.object(connection, "connection_loader")
+        self.connection_loader = self.mock_connection_loader.start()
+        self.addCleanup(self.mock_connection_loader.stop)
+        self.mock_set_attributes = patch.object(PlayContext, "set_attributes_from_plugin")
+        self.mock_set_attributes.start()
+        self.addCleanup(self.mock_set_attributes.stop)
+
+    def socket_key(self, play_context):
+        """The control path the persistent socket path is derived from"""
+        return SshConnection._create_control_path(
+            play_context.remote_addr,
+            play_context.port,
+            play_context.remote_user,
+            play_context.connection,
+            1234,
+        )
+
+    def task_play_context(self, host_vars):
+        """The play context of a task of the host as built by the task executor"""
+        templar = Templar(loader=self.action._loader, variables=host_vars)
+        play_context = PlayContext().set_task_and_variable_override(
+            task=Task(), variables=host_vars, templar=templar
+        )
+        play_context.connection = host_vars["ansible_connection"]
+        return play_context
+
+    def test_open_connection_shares_task_socket(self):
+        host_vars = {
+            "ansible_connection": "network_cli",
+            "ansible_host": "192.0.2.1",
+            "ansible_user": "admin",
+        }
+        connection.open_connection(self.action, "router1", host_vars)
+        play_context = self.start_connection.call_args[0][0]
+        self.assertEqual(play_context.connection, "network_cli")
+        self.assertEqual(
+            self.socket_key(play_context), self.socket_key(self.task_play_context(host_vars))
+        )
+        self.assertEqual(self.connection_loader.get.call_args[0][0], "network_cli")
+
+    def test_open_connection_not_network_cli(self):
+        connection.open_connection(self.action, "router1", {"ansible_connection": "local"})
+        play_context = self.start_connection.call_args[0][0]
+        self.assertEqual(play_context.connection, "ansible.netcommon.network_cli")
+        self.assertEqual(play_context.remote_addr, "router1")
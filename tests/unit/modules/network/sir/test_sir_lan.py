@@ -0,0 +1,118 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from ansible_collections.caribouhy.sir.plugins.modules import sir_lan
+from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
+
+from .sir_module import TestSirModule, load_fixture
+
+
+class TestSirLanModule(TestSirModule):
+    module = sir_lan
+
+    def setUp(self):
+        super(TestSirLanModule, self).setUp()
+        self.mock_get_config = patch(
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource.get_config"
+        )
+        self.get_config = self.mock_get_config.start()
+        self.mock_load_config = patch(
+            "ansible_collections.caribouhy.sir.plugins.module_utils.network.sir.resource.load_config"
+        )
+        self.load_config = self.mock_load_config.start()
+
+    def tearDown(self):
+        super(TestSirLanModule, self).tearDown()
+        self.mock_get_config.stop()
+        self.mock_load_config.stop()
+
+    def load_fixtures(self, commands=None):
+        self.get_config.return_value = load_fixture("sir_lan_config.cfg")
+
+    def test_sir_lan_merged_address(self):
+        set_module_args(dict(config=[dict(name="0", ip_address="192.168.2.1/24")]))
+        self.execute_module(changed=True, commands=["lan 0 ip address 192.168.2.1/24 3"])
+
+    def test_sir_lan_merged_idempotent(self):
+        set_module_args(dict(config=[dict(name="1", description="wan", mtu=1454, vlan=2)]))
+        self.execute_module(commands=[])
+
+    def test_sir_lan_replaced_keeps_unmanaged_lines(self):
+        set_module_args(
+            dict(config=[dict(name="0", ip_address="192.168.1.1/24", vlan=1)], state="replaced")
+        )
+        self.execute_module(commands=[])
+
+    def test_sir_lan_replaced_keeps_broadcast(self):
+        set_module_args(
+            dict(config=[dict(name="0", ip_address="192.168.2.1/24", vlan=1)], state="replaced")
+        )
+        result = self.execute_module(changed=True, commands=["lan 0 ip address 192.168.2.1/24 3"])
+        self.assertEqual(result["after"][0]["ip_broadcast"], 3)
+
+    def test_sir_lan_replaced(self):
+        set_module_args(
+            dict(
+                config=[dict(name="1", ip_address="203.0.113.1/24", ip_broadcast=3, vlan=3)],
+                state="replaced",
+            )
+        )
+        self.execute_module(
+            changed=True,
+            commands=["delete lan 1 mtu", "delete lan 1 description", "lan 1 vlan 3"],
+            sort=False,
+        )
+
+    def test_sir_lan_overridden(self):
+        set_module_args(
+            dict(
+                config=[dict(name="0", ip_address="192.168.1.1/24", ip_broadcast=3, vlan=1)],
+                state="overridden",
+            )
+        )
+        self.execute_module(
+            changed=True,
+            commands=[
+                "delete lan 1 description",
+                "delete lan 1 ip address",
+                "delete lan 1 vlan",
+                "delete lan 1 mtu",
+            ],
+            sort=False,
+        )
+
+    def test_sir_lan_deleted(self):
+        set_module_args(dict(config=[dict(name="1")], state="deleted"))
+        result = self.execute_module(
+            changed=True,
+            commands=[
+                "delete lan 1 description",
+                "delete lan 1 ip address",
+                "delete lan 1 vlan",
+                "delete lan 1 mtu",
+            ],
+        )
+        self.assertEqual([item["name"] for item in result["after"]], ["0"])
+
+    def test_sir_lan_deleted_keeps_unmanaged_lines(self):
+        set_module_args(dict(config=[dict(name="0")], state="deleted"))
+        self.execute_module(
+            changed=True, commands=["delete lan 0 ip address", "delete lan 0 vlan"], sort=False
+        )
+
+    def test_sir_lan_gathered(self):
+        set_module_args(dict(state="gathered"))
+        result = self.execute_module()
+        self.assertEqual(
+            result["gathered"][0],
+            {"name": "0", "ip_address": "192.168.1.1/24", "ip_broadcast": 3, "vlan": 1},
+        )
+        self.assertEqual(result["gathered"][1]["mtu"], 1454)
@@ -0,0 +1,182 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from textwrap import dedent
+from unittest import TestCase
+
+from ansible_collections.caribouhy.sir.plugins.module_utils.network.sir import parsers
+
+from .sir_module import load_fixture
+
+
+PING_OUTPUT = dedent(
+    """\
+    PING 8.8.8.8: 46 data bytes.
+    54 bytes from 8.8.8.8: icmp_seq=0 ttl=60 time=5.549 ms
+    54 bytes from 8.8.8.8: icmp_seq=1 ttl=60 time=4.814 ms
+
+    ----8.8.8.8 PING Statistics----
+    2 packets transmitted, 2 packets received, 0% packet loss
+    round-trip (ms)  min/ave/max = 4.814/5.181/5.549
+    """
+)
+
+
+class TestSirParsers(TestCase):
+    def test_parse_system_information(self):
+        info = parsers.parse_system_information(load_fixture("show_system_information"))
+        self.assertEqual(info["System"], "Si-R G120")
+        self.assertEqual(info["Startup-config"], "Sat Nov 16 18:21:49 2024 config1")
+        self.assertEqual(info["USB"], "------")
+        self.assertEqual(len(info), 14)
+
+    def test_parse_system_information_crlf(self):
+        data = load_fixture("show_system_information").replace("\n", "\r\n")
+        info = parsers.parse_system_information(data)
+        self.assertEqual(info["Memory"], "320MB")
+
+    def test_parse_firmware_version_and_model(self):
+        data = load_fixture("show_system_information")
+        self.assertEqual(parsers.parse_firmware_version(data), "20.54")
+        self.assertEqual(parsers.parse_model(data), "Si-R G120")
+        self.assertIsNone(parsers.parse_model(""))
+
+    def test_parse_ping(self):
+        self.assertEqual(
+            parsers.parse_ping(PING_OUTPUT, 2),
+            {
+                "packet_loss": "0%",
+                "packets_rx": 2,
+                "packets_tx": 2,
+                "rtt": {"min": 4, "avg": 5, "max": 5},
+            },
+        )
+
+    def test_parse_ping_unreachable(self):
+        output = "2 packets transmitted, 0 packets received, 100% packet loss\n"
+        self.assertEqual(
+            parsers.parse_ping(output),
+            {"packet_loss": "100%", "packets_rx": 0, "packets_tx": 2},
+        )
+
+    def test_parse_ping_no_statistics(self):
+        with self.assertRaises(ValueError):
+            parsers.parse_ping("% Unknown host", 2)
+        with self.assertRaises(ValueError):
+            parsers.parse_ping(PING_OUTPUT, 5)
+
+    def test_parse_interface_status(self):
+        interfaces = parsers.parse_interface_status(load_fixture("show_interface"))
+        self.assertEqual(sorted(interfaces), ["lan0", "lan1", "rmt0"])
+        self.assertEqual(
+            interfaces["lan0"],
+            {
+                "name": "lan0",
+                "status": "up",
+                "mtu": 1500,
+                "addresses": ["192.168.1.1/24", "fe80::6a84:7eff:febd:caf7/64"],
+            },
+        )
+        self.assertEqual(interfaces["lan1"]["status"], "down")
+        self.assertNotIn("addresses", interfaces["rmt0"])
+
+    def test_parse_ip_route(self):
+        routes = parsers.parse_ip_route(load_fixture("show_ip_route"))
+        self.assertEqual(len(routes), 6)
+        self.assertEqual(
+            routes[4],
+            {
+                "destination": "192.168.2.0/24",
+                "gateway": "192.168.1.254",
+                "interface": "lan0",
+                "metric": 2,
+                "type": "remote",
+                "protocol": "rip",
+            },
+        )
+
+    def test_parse_arp(self):
+        entries = parsers.parse_arp(load_fixture("show_arp"))
+        self.assertEqual(
+            [e["address"] for e in entries], ["192.168.1.10", "192.168.1.20", "203.0.113.254"]
+        )
+        self.assertEqual(
+            entries[1],
+            {
+                "address": "192.168.1.20",
+                "mac": "00:00:0e:65:43:21",
+                "interface": "lan0",
+                "type": "static",
+                "expire": "-",
+            },
+        )
+        self.assertEqual(
+            parsers.parse_arp("192.0.2.1  00:00:5e:00:53:01  lan0"),
+            [{"address": "192.0.2.1", "mac": "00:00:5e:00:53:01", "interface": "lan0"}],
+        )
+
+    def test_parse_ether(self):
+        ports = parsers.parse_ether(load_fixture("show_ether"))
+        self.assertEqual([p["port"] for p in ports], [1, 2, 3])
+        self.assertEqual(
+            ports[0],
+            {
+                "port": 1,
+                "status": "up",
+                "speed": "1000M",
+                "duplex": "full",
+                "media": "Metal",
+                "flow_control": "send off, receive on",
+                "type": "Normal",
+                "member_of_lan": "lan0(untagged)",
+            },
+        )
+        self.assertEqual(ports[1]["status"], "down")
+        self.assertNotIn("speed", ports[1])
+        self.assertEqual(ports[2]["status"], "disable")
+
+    def test_parse_ipsec_sa(self):
+        sas = parsers.parse_ipsec_sa(load_fixture("show_ipsec_sa"))
+        self.assertEqual(len(sas), 3)
+        self.assertEqual(sas[0]["remote"], 1)
+        self.assertEqual(sas[0]["ap"], 0)
+        self.assertEqual(sas[0]["interface"], "rmt0")
+        self.assertEqual(sas[0]["spi"], "0x1a2b3c4d")
+        self.assertEqual(sas[1]["direction"], "outbound")
+        self.assertEqual(sas[2]["status"], "negotiating")
+        self.assertNotIn("spi", sas[2])
+
+    def test_parse_empty(self):
+        for parser in (
+            parsers.parse_ip_route,
+            parsers.parse_arp,
+            parsers.parse_ether,
+            parsers.parse_ipsec_sa,
+        ):
+            self.assertEqual(parser(""), [])
+            self.assertEqual(parser("<ERROR> Invalid command"), [])
+
+    def test_parse_output(self):
+        data = load_fixture("show_system_information")
+        self.assertEqual(
+            parsers.parse_output("show  system information", data)["System"], "Si-R G120"
+        )
+        self.assertEqual(
+            parsers.parse_output("ping 8.8.8.8 repeat 2", PING_OUTPUT)["packets_rx"], 2
+        )
+        self.assertIsNone(parsers.parse_output("ping 10.0.0.1", "% Unknown host"))
+        self.assertEqual(parsers.parse_output("show ip route", ""), [])
+        self.assertIsNone(parsers.parse_output("show running-config", ""))
+
+    def test_get_parser(self):
+        self.assertIs(parsers.get_parser("show  ether"), parsers.parse_ether)
+        self.assertIs(parsers.get_parser("ping 8.8.8.8 repeat 2"), parsers.parse_ping)
+        self.assertIsNone(parsers.get_parser("show ether statistics"))
+        self.assertIsNone(parsers.get_parser("show ip route summary"))
+        self.assertIsNone(parsers.get_parser("show arping"))
+        self.assertIsNone(parsers.get_parser("pingx 8.8.8.8"))
@@ -7,7 +7,7 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 from textwrap import dedent
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from ansible_collections.caribouhy.sir.plugins.modules import sir_ping
 from ansible_collections.caribouhy.sir.tests.unit.modules.utils import set_module_args
@@ -181,3 +181,76 @@ class TestSirPingModule(TestSirModule):
             "failed": True,
         }
         self.assertEqual(result, mock_res)
+
+    def ping_output(self, dest, rx, rtt="4.814/5.181/5.549"):
+        output = dedent(
+            """\
+            PING {0}: 46 data bytes.
+
+            ----{0} PING Statistics----
+            2 packets transmitted, {1} packets received, {2}% packet loss
+            """
+        ).format(dest, rx, 100 - rx * 50)
+        if rx:
+            output += "round-trip (ms)  min/ave/max = %s\n" % rtt
+        return output
+
+    def test_sir_ping_dests(self):
+        self.execute_show_command.return_value = [
+            self.ping_output("198.51.100.1", 2),
+            self.ping_output("198.51.100.2", 1, rtt="10.000/12.000/14.000"),
+        ]
+        set_module_args(dict(count=2, dests=["198.51.100.1", "198.51.100.2"]))
+        result = self.execute_module()
+        self.assertEqual(
+            result["commands"], ["ping 198.51.100.1 repeat 2", "ping 198.51.100.2 repeat 2"]
+        )
+        self.execute_show_command.assert_called_once_with(
+            ANY, commands=result["commands"], check_rc=False
+        )
+        self.assertEqual(result["results"][1]["packet_loss"], "50%")
+        self.assertEqual(result["results"][1]["dest"], "198.51.100.2")
+        self.assertEqual(
+            result["summary"],
+            {
+                "destinations": 2,
+                "reachable": 2,
+                "unreachable": [],
+                "packets_tx": 4,
+                "packets_rx": 3,
+                "packet_loss": "25%",
+                "rtt": {"min": 4, "avg": 7, "max": 14},
+            },
+        )
+
+    def test_sir_ping_dests_unreachable(self):
+        self.execute_show_command.return_value = [
+            self.ping_output("198.51.100.1", 2),
+            self.ping_output("198.51.100.2", 0),
+            "<ERROR> unknown host",
+        ]
+        set_module_args(dict(count=2, dests=["198.51.100.1", "198.51.100.2", "unknown"]))
+        result = self.execute_module(failed=True)
+        self.assertEqual(result["summary"]["unreachable"], ["198.51.100.2", "unknown"])
+        self.assertEqual(result["results"][2]["msg"], "<ERROR> unknown host")
+        self.assertEqual(result["msg"], "Ping failed unexpectedly to 198.51.100.2, unknown")
+
+    def test_sir_ping_dests_not_run_absent(self):
+        self.execute_show_command.return_value = [
+            self.ping_output("198.51.100.1", 0),
+            "<ERROR> unknown host",
+        ]
+        set_module_args(dict(count=2, dests=["198.51.100.1", "unknown"], state="absent"))
+        result = self.execute_module(failed=True)
+        self.assertEqual(result["msg"], "Ping could not be run to unknown")
+
+    def test_sir_ping_no_statistics(self):
+        self.execute_show_command.return_value = "<ERROR> unknown host"
+        set_module_args(dict(count=2, dest="unknown", state="absent"))
+        result = self.execute_module(failed=True)
+        self.assertEqual(result["msg"], "<ERROR> unknown host")
+        self.assertEqual(result["commands"], "ping unknown repeat 2")
+
+    def test_sir_ping_dest_and_dests(self):
+        set_module_args(dict(dest="198.51.100.1", dests=["198.51.100.2"]))
+        self.execute_module(failed=True)
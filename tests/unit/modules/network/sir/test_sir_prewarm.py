@@ -0,0 +1,64 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.caribouhy.sir.plugins.action.sir_prewarm import ActionModule
+
+
+class TestSirPrewarmAction(TestCase):
+    def setUp(self):
+        self.task = MagicMock()
+        self.task.async_val = 0
+        self.task.check_mode = False
+        self.task.diff = False
+        self.action = ActionModule(
+            task=self.task,
+            connection=MagicMock(),
+            play_context=MagicMock(),
+            loader=MagicMock(),
+            templar=MagicMock(),
+            shared_loader_obj=None,
+        )
+        self.task_vars = {
+            "ansible_play_batch": ["router1", "router2"],
+            "hostvars": {"router1": {}, "router2": {}},
+        }
+
+        self.mock_open_connection = patch(
+            "ansible_collections.caribouhy.sir.plugins.action.sir_prewarm.open_connection",
+        )
+        self.open_connection = self.mock_open_connection.start()
+        self.addCleanup(self.mock_open_connection.stop)
+
+        self.connection = MagicMock()
+        self.connection.prewarm.side_effect = lambda device_info: {
+            "reused": False,
+            "handshake": 1.0,
+        }
+        self.open_connection.return_value = (self.connection, "/tmp/socket")
+
+    def test_sir_prewarm(self):
+        self.task.args = {"timeout": 600, "device_info": False}
+        result = self.action.run(task_vars=self.task_vars)
+        self.assertEqual(sorted(result["results"]), ["router1", "router2"])
+        self.assertEqual(result["failed_hosts"], {})
+        self.assertFalse(result["changed"])
+        self.assertFalse(result["results"]["router1"]["reused"])
+        self.assertIn("socket", result["results"]["router1"])
+        self.assertIn("elapsed", result["results"]["router1"])
+        self.connection.prewarm.assert_called_with(device_info=False)
+        self.assertEqual(self.open_connection.call_args[0][3], {"persistent_connect_timeout": 600})
+
+    def test_sir_prewarm_device_info(self):
+        self.task.args = {}
+        result = self.action.run(task_vars=self.task_vars)
+        self.assertEqual(result["failed_hosts"], {})
+        self.connection.prewarm.assert_called_with(device_info=True)
+        self.assertIsNone(self.open_connection.call_args[0][3])
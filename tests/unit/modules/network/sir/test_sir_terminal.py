@@ -0,0 +1,114 @@
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+import re
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from ansible.errors import AnsibleConnectionFailure
+
+from ansible_collections.caribouhy.sir.plugins.plugin_utils.prompt import IncrementalRegex
+from ansible_collections.caribouhy.sir.plugins.terminal.sir import TerminalModule
+
+
+PROMPT = rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\(config\))?(?:[>#]) $"
+
+
+def receive(regex, data, chunk_size=4096):
+    """Search regex in the growing buffer after every chunk like network_cli"""
+    resp = b""
+    matches = []
+    for start in range(0, len(data), chunk_size):
+        resp += data[start : start + chunk_size]
+        match = regex.search(resp)
+        matches.append(match.group() if match else None)
+    return matches
+
+
+class TestSirIncrementalRegex(TestCase):
+    def setUp(self):
+        self.output = b"\r\n".join(b"ether %d 1 vlan untag %d" % (i, i) for i in range(5000))
+
+    def test_prompt_same_as_regex(self):
+        data = b"show running-config\r\n" + self.output + b"\r\nrouter# "
+        expected = receive(re.compile(PROMPT), data)
+        self.assertEqual(receive(IncrementalRegex(PROMPT, anchored=True), data), expected)
+        self.assertEqual(expected[-1], b"\nrouter# ")
+        self.assertEqual(expected.count(None), len(expected) - 1)
+
+    def test_prompt_config_mode(self):
+        regex = IncrementalRegex(PROMPT, anchored=True, threshold=0)
+        match = regex.search(self.output + b"\r\nrouter(config)# ")
+        self.assertEqual(match.group(), b"\nrouter(config)# ")
+
+    def test_prompt_longer_than_window(self):
+        regex = IncrementalRegex(PROMPT, anchored=True, threshold=0, window=8)
+        match = regex.search(self.output + b"\r\nlong-hostname# ")
+        self.assertEqual(match.group(), b"\nlong-hostname# ")
+
+    def test_error_in_first_chunk(self):
+        data = b"<ERROR> invalid command\r\n" + self.output + b"\r\nrouter# "
+        matches = receive(IncrementalRegex(rb"<ERROR> "), data)
+        self.assertTrue(all(matches))
+
+    def test_error_across_chunks(self):
+        data = self.output + b"\r\n<ERROR> invalid command\r\nrouter# "
+        chunk_size = len(self.output) + 5
+        regex = IncrementalRegex(rb"<ERROR> ")
+        self.assertEqual(receive(regex, data, chunk_size), [None, b"<ERROR> "])
+
+    def test_error_new_buffer(self):
+        regex = IncrementalRegex(rb"<ERROR> ")
+        self.assertIsNone(regex.search(self.output + b"\r\nrouter# "))
+        match = regex.search(b"<ERROR> invalid command\r\n" + self.output + b"\r\nrouter# ")
+        self.assertIsNotNone(match)
+
+    def test_terminal_module(self):
+        self.assertEqual(TerminalModule.terminal_stdout_re[0].pattern, PROMPT)
+        self.assertTrue(TerminalModule.terminal_stdout_re[0].anchored)
+        self.assertFalse(TerminalModule.terminal_stderr_re[0].anchored)
+
+
+class TestSirTerminalSetup(TestCase):
+    def setUp(self):
+        self.connection = MagicMock()
+        self.connection.get_prompt.return_value = b"\r\nrouter# "
+        self.terminal = TerminalModule(self.connection)
+
+    def set_response(self, error=False):
+        self.connection.receive.return_value = (
+            b"terminal timestamp disable\r\n"
+            + (b"<ERROR> Invalid command\r\n" if error else b"")
+            + b"router# terminal pager disable\r\n"
+            + b"router# terminal window column 512\r\n"
+            + b"router# "
+        )
+
+    def test_on_open_shell_single_write(self):
+        self.set_response()
+        self.terminal.on_open_shell()
+        self.connection.send.assert_called_once_with(
+            command=b"terminal timestamp disable\rterminal pager disable\rterminal window column 512",
+            sendonly=True,
+        )
+        self.assertEqual(self.connection.receive.call_count, 1)
+
+    def test_on_open_shell_error(self):
+        self.set_response(error=True)
+        self.assertRaises(AnsibleConnectionFailure, self.terminal.on_open_shell)
+        self.set_response()
+        self.terminal.on_open_shell()
+        self.assertEqual(self.connection.send.call_count, 2)
+
+    def test_on_become_admin(self):
+        self.terminal.on_become()
+        self.assertEqual(self.connection.exec_command.call_count, 0)
+        self.connection.get_prompt.return_value = b"\r\nrouter> "
+        self.terminal.on_become()
+        self.assertEqual(self.connection.exec_command.call_count, 1)